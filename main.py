@@ -3,13 +3,453 @@ import os          # Manipulação de arquivos e diretórios
 import re          # Expressões regulares para validação de dados
 import sqlite3     # Banco de dados SQLite para armazenamento local
 import hashlib     # Funções de hash para criptografia de senhas
+import hmac        # Comparação de hashes em tempo constante
+import logging     # Registro de erros com o traceback completo
+import queue       # Filas para o pool de conexões SQLite
+import shutil      # Cópia do logo selecionado para a pasta de logos
+import time        # Espera entre tentativas de criar o banco de uma empresa
+from bisect import bisect_left, bisect_right     # Buscas em listas ordenadas (sugestões, navegação)
+from collections import OrderedDict    # Cache LRU de registros consultados
+from concurrent.futures import ThreadPoolExecutor  # Gravações em segundo plano
+from contextlib import closing, contextmanager  # Gerenciadores de contexto para conexões
+from functools import lru_cache                  # Memorização dos UPDATEs montados dinamicamente
+from itertools import combinations               # Variações das consultas de listagem com filtros
+from weakref import WeakValueDictionary          # PhotoImages compartilhados enquanto exibidos
 
 # Importação de bibliotecas para interface gráfica
 import tkinter as tk                          # Biblioteca principal para GUI
 from tkinter import ttk, messagebox, filedialog  # Componentes adicionais de interface
 
-# Importação de biblioteca para manipulação de imagens
-from PIL import Image, ImageTk                # Processamento e exibição de imagens
+# Biblioteca para manipulação de imagens (Pillow), importada sob demanda por _pil()
+Image = ImageTk = None
+
+# Registro de erros do sistema; a configuração fica a cargo de quem executa
+logger = logging.getLogger(__name__)
+
+# PRAGMAs aplicados a toda conexão SQLite aberta pelo sistema:
+# WAL permite leituras concorrentes com a escrita e reduz fsync por commit;
+# o cache (~20 MB) vale por conexão, e cada banco mantém até TAMANHO_POOL
+# conexões
+PRAGMAS_CONEXAO = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-20000;
+    PRAGMA mmap_size=268435456;
+"""
+
+# Quantidade máxima de conexões ociosas mantidas por banco de dados
+TAMANHO_POOL = 4
+
+# Arquivo do banco principal, com o cadastro das empresas
+CAMINHO_BANCO_PRINCIPAL = "deposito_principal.db"
+# Pasta com um banco de dados por empresa (ver caminho_banco_empresa)
+PASTA_EMPRESAS = "deposito_empresas"
+
+# Tentativas de criar o banco de uma empresa cujo arquivo está em uso, e a
+# espera (s) antes da segunda tentativa, dobrada a cada nova falha
+TENTATIVAS_CRIAR_BANCO = 5
+ESPERA_CRIAR_BANCO_S = 0.05
+
+# Tamanho máximo (largura, altura) do logo da empresa no cabeçalho do menu;
+# o logo é reduzido mantendo a proporção
+TAMANHO_LOGO_MENU = (200, 80)
+
+# Quantidade máxima de registros mantidos em cada cache LRU
+TAMANHO_CACHE = 1024
+
+# Intervalo (ms) em que o laço do Tk exibe as mensagens enfileiradas
+INTERVALO_MENSAGENS_MS = 50
+
+# Atraso (ms) após a última tecla antes de refazer as sugestões de empresas
+ATRASO_SUGESTOES_MS = 150
+
+# Atraso (ms) após a última tecla antes de refazer a tabela da pesquisa de usuários
+ATRASO_PESQUISA_USUARIOS_MS = 200
+
+# Usuários lidos por página na tabela da pesquisa e fração rolada da tabela a
+# partir da qual a próxima página é carregada
+TAMANHO_PAGINA_USUARIOS = 500
+LIMIAR_PROXIMA_PAGINA = 0.9
+
+# Sugestões de empresas exibidas por vez (altura da listbox do login)
+MAX_SUGESTOES = 4
+
+# Quantidade de linhas lidas por vez (fetchmany) nas listagens sob demanda
+TAMANHO_LOTE_LEITURA = 256
+
+# Produtos por UPDATE em atualizar_estoque_em_lote (3 parâmetros por produto,
+# bem abaixo do limite de variáveis do SQLite)
+TAMANHO_LOTE_ESTOQUE = 500
+
+# Consulta base e filtros aceitos por listar_depositos (chave do filtro -> condição).
+# Condições sem "?" são filtros booleanos, aplicados apenas quando o valor é verdadeiro.
+SQL_LISTAR_DEPOSITOS = """
+    SELECT id, nome, tipo, endereco, cidade, estado, cep,
+           responsavel_id, capacidade_total, status
+    FROM depositos
+"""
+FILTROS_DEPOSITO = (
+    ("status", "status = ?"),
+    ("tipo", "tipo = ?"),
+    ("cidade", "cidade = ?"),
+)
+
+# Consultas fixas dos caminhos mais usados do CRUD. Ficam em constantes para que
+# o texto SQL seja sempre idêntico e reaproveite o cache de statements do sqlite3
+SQL_INSERIR_DEPOSITO = """
+    INSERT INTO depositos (
+        nome, tipo, endereco, cidade, estado, cep, responsavel_id, capacidade_total
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    RETURNING id
+"""
+SQL_INSERIR_FORNECEDOR = """
+    INSERT INTO fornecedores (
+        razao_social, nome_fantasia, cnpj, inscricao_estadual,
+        endereco, cidade, estado, cep, telefone, email,
+        contato_nome, prazo_entrega, condicao_pagamento
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    RETURNING id
+"""
+COLUNAS_FORNECEDOR = """
+    id, razao_social, nome_fantasia, cnpj, inscricao_estadual,
+    endereco, cidade, estado, cep, telefone, email,
+    contato_nome, prazo_entrega, condicao_pagamento, status
+"""
+SQL_OBTER_FORNECEDOR = f"SELECT {COLUNAS_FORNECEDOR} FROM fornecedores WHERE id = ?"
+SQL_INSERIR_PRODUTO = """
+    INSERT INTO produtos (
+        codigo_barras, sku, nome, descricao, categoria, marca,
+        quantidade, quantidade_minima, preco_custo, preco_venda,
+        localizacao, fornecedor
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    RETURNING id
+"""
+# Usuário gravado no banco da empresa anexado como "emp" (ver cadastrar_empresa)
+SQL_INSERIR_USUARIO_EMPRESA = """
+    INSERT INTO emp.usuarios (
+        codigo_empresa, empresa_nome, usuario, nome_completo,
+        nome_supervisor, turno, email, senha, tipo_acesso,
+        departamento, cargo, data_admissao, criado_por
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, DATE('now'), ?)
+"""
+# Colunas de empresas e usuarios lidas pelo login
+COLUNAS_EMPRESA_LOGIN = "id, nome, logo_path, db_nome, cnpj, endereco, telefone"
+COLUNAS_USUARIO_LOGIN = "id, usuario, senha, tipo_acesso"
+# Usuário do login, aceito pelo login, e-mail ou nome completo (nessa ordem).
+# Cada ramo usa o próprio índice e o LIMIT interrompe a busca no primeiro achado
+SQL_BUSCAR_USUARIO_LOGIN = f"""
+    SELECT {COLUNAS_USUARIO_LOGIN} FROM usuarios WHERE usuario = ?
+    UNION ALL
+    SELECT {COLUNAS_USUARIO_LOGIN} FROM usuarios WHERE email = ?
+    UNION ALL
+    SELECT {COLUNAS_USUARIO_LOGIN} FROM usuarios WHERE nome_completo = ?
+    LIMIT 1
+"""
+# Colunas exibidas no formulário de usuários (a senha nunca é carregada)
+COLUNAS_USUARIO_FORMULARIO = """
+    id, codigo_empresa, empresa_nome, usuario, nome_completo,
+    nome_supervisor, turno, email, tipo_acesso
+"""
+# Consultas do formulário de usuários. Montadas uma vez: o texto idêntico a
+# cada chamada é o que faz o cache de statements da conexão (CACHE_STATEMENTS)
+# reaproveitar a consulta já preparada
+SQL_OBTER_USUARIO = f"SELECT {COLUNAS_USUARIO_FORMULARIO} FROM usuarios WHERE id = ?"
+SQL_OBTER_USUARIO_POR_LOGIN = f"SELECT {COLUNAS_USUARIO_FORMULARIO} FROM usuarios WHERE usuario = ?"
+SQL_ID_USUARIO_POR_LOGIN = "SELECT id FROM usuarios WHERE usuario = ?"
+SQL_IDS_USUARIOS = "SELECT id FROM usuarios ORDER BY id"
+# Colunas da janela "Lista de Usuários", na ordem da Treeview
+SQL_LISTAR_USUARIOS = (
+    "SELECT id, usuario, nome_completo, email, tipo_acesso, turno FROM usuarios ORDER BY nome_completo"
+)
+# Primeiro usuário por MIN(id): o plano é uma busca direta pelo rowid em vez
+# de uma varredura da tabela interrompida pelo LIMIT
+SQL_PRIMEIRO_USUARIO = (
+    f"SELECT {COLUNAS_USUARIO_FORMULARIO} FROM usuarios WHERE id = (SELECT MIN(id) FROM usuarios)"
+)
+# Filtro de usuários pelo índice de texto usuarios_fts; o parâmetro é uma
+# expressão MATCH montada por expressao_fts
+FILTRO_USUARIOS_FTS = "id IN (SELECT rowid FROM usuarios_fts WHERE usuarios_fts MATCH ?)"
+# Filtro "contém" pelo índice de trigramas usuarios_trigrama; o parâmetro é
+# montado por expressao_trigrama
+FILTRO_USUARIOS_TRIGRAMA = (
+    "id IN (SELECT rowid FROM usuarios_trigrama WHERE usuarios_trigrama MATCH ?)"
+)
+# Menor termo atendido pelo índice de trigramas; abaixo disso a pesquisa
+# usa o prefixo das palavras (usuarios_fts)
+TAMANHO_MINIMO_TRIGRAMA = 3
+# Com o filtro de supervisor, a tabela da pesquisa segue a ordem do índice
+# idx_usuarios_supervisor_id, e cada página continua após o par
+# (supervisor, id) da última linha carregada
+ORDEM_USUARIOS_SUPERVISOR = "nome_supervisor COLLATE NOCASE, id"
+FILTRO_PAGINA_SUPERVISOR = (
+    "nome_supervisor >= ? COLLATE NOCASE"
+    " AND (nome_supervisor > ? COLLATE NOCASE OR id > ?)"
+)
+SQL_PESQUISAR_USUARIO = (
+    f"SELECT {COLUNAS_USUARIO_FORMULARIO} FROM usuarios WHERE {FILTRO_USUARIOS_FTS} LIMIT 1"
+)
+# Coluna do índice de texto usada por cada opção da janela de pesquisa
+COLUNAS_PESQUISA_USUARIO = {
+    "nome": "nome_completo",
+    "usuario": "usuario",
+    "email": "email",
+}
+COLUNAS_PRODUTO = """
+    id, codigo_barras, sku, nome, descricao, categoria, marca,
+    quantidade, quantidade_minima, preco_custo, preco_venda,
+    localizacao, fornecedor, data_cadastro, ultima_atualizacao
+"""
+SQL_OBTER_PRODUTO = f"SELECT {COLUNAS_PRODUTO} FROM produtos WHERE id = ?"
+# No RETURNING o SQLite entrega colunas REAL com valor inteiro como int; o CAST
+# mantém os mesmos tipos devolvidos por SQL_OBTER_PRODUTO
+RETORNO_PRODUTO = """
+    id, codigo_barras, sku, nome, descricao, categoria, marca,
+    quantidade, quantidade_minima,
+    CAST(preco_custo AS REAL) AS preco_custo,
+    CAST(preco_venda AS REAL) AS preco_venda,
+    localizacao, fornecedor, data_cadastro, ultima_atualizacao
+"""
+
+# Campos que atualizar_deposito aceita alterar
+CAMPOS_DEPOSITO = frozenset({
+    'nome', 'tipo', 'endereco', 'cidade', 'estado', 'cep',
+    'responsavel_id', 'capacidade_total', 'status'
+})
+
+# Campos que atualizar_fornecedor aceita alterar
+CAMPOS_FORNECEDOR = frozenset({
+    'razao_social', 'nome_fantasia', 'cnpj', 'inscricao_estadual',
+    'endereco', 'cidade', 'estado', 'cep', 'telefone', 'email',
+    'contato_nome', 'prazo_entrega', 'condicao_pagamento', 'status'
+})
+
+# Campos que atualizar_produto aceita alterar
+CAMPOS_PRODUTO = frozenset({
+    'codigo_barras', 'sku', 'nome', 'descricao', 'categoria', 'marca',
+    'quantidade', 'quantidade_minima', 'preco_custo', 'preco_venda',
+    'localizacao', 'fornecedor'
+})
+
+# Parâmetros do scrypt usado no hash de senhas (custo ~50 ms por verificação)
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+# Expressões regulares de validação, compiladas uma única vez
+PADRAO_NOME_EMPRESA = re.compile(r'^[\w\s\-\.]+$')
+PADRAO_EMAIL = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w+$")
+# Trechos do nome da empresa trocados por "_" no nome do arquivo de banco
+PADRAO_NOME_BANCO = re.compile(r"\W+")
+
+# Quantidade de statements preparados mantidos em cache por conexão
+CACHE_STATEMENTS = 256
+
+
+@lru_cache(maxsize=256)
+def montar_sql_atualizacao(tabela, campos, extra=None, retorno=None):
+    """Monta o UPDATE de um registro por id para o conjunto de campos informado.
+
+    O resultado é memorizado por (tabela, campos), evitando remontar a mesma
+    string a cada atualização.
+
+    Args:
+        tabela (str): Nome da tabela
+        campos (tuple): Colunas a serem atualizadas, na ordem dos parâmetros
+        extra (str, optional): Atribuição adicional sem parâmetro
+        retorno (str, optional): Colunas devolvidas via RETURNING
+
+    Returns:
+        str: Comando UPDATE com um "?" por campo seguido do id
+    """
+    atribuicoes = [f"{campo} = ?" for campo in campos]
+    if extra:
+        atribuicoes.append(extra)
+    sql = f"UPDATE {tabela} SET {', '.join(atribuicoes)} WHERE id = ?"
+    if retorno:
+        sql += f" RETURNING {retorno}"
+    return sql
+
+
+def montar_consultas_filtradas(base, filtros):
+    """Gera, uma única vez, a consulta de cada combinação possível de filtros.
+
+    Args:
+        base (str): SELECT sem cláusula WHERE
+        filtros (tuple): Pares (chave do filtro, condição SQL)
+
+    Returns:
+        dict: Consulta completa indexada pelo frozenset das chaves aplicadas
+    """
+    consultas = {}
+    for tamanho in range(len(filtros) + 1):
+        for combinacao in combinations(filtros, tamanho):
+            condicoes = [condicao for _, condicao in combinacao]
+            sql = base
+            if condicoes:
+                sql += " WHERE " + " AND ".join(condicoes)
+            consultas[frozenset(chave for chave, _ in combinacao)] = sql
+    return consultas
+
+
+def aplicar_filtros(consultas, filtros, filtro):
+    """Escolhe a consulta pré-montada e os parâmetros para o filtro informado.
+
+    Args:
+        consultas (dict): Resultado de montar_consultas_filtradas
+        filtros (tuple): Os mesmos pares (chave, condição) usados para montá-las
+        filtro (dict): Filtros recebidos pelo método de listagem (ou None)
+
+    Returns:
+        tuple: (consulta SQL, lista de parâmetros)
+    """
+    chaves, params = [], []
+    if filtro:
+        for chave, condicao in filtros:
+            if chave not in filtro:
+                continue
+            if "?" in condicao:
+                params.append(filtro[chave])
+            elif not filtro[chave]:
+                continue
+            chaves.append(chave)
+    return consultas[frozenset(chaves)], params
+
+
+# Consultas de listagem para cada combinação de filtros
+CONSULTAS_DEPOSITOS = montar_consultas_filtradas(SQL_LISTAR_DEPOSITOS, FILTROS_DEPOSITO)
+
+FILTROS_FORNECEDOR = (
+    ("status", "status = ?"),
+    # Padrão quando "status" não é informado (oculta os excluídos logicamente)
+    ("ativos", "status = 'ativo'"),
+    ("cidade", "cidade = ?"),
+    ("estado", "estado = ?"),
+)
+CONSULTAS_FORNECEDORES = montar_consultas_filtradas(
+    f"SELECT {COLUNAS_FORNECEDOR} FROM fornecedores", FILTROS_FORNECEDOR
+)
+
+FILTROS_PRODUTO = (
+    ("categoria", "categoria = ?"),
+    ("marca", "marca = ?"),
+    ("fornecedor", "fornecedor = ?"),
+    ("estoque_baixo", "quantidade <= quantidade_minima"),
+)
+CONSULTAS_PRODUTOS = montar_consultas_filtradas(
+    f"SELECT {COLUNAS_PRODUTO} FROM produtos", FILTROS_PRODUTO
+)
+
+
+# Versões do esquema gravadas em PRAGMA user_version, uma por tipo de banco.
+# Cada uma deve ser incrementada sempre que a DDL do seu banco mudar:
+# criar_banco_principal para o banco principal; criar_banco_empresa e
+# _atualizar_banco_empresa para os bancos das empresas
+VERSAO_SCHEMA_PRINCIPAL = 1
+VERSAO_SCHEMA_EMPRESA = 11
+
+
+def caminho_banco_empresa(db_nome):
+    """Retorna o arquivo do banco de dados de uma empresa.
+
+    Todo acesso ao banco de uma empresa passa por aqui, de modo que o mesmo
+    caminho sirva de chave para o pool de conexões.
+
+    Args:
+        db_nome (str): Nome do banco gravado em empresas.db_nome
+
+    Returns:
+        str: Caminho do arquivo ``.db`` dentro de PASTA_EMPRESAS
+    """
+    return os.path.join(PASTA_EMPRESAS, f"{db_nome}.db")
+
+
+def caminho_logo_menu(logo_path):
+    """Retorna o arquivo do logo já redimensionado para o cabeçalho do menu.
+
+    Args:
+        logo_path (str): Logo original gravado em empresas.logo_path
+
+    Returns:
+        str: PNG que cabe em TAMANHO_LOGO_MENU, ao lado do logo original
+    """
+    return f"{os.path.splitext(logo_path)[0]}_menu.png"
+
+
+def expressao_fts(termo, coluna=None):
+    """Converte o texto digitado em uma expressão MATCH do FTS5.
+
+    Cada palavra vira um prefixo entre aspas (``"joa"*``), de modo que
+    caracteres especiais do FTS5 no termo sejam tratados como texto.
+
+    Args:
+        termo (str): Texto digitado na pesquisa
+        coluna (str, optional): Restringe a busca a uma coluna de usuarios_fts
+
+    Returns:
+        str: Expressão para ``usuarios_fts MATCH ?``; ``'""'`` (nenhum
+        resultado) quando o termo não tem palavras
+    """
+    palavras = " ".join(
+        '"{}"*'.format(palavra.replace('"', '""')) for palavra in termo.split()
+    )
+    if not palavras:
+        return '""'
+    return f"{coluna} : ({palavras})" if coluna else palavras
+
+
+def expressao_trigrama(termo):
+    """Converte o texto digitado em uma expressão MATCH de substring.
+
+    Args:
+        termo (str): Trecho procurado, com pelo menos TAMANHO_MINIMO_TRIGRAMA
+            caracteres
+
+    Returns:
+        str: Frase entre aspas para ``usuarios_trigrama MATCH ?``
+    """
+    return '"{}"'.format(termo.replace('"', '""'))
+
+
+def padrao_prefixo_like(texto):
+    """Monta o padrão de ``LIKE ? ESCAPE '\\'`` para valores que começam com o texto.
+
+    Um padrão ancorado no início pode ser resolvido por um índice com
+    COLLATE NOCASE; ``%``, ``_`` e ``\\`` digitados são tratados como texto.
+
+    Args:
+        texto (str): Início do valor procurado
+
+    Returns:
+        str: Padrão com os curingas escapados e ``%`` no final
+    """
+    escapado = texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escapado}%"
+
+
+def fim_prefixo_nocase(texto):
+    """Retorna o limite superior, em COLLATE NOCASE, dos valores que começam com o texto.
+
+    Junto com ``>= texto``, delimita no índice o intervalo percorrido por um
+    ``LIKE`` de prefixo.
+
+    Args:
+        texto (str): Início do valor procurado
+
+    Returns:
+        str: Menor texto maior que todos os que começam com ``texto``, ou
+            None quando não há limite
+    """
+    # NOCASE só iguala as letras ASCII, comparadas em minúsculas
+    texto = "".join(c.lower() if "A" <= c <= "Z" else c for c in texto)
+    texto = texto.rstrip("\U0010ffff")
+    if not texto:
+        return None
+    proximo = ord(texto[-1]) + 1
+    if 0xD800 <= proximo < 0xE000:
+        # Surrogates não são codificáveis em UTF-8
+        proximo = 0xE000
+    return texto[:-1] + chr(proximo)
 
 class SistemaGerenciamentoDeposito:
     """Classe principal que implementa o sistema de gerenciamento de depósito.
@@ -22,6 +462,300 @@ class SistemaGerenciamentoDeposito:
     - Interface gráfica para todas as operações
     """
 
+    # Tabelas operacionais comuns ao banco principal e aos bancos das empresas
+    _TABELAS_OPERACIONAIS_DDL = """
+        CREATE TABLE IF NOT EXISTS movimentacoes_estoque (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            produto_id INTEGER NOT NULL,
+            tipo_movimentacao TEXT NOT NULL,
+            quantidade INTEGER NOT NULL,
+            motivo TEXT,
+            nota_fiscal TEXT,
+            usuario_id INTEGER NOT NULL,
+            data_movimentacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (produto_id) REFERENCES produtos (id),
+            FOREIGN KEY (usuario_id) REFERENCES usuarios (id)
+        );
+        CREATE TABLE IF NOT EXISTS depositos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome TEXT NOT NULL,
+            tipo TEXT NOT NULL,
+            endereco TEXT,
+            cidade TEXT,
+            estado TEXT,
+            cep TEXT,
+            responsavel_id INTEGER,
+            capacidade_total REAL,
+            status TEXT DEFAULT 'ativo',
+            FOREIGN KEY (responsavel_id) REFERENCES usuarios (id)
+        );
+        CREATE TABLE IF NOT EXISTS localizacao_produtos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            deposito_id INTEGER NOT NULL,
+            produto_id INTEGER NOT NULL,
+            quantidade INTEGER NOT NULL,
+            corredor TEXT,
+            prateleira TEXT,
+            nivel TEXT,
+            posicao TEXT,
+            data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (deposito_id) REFERENCES depositos (id),
+            FOREIGN KEY (produto_id) REFERENCES produtos (id)
+        );
+        CREATE TABLE IF NOT EXISTS fornecedores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            razao_social TEXT NOT NULL,
+            nome_fantasia TEXT,
+            cnpj TEXT UNIQUE,
+            inscricao_estadual TEXT,
+            endereco TEXT,
+            cidade TEXT,
+            estado TEXT,
+            cep TEXT,
+            telefone TEXT,
+            email TEXT,
+            contato_nome TEXT,
+            prazo_entrega INTEGER,
+            condicao_pagamento TEXT,
+            status TEXT DEFAULT 'ativo'
+        );
+        CREATE TABLE IF NOT EXISTS pedidos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            numero_pedido TEXT UNIQUE NOT NULL,
+            cliente_id INTEGER,
+            usuario_id INTEGER NOT NULL,
+            status TEXT DEFAULT 'pendente',
+            tipo_pedido TEXT NOT NULL,
+            data_pedido DATETIME DEFAULT CURRENT_TIMESTAMP,
+            data_entrega_prevista DATE,
+            data_entrega_real DATE,
+            valor_total REAL,
+            observacoes TEXT,
+            FOREIGN KEY (usuario_id) REFERENCES usuarios (id)
+        );
+        CREATE TABLE IF NOT EXISTS itens_pedido (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            pedido_id INTEGER NOT NULL,
+            produto_id INTEGER NOT NULL,
+            quantidade INTEGER NOT NULL,
+            preco_unitario REAL NOT NULL,
+            desconto REAL DEFAULT 0,
+            subtotal REAL NOT NULL,
+            FOREIGN KEY (pedido_id) REFERENCES pedidos (id),
+            FOREIGN KEY (produto_id) REFERENCES produtos (id)
+        );
+        CREATE TABLE IF NOT EXISTS rastreamento_entregas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            pedido_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            localizacao TEXT,
+            data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+            observacoes TEXT,
+            usuario_id INTEGER NOT NULL,
+            FOREIGN KEY (pedido_id) REFERENCES pedidos (id),
+            FOREIGN KEY (usuario_id) REFERENCES usuarios (id)
+        );
+    """
+
+    # DDL completa de cada banco, executada de uma vez com executescript
+    _PRINCIPAL_SCHEMA_DDL = """
+        BEGIN;
+        CREATE TABLE IF NOT EXISTS empresas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome TEXT UNIQUE NOT NULL,
+            razao_social TEXT,
+            senha TEXT NOT NULL,
+            logo_path TEXT,
+            db_nome TEXT UNIQUE NOT NULL,
+            cnpj TEXT DEFAULT '',
+            inscricao_estadual TEXT DEFAULT '',
+            endereco TEXT DEFAULT '',
+            cidade TEXT DEFAULT '',
+            estado TEXT DEFAULT '',
+            cep TEXT DEFAULT '',
+            telefone TEXT DEFAULT '',
+            email TEXT DEFAULT '',
+            website TEXT DEFAULT '',
+            admin_user TEXT DEFAULT '',
+            data_cadastro DATETIME DEFAULT CURRENT_TIMESTAMP,
+            plano_assinatura TEXT DEFAULT 'basic',
+            status TEXT DEFAULT 'active'
+        );
+    """ + _TABELAS_OPERACIONAIS_DDL + """
+        COMMIT;
+    """
+
+    # Índices da busca de usuários no login (o e-mail já é UNIQUE) e dos
+    # filtros de turno/tipo de acesso e supervisor (prefixo sem diferenciar
+    # maiúsculas, paginado na ordem do índice) da pesquisa; também aplicados
+    # por _atualizar_banco_empresa a bancos criados antes deles
+    _USUARIOS_INDICES_DDL = """
+        CREATE INDEX IF NOT EXISTS idx_usuarios_usuario ON usuarios(usuario);
+        CREATE INDEX IF NOT EXISTS idx_usuarios_nome_completo ON usuarios(nome_completo);
+        CREATE INDEX IF NOT EXISTS idx_usuarios_turno_tipo ON usuarios(turno, tipo_acesso);
+        CREATE INDEX IF NOT EXISTS idx_usuarios_supervisor_id
+            ON usuarios(nome_supervisor COLLATE NOCASE, id);
+    """
+
+    # Índice de texto das pesquisas de usuários (prefixo por palavra, sem
+    # diferenciar maiúsculas nem acentos), mantido em sincronia por gatilhos.
+    # O gatilho de UPDATE só dispara para as colunas indexadas (não para
+    # ultimo_acesso, gravado a cada login)
+    _USUARIOS_FTS_DDL = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS usuarios_fts USING fts5(
+            usuario, nome_completo, email,
+            content='usuarios', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        );
+        CREATE TRIGGER IF NOT EXISTS usuarios_fts_ai AFTER INSERT ON usuarios BEGIN
+            INSERT INTO usuarios_fts(rowid, usuario, nome_completo, email)
+            VALUES (new.id, new.usuario, new.nome_completo, new.email);
+        END;
+        CREATE TRIGGER IF NOT EXISTS usuarios_fts_ad AFTER DELETE ON usuarios BEGIN
+            INSERT INTO usuarios_fts(usuarios_fts, rowid, usuario, nome_completo, email)
+            VALUES ('delete', old.id, old.usuario, old.nome_completo, old.email);
+        END;
+        CREATE TRIGGER IF NOT EXISTS usuarios_fts_au
+        AFTER UPDATE OF usuario, nome_completo, email ON usuarios BEGIN
+            INSERT INTO usuarios_fts(usuarios_fts, rowid, usuario, nome_completo, email)
+            VALUES ('delete', old.id, old.usuario, old.nome_completo, old.email);
+            INSERT INTO usuarios_fts(rowid, usuario, nome_completo, email)
+            VALUES (new.id, new.usuario, new.nome_completo, new.email);
+        END;
+    """
+
+    # Índice de trigramas para a pesquisa "contém" da tela de pesquisa de
+    # usuários, nos mesmos moldes de usuarios_fts
+    _USUARIOS_TRIGRAMA_DDL = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS usuarios_trigrama USING fts5(
+            usuario, nome_completo, email,
+            content='usuarios', content_rowid='id',
+            tokenize='trigram'
+        );
+        CREATE TRIGGER IF NOT EXISTS usuarios_trigrama_ai AFTER INSERT ON usuarios BEGIN
+            INSERT INTO usuarios_trigrama(rowid, usuario, nome_completo, email)
+            VALUES (new.id, new.usuario, new.nome_completo, new.email);
+        END;
+        CREATE TRIGGER IF NOT EXISTS usuarios_trigrama_ad AFTER DELETE ON usuarios BEGIN
+            INSERT INTO usuarios_trigrama(usuarios_trigrama, rowid, usuario, nome_completo, email)
+            VALUES ('delete', old.id, old.usuario, old.nome_completo, old.email);
+        END;
+        CREATE TRIGGER IF NOT EXISTS usuarios_trigrama_au
+        AFTER UPDATE OF usuario, nome_completo, email ON usuarios BEGIN
+            INSERT INTO usuarios_trigrama(usuarios_trigrama, rowid, usuario, nome_completo, email)
+            VALUES ('delete', old.id, old.usuario, old.nome_completo, old.email);
+            INSERT INTO usuarios_trigrama(rowid, usuario, nome_completo, email)
+            VALUES (new.id, new.usuario, new.nome_completo, new.email);
+        END;
+    """
+
+    # Índices das tabelas operacionais e de produtos dos bancos das empresas;
+    # aplicados também por _atualizar_banco_empresa a bancos criados antes deles
+    _OPERACIONAIS_INDICES_DDL = """
+        -- Filtros de listar_depositos, a verificação de produtos vinculados
+        -- em excluir_deposito e a listagem de pedidos
+        CREATE INDEX IF NOT EXISTS idx_depositos_status ON depositos(status);
+        CREATE INDEX IF NOT EXISTS idx_depositos_tipo ON depositos(tipo);
+        CREATE INDEX IF NOT EXISTS idx_depositos_cidade_status ON depositos(cidade, status);
+        CREATE INDEX IF NOT EXISTS idx_localizacao_produtos_deposito ON localizacao_produtos(deposito_id);
+        CREATE INDEX IF NOT EXISTS idx_pedidos_status ON pedidos(status);
+        -- Filtros de listar_fornecedores e listar_produtos
+        CREATE INDEX IF NOT EXISTS idx_fornecedores_status ON fornecedores(status);
+        CREATE INDEX IF NOT EXISTS idx_fornecedores_cidade_estado ON fornecedores(cidade, estado);
+        CREATE INDEX IF NOT EXISTS idx_produtos_categoria ON produtos(categoria);
+        CREATE INDEX IF NOT EXISTS idx_produtos_marca ON produtos(marca);
+        CREATE INDEX IF NOT EXISTS idx_produtos_fornecedor ON produtos(fornecedor);
+        CREATE INDEX IF NOT EXISTS idx_produtos_estoque_baixo ON produtos(id)
+            WHERE quantidade <= quantidade_minima;
+        -- Verificações de vínculos em excluir_produto
+        CREATE INDEX IF NOT EXISTS idx_movimentacoes_estoque_produto ON movimentacoes_estoque(produto_id);
+        CREATE INDEX IF NOT EXISTS idx_itens_pedido_produto ON itens_pedido(produto_id);
+    """
+
+    # Todos os índices dos bancos das empresas, aplicados na criação e, por
+    # _atualizar_banco_empresa, a bancos de versões anteriores do esquema
+    _EMPRESA_INDICES_DDL = (
+        _USUARIOS_INDICES_DDL
+        + _USUARIOS_FTS_DDL
+        + _USUARIOS_TRIGRAMA_DDL
+        + _OPERACIONAIS_INDICES_DDL
+    )
+
+    _EMPRESA_SCHEMA_DDL = """
+        BEGIN;
+        CREATE TABLE IF NOT EXISTS produtos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            codigo_barras TEXT UNIQUE,
+            sku TEXT UNIQUE,
+            nome TEXT NOT NULL,
+            descricao TEXT,
+            categoria TEXT,
+            marca TEXT,
+            quantidade INTEGER NOT NULL,
+            quantidade_minima INTEGER DEFAULT 0,
+            preco_custo REAL NOT NULL,
+            preco_venda REAL NOT NULL,
+            localizacao TEXT,
+            fornecedor TEXT,
+            data_cadastro DATETIME DEFAULT CURRENT_TIMESTAMP,
+            ultima_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE IF NOT EXISTS usuarios (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            codigo_empresa TEXT NOT NULL,
+            empresa_nome TEXT NOT NULL,
+            usuario TEXT NOT NULL,
+            nome_completo TEXT NOT NULL,
+            nome_supervisor TEXT NOT NULL,
+            turno TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            senha TEXT NOT NULL,
+            tipo_acesso TEXT NOT NULL CHECK(tipo_acesso IN ('CEO', 'Administrador', 'Gerente', 'Operador')),
+            departamento TEXT,
+            cargo TEXT,
+            data_admissao DATE,
+            ultimo_acesso DATETIME,
+            criado_por TEXT,
+            FOREIGN KEY (criado_por) REFERENCES usuarios(id)
+        );
+    """ + _TABELAS_OPERACIONAIS_DDL + _EMPRESA_INDICES_DDL + """
+        COMMIT;
+    """
+
+    # Campos do formulário de usuários preenchidos por preencher_campos_usuario:
+    # (chave em self.vars_usuario, coluna de COLUNAS_USUARIO_FORMULARIO)
+    _CAMPOS_FORMULARIO_USUARIO = (
+        ("entry_cod_empresa", "codigo_empresa"),
+        ("lbl_nome_empresa", "empresa_nome"),
+        ("entry_usuario", "usuario"),
+        ("entry_nome", "nome_completo"),
+        ("entry_supervisor", "nome_supervisor"),
+        ("entry_turno", "turno"),
+        ("entry_email", "email"),
+        ("entry_tipo", "tipo_acesso"),
+    )
+
+    # Campos lidos por salvar_usuario: (chave em dados, chave em self.vars_usuario,
+    # rótulo exibido se estiver vazio; None para campos não obrigatórios)
+    _CAMPOS_SALVAR_USUARIO = (
+        ("cod_empresa", "entry_cod_empresa", "Código Empresa"),
+        ("empresa_nome", "lbl_nome_empresa", None),
+        ("usuario", "entry_usuario", "Usuário"),
+        ("nome", "entry_nome", "Nome Completo"),
+        ("supervisor", "entry_supervisor", "Nome Supervisor"),
+        ("turno", "entry_turno", "Turno"),
+        ("email", "entry_email", "Email"),
+        ("senha", "entry_senha", "Senha"),
+        ("tipo", "entry_tipo", "Tipo Acesso"),
+    )
+
+    # Valores dos combobox de turno e tipo de acesso de usuários; as variantes
+    # com "" iniciam os filtros da pesquisa de usuários (sem filtro)
+    _TURNOS = ("Manhã", "Tarde", "Noite")
+    _TIPOS_ACESSO = ("Administrador", "Gerente", "Operador")
+    _FILTRO_TURNOS = ("",) + _TURNOS
+    _FILTRO_TIPOS_ACESSO = ("",) + _TIPOS_ACESSO
+
     def __init__(self):
         """Inicializa o sistema de gerenciamento de depósito.
         
@@ -49,6 +783,24 @@ class SistemaGerenciamentoDeposito:
             "sombra": "rgba(0,0,0,0.1)"  # Sombra sutil para elementos
         }
         
+        # Pool de conexões SQLite reaproveitadas, indexado pelo caminho do banco
+        self._pools = {}
+        # Cache LRU de depósitos consultados, indexado por (db_nome, id)
+        self._cache_depositos = OrderedDict()
+        # Caches LRU de fornecedores e produtos, com a mesma chave
+        self._cache_fornecedores = OrderedDict()
+        self._cache_produtos = OrderedDict()
+        # Cache LRU dos nomes das empresas, indexado pelo código digitado
+        self._cache_nomes_empresas = OrderedDict()
+        # Mensagens de erro/aviso pendentes de exibição, consumidas pelo laço do Tk
+        self._fila_mensagens = queue.Queue()
+        # Thread de E/S para gravações demoradas fora do laço do Tk; uma única
+        # thread mantém as gravações na ordem em que foram pedidas
+        self._executor_io = ThreadPoolExecutor(max_workers=1)
+        # Thread das consultas da tabela de pesquisa de usuários, para que
+        # buscas demoradas não travem o laço do Tk
+        self._executor_consultas = ThreadPoolExecutor(max_workers=1)
+
         # Cria as pastas necessárias para o funcionamento do sistema
         self.criar_pastas()
         # Inicializa o banco de dados principal
@@ -58,17 +810,50 @@ class SistemaGerenciamentoDeposito:
         self.root = tk.Tk()
         self.root.title("Sistema de Gerenciamento de Depósito")
         self.root.geometry("1000x700")  # Define o tamanho inicial da janela
+        # Exceções não tratadas nos callbacks do Tk são registradas com traceback
+        self.root.report_callback_exception = self._erro_nao_tratado
         self.configurar_estilos()  # Aplica estilos visuais personalizados
 
         # Inicialização de variáveis importantes
         self.empresa_logada = None  # Armazena dados da empresa logada
         self.logo_path = None       # Caminho para o logo da empresa
         self.preview_logo = None    # Armazena referência da imagem do logo para exibição
+        self._imagens = WeakValueDictionary()  # PhotoImages exibidos, por (caminho, tamanho, mtime)
+        self._telas = {}            # Telas montadas uma vez e reaproveitadas (login, cadastro, menu)
+        self._chave_menu = None     # Sessão (empresa e usuário) para a qual o menu foi montado
+        self._ids_usuarios = None   # Ids dos usuários em ordem, para a navegação do cadastro
+        self._usuario_exibido = None  # (id, usuario) preenchido no formulário de usuários
+        # Janelas auxiliares abertas; voltam a None quando destruídas (_registrar_janela)
+        self.janela_usuario = None
+        self.janela_pesquisa = None
+        # Tela de pesquisa de usuários (pesquisar_range): escondida ao fechar e
+        # reexibida nas aberturas seguintes; destruída ao trocar de tela
+        self.janela_pesquisa_usuarios = None
+        self.janela_lista = None
+        self._job_sugestoes = None  # Atualização agendada das sugestões de empresas
+        self._job_pesquisa_usuarios = None  # Recarga agendada da tabela da pesquisa de usuários
+        # Paginação da tabela da pesquisa: (consulta, filtros, parâmetros,
+        # ordenada por supervisor) em exibição, último id e supervisor
+        # carregados (id None: não há mais páginas), a leitura
+        # da próxima página já agendada, se há uma página sendo lida e a
+        # geração da pesquisa (páginas de pesquisas anteriores são descartadas)
+        self._consulta_usuarios = None
+        self._ultimo_id_usuarios = None
+        self._ultimo_supervisor_usuarios = None
+        self._job_pagina_usuarios = None
+        self._pagina_em_leitura = False
+        self._geracao_usuarios = 0
+        # Filtros da pesquisa exibida na tabela (_filtros_pesquisa_usuarios)
+        self._filtros_usuarios = None
+        self.lista_empresas = None  # Nomes das empresas, carregados na primeira sugestão do login
         
         # Exibe a tela de login inicial
         self.tela_login()
 
-        # Definição de métodos auxiliares para exibição de mensagens
+        # Definição de métodos auxiliares para exibição de mensagens.
+        # As mensagens entram na fila e são exibidas pelo laço do Tk em
+        # _processar_mensagens, sem bloquear quem as gerou (inclusive threads
+        # que não podem acessar o Tk diretamente)
         def exibir_mensagem_aviso(titulo, mensagem):
             """Exibe uma mensagem de aviso sem fechar ou alterar a tela atual.
             
@@ -76,7 +861,7 @@ class SistemaGerenciamentoDeposito:
                 titulo (str): Título da mensagem de aviso
                 mensagem (str): Conteúdo da mensagem de aviso
             """
-            messagebox.showwarning(titulo, mensagem)
+            self._fila_mensagens.put((messagebox.showwarning, titulo, mensagem))
 
         self.exibir_mensagem_aviso = exibir_mensagem_aviso
 
@@ -87,457 +872,359 @@ class SistemaGerenciamentoDeposito:
                 titulo (str): Título da mensagem de erro
                 mensagem (str): Conteúdo da mensagem de erro
             """
-            messagebox.showerror(titulo, mensagem)
+            self._fila_mensagens.put((messagebox.showerror, titulo, mensagem))
 
         self.exibir_mensagem_erro = exibir_mensagem_erro
+        self.root.after(INTERVALO_MENSAGENS_MS, self._processar_mensagens)
 
     def criar_pastas(self):
         """Cria as pastas necessárias para logos e bancos de dados das empresas.
         
-        Este método verifica se as pastas essenciais existem e as cria caso necessário:
+        Este método cria as pastas essenciais caso ainda não existam:
         - 'logos': Armazena as imagens de logo das empresas cadastradas
         - 'deposito_empresas': Armazena os bancos de dados específicos de cada empresa
         """
-        # Verifica e cria a pasta para armazenar logos das empresas
-        if not os.path.exists("logos"):
-            os.makedirs("logos")
+        # Cria a pasta para armazenar logos das empresas
+        os.makedirs("logos", exist_ok=True)
             
-        # Verifica e cria a pasta para armazenar os bancos de dados das empresas
-        if not os.path.exists("deposito_empresas"):
-            os.makedirs("deposito_empresas")
+        # Cria a pasta para armazenar os bancos de dados das empresas
+        os.makedirs(PASTA_EMPRESAS, exist_ok=True)
 
-    def criar_banco_principal(self):
-        """Cria o banco de dados principal do sistema.
-        
-        Este método é responsável por:
-        - Criar o arquivo de banco de dados principal (deposito_principal.db) se não existir
-        - Criar a tabela 'empresas' com todos os campos necessários
-        - Garantir que colunas adicionais existam na tabela 'empresas'
-        - Criar tabelas auxiliares para o sistema (movimentações, depósitos, etc.)
-        
-        O banco de dados principal armazena informações sobre as empresas cadastradas
-        e serve como ponto central para o sistema.
-        """
-        conn = sqlite3.connect("deposito_principal.db")
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS empresas (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome TEXT UNIQUE NOT NULL,
-                senha TEXT NOT NULL,
-                logo_path TEXT,
-                db_nome TEXT UNIQUE NOT NULL,
-                admin_user TEXT NOT NULL,
-                tipo_usuario TEXT DEFAULT 'CEO',
-                cnpj TEXT,
-                endereco TEXT,
-                telefone TEXT
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
-        conn = sqlite3.connect("deposito_principal.db")
-        cursor = conn.cursor()
+    def _processar_mensagens(self):
+        """Executa as chamadas enfileiradas e se reagenda no laço do Tk.
 
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS empresas (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome TEXT UNIQUE NOT NULL,
-                razao_social TEXT,
-                senha TEXT NOT NULL,
-                logo_path TEXT,
-                db_nome TEXT UNIQUE NOT NULL,
-                cnpj TEXT DEFAULT '',
-                inscricao_estadual TEXT DEFAULT '',
-                endereco TEXT DEFAULT '',
-                cidade TEXT DEFAULT '',
-                estado TEXT DEFAULT '',
-                cep TEXT DEFAULT '',
-                telefone TEXT DEFAULT '',
-                email TEXT DEFAULT '',
-                website TEXT DEFAULT '',
-                admin_user TEXT DEFAULT '',
-                data_cadastro DATETIME DEFAULT CURRENT_TIMESTAMP,
-                plano_assinatura TEXT DEFAULT 'basic',
-                status TEXT DEFAULT 'active'
-            )
+        Cada item da fila é uma tupla (função, *argumentos): as mensagens de
+        exibir_mensagem_erro/aviso e as ações que threads de segundo plano
+        precisam executar na thread do Tk. Uma chamada que falha é registrada
+        no log e não interrompe as demais nem o reagendamento.
         """
+        while True:
+            try:
+                funcao, *args = self._fila_mensagens.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                funcao(*args)
+            except Exception:
+                logger.exception("Erro ao processar mensagem da fila: %r", funcao)
+        self.root.after(INTERVALO_MENSAGENS_MS, self._processar_mensagens)
+
+    def _erro_nao_tratado(self, tipo, valor, rastreamento):
+        """Registra uma exceção não tratada em um callback do Tk e avisa o usuário."""
+        logger.error(
+            "Erro não tratado na interface", exc_info=(tipo, valor, rastreamento)
         )
+        self.exibir_mensagem_erro("Erro", f"Erro inesperado: {valor}")
 
-        # Garante que as colunas 'cnpj', 'endereco', 'telefone' e 'admin_user' existam.
-        for coluna in ["cnpj", "endereco", "telefone", "admin_user"]:
-            try:
-                cursor.execute(
-                    f"ALTER TABLE empresas ADD COLUMN {coluna} TEXT DEFAULT ''"
-                )
-            except sqlite3.OperationalError:
-                pass
+    def _connect(self, caminho):
+        """Abre uma conexão SQLite já configurada com os PRAGMAs do sistema.
 
-        # Criar tabela de movimentações de estoque
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS movimentacoes_estoque (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                produto_id INTEGER NOT NULL,
-                tipo_movimentacao TEXT NOT NULL,
-                quantidade INTEGER NOT NULL,
-                motivo TEXT,
-                nota_fiscal TEXT,
-                usuario_id INTEGER NOT NULL,
-                data_movimentacao DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (produto_id) REFERENCES produtos (id),
-                FOREIGN KEY (usuario_id) REFERENCES usuarios (id)
-            )
-            """
-        )
+        Args:
+            caminho (str): Caminho do arquivo de banco de dados
 
-        # Criar tabela de depósitos
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS depositos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome TEXT NOT NULL,
-                tipo TEXT NOT NULL,
-                endereco TEXT,
-                cidade TEXT,
-                estado TEXT,
-                cep TEXT,
-                responsavel_id INTEGER,
-                capacidade_total REAL,
-                status TEXT DEFAULT 'ativo',
-                FOREIGN KEY (responsavel_id) REFERENCES usuarios (id)
-            )
-            """
+        Returns:
+            sqlite3.Connection: Conexão pronta para uso
+        """
+        # detect_types=0: datas (DATETIME DEFAULT CURRENT_TIMESTAMP) chegam como texto
+        # ISO-8601, sem conversores Python aplicados a cada linha lida
+        # isolation_level=None: sem BEGIN implícito antes de cada escrita; cada
+        # instrução isolada é atômica e fluxos com várias instruções abrem a
+        # própria transação com BEGIN IMMEDIATE
+        conn = sqlite3.connect(
+            caminho,
+            detect_types=0,
+            cached_statements=CACHE_STATEMENTS,
+            check_same_thread=False,
+            isolation_level=None,
         )
+        conn.row_factory = sqlite3.Row
+        conn.executescript(PRAGMAS_CONEXAO)
+        return conn
 
-        # Criar tabela de localização de produtos nos depósitos
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS localizacao_produtos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                deposito_id INTEGER NOT NULL,
-                produto_id INTEGER NOT NULL,
-                quantidade INTEGER NOT NULL,
-                corredor TEXT,
-                prateleira TEXT,
-                nivel TEXT,
-                posicao TEXT,
-                data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (deposito_id) REFERENCES depositos (id),
-                FOREIGN KEY (produto_id) REFERENCES produtos (id)
-            )
-            """
-        )
+    def hash_senha(self, senha):
+        """Gera o hash de uma senha usando scrypt com salt aleatório.
 
-        # Criar tabela de fornecedores
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS fornecedores (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                razao_social TEXT NOT NULL,
-                nome_fantasia TEXT,
-                cnpj TEXT UNIQUE,
-                inscricao_estadual TEXT,
-                endereco TEXT,
-                cidade TEXT,
-                estado TEXT,
-                cep TEXT,
-                telefone TEXT,
-                email TEXT,
-                contato_nome TEXT,
-                prazo_entrega INTEGER,
-                condicao_pagamento TEXT,
-                status TEXT DEFAULT 'ativo'
-            )
-            """
-        )
+        O resultado é autodescritivo (``scrypt$n$r$p$salt$hash``), permitindo
+        identificar o algoritmo e os parâmetros usados em cada senha gravada.
 
-        # Criar tabela de pedidos
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS pedidos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                numero_pedido TEXT UNIQUE NOT NULL,
-                cliente_id INTEGER,
-                usuario_id INTEGER NOT NULL,
-                status TEXT DEFAULT 'pendente',
-                tipo_pedido TEXT NOT NULL,
-                data_pedido DATETIME DEFAULT CURRENT_TIMESTAMP,
-                data_entrega_prevista DATE,
-                data_entrega_real DATE,
-                valor_total REAL,
-                observacoes TEXT,
-                FOREIGN KEY (usuario_id) REFERENCES usuarios (id)
-            )
-            """
-        )
+        Args:
+            senha (str): Senha em texto puro
 
-        # Criar tabela de itens do pedido
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS itens_pedido (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                pedido_id INTEGER NOT NULL,
-                produto_id INTEGER NOT NULL,
-                quantidade INTEGER NOT NULL,
-                preco_unitario REAL NOT NULL,
-                desconto REAL DEFAULT 0,
-                subtotal REAL NOT NULL,
-                FOREIGN KEY (pedido_id) REFERENCES pedidos (id),
-                FOREIGN KEY (produto_id) REFERENCES produtos (id)
-            )
-            """
+        Returns:
+            str: Hash da senha pronto para ser armazenado
+        """
+        salt = os.urandom(16)
+        digest = hashlib.scrypt(
+            senha.encode(), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P
         )
+        return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${digest.hex()}"
 
-        # Criar tabela de rastreamento de entregas
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS rastreamento_entregas (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                pedido_id INTEGER NOT NULL,
-                status TEXT NOT NULL,
-                localizacao TEXT,
-                data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP,
-                observacoes TEXT,
-                usuario_id INTEGER NOT NULL,
-                FOREIGN KEY (pedido_id) REFERENCES pedidos (id),
-                FOREIGN KEY (usuario_id) REFERENCES usuarios (id)
-            )
-            """
-        )
+    def verificar_senha(self, senha_hash, senha):
+        """Verifica se a senha corresponde ao hash armazenado.
 
-        conn.commit()
-        conn.close()
+        Aceita tanto hashes scrypt quanto o formato legado (SHA-256 em
+        hexadecimal), que continua válido até a senha ser regravada.
 
-    def criar_banco_empresa(self, db_nome):
-        """Cria o banco de dados específico para a empresa com as tabelas de produtos e usuários."""
-        caminho_db = f"deposito_empresas/{db_nome}.db"
-        if os.path.exists(caminho_db):
+        Args:
+            senha_hash (str): Hash armazenado no banco de dados
+            senha (str): Senha em texto puro informada pelo usuário
+
+        Returns:
+            bool: True se a senha estiver correta, False caso contrário
+        """
+        if not senha_hash:
+            return False
+        if senha_hash.startswith("scrypt$"):
             try:
-                os.remove(caminho_db)
-            except PermissionError:
-                # Se não conseguir remover, tenta usar um nome alternativo
-                import time
-                caminho_db = f"deposito_empresas/{db_nome}_{int(time.time())}.db"
+                _, n, r, p, salt, digest = senha_hash.split("$")
+                calculado = hashlib.scrypt(
+                    senha.encode(), salt=bytes.fromhex(salt), n=int(n), r=int(r), p=int(p)
+                )
+            except ValueError:
+                return False
+            return hmac.compare_digest(calculado.hex(), digest)
+        return hmac.compare_digest(hashlib.sha256(senha.encode()).hexdigest(), senha_hash)
 
-        conn = sqlite3.connect(caminho_db)
-        cursor = conn.cursor()
+    def senha_precisa_atualizar(self, senha_hash):
+        """Indica se o hash deve ser regravado com o algoritmo e custo atuais.
 
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS produtos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                codigo_barras TEXT UNIQUE,
-                sku TEXT UNIQUE,
-                nome TEXT NOT NULL,
-                descricao TEXT,
-                categoria TEXT,
-                marca TEXT,
-                quantidade INTEGER NOT NULL,
-                quantidade_minima INTEGER DEFAULT 0,
-                preco_custo REAL NOT NULL,
-                preco_venda REAL NOT NULL,
-                localizacao TEXT,
-                fornecedor TEXT,
-                data_cadastro DATETIME DEFAULT CURRENT_TIMESTAMP,
-                ultima_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
+        Args:
+            senha_hash (str): Hash armazenado no banco de dados
+
+        Returns:
+            bool: True para hashes legados ou com parâmetros desatualizados
         """
-        )
+        return not senha_hash.startswith(f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}$")
 
-        cursor.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='usuarios'"
-        )
-        tabela_existe = cursor.fetchone()
-
-        if not tabela_existe:
-            cursor.execute(
-                """
-                CREATE TABLE usuarios (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    codigo_empresa TEXT NOT NULL,
-                    empresa_nome TEXT NOT NULL,
-                    usuario TEXT NOT NULL,
-                    nome_completo TEXT NOT NULL,
-                    nome_supervisor TEXT NOT NULL,
-                    turno TEXT NOT NULL,
-                    email TEXT UNIQUE NOT NULL,
-                    senha TEXT NOT NULL,
-                    tipo_acesso TEXT NOT NULL CHECK(tipo_acesso IN ('CEO', 'Administrador', 'Gerente', 'Operador')),
-                    departamento TEXT,
-                    cargo TEXT,
-                    data_admissao DATE,
-                    ultimo_acesso DATETIME,
-                    criado_por TEXT,
-                    FOREIGN KEY (criado_por) REFERENCES usuarios(id)
-                )
-                """
-            )
-        else:
-            colunas_necessarias = [
-                "codigo_empresa",
-                "empresa_nome",
-                "usuario",
-                "nome_supervisor",
-                "turno",
-            ]
-            for coluna in colunas_necessarias:
-                try:
-                    cursor.execute(
-                        f"""
-                        ALTER TABLE usuarios 
-                        ADD COLUMN {coluna} TEXT NOT NULL DEFAULT ''
-                    """
+    def _pil(self):
+        """Importa o Pillow na primeira vez em que uma imagem é processada.
+
+        Returns:
+            tuple: Módulos ``PIL.Image`` e ``PIL.ImageTk``
+        """
+        global Image, ImageTk
+        if Image is None:
+            from PIL import Image, ImageTk
+        return Image, ImageTk
+
+    def _imagem(self, caminho, tamanho, proporcional=False):
+        """Retorna o PhotoImage de um arquivo redimensionado para o tamanho dado.
+
+        A imagem é decodificada e redimensionada uma vez (arquivos já gravados
+        no tamanho pedido não são reamostrados) e o PhotoImage é compartilhado,
+        por (caminho, tamanho, data de modificação), entre os widgets que o
+        exibem. _imagens guarda só referências fracas: quem usa a imagem deve
+        mantê-la viva (``widget.image = foto``), como o Tk exige, e ela sai do
+        cache quando o último widget é destruído. Um arquivo substituído no
+        mesmo caminho (como o logo de uma empresa recadastrada) é relido.
+
+        Args:
+            caminho (str): Caminho do arquivo de imagem
+            tamanho (tuple): Largura e altura finais, em pixels
+            proporcional (bool): Se True, ``tamanho`` é o limite da imagem,
+                reduzida mantendo a proporção (e nunca ampliada)
+
+        Returns:
+            ImageTk.PhotoImage: Imagem pronta para uso em widgets
+        """
+        chave = (caminho, tamanho, proporcional, os.path.getmtime(caminho))
+        foto = self._imagens.get(chave)
+        if foto is None:
+            Image, ImageTk = self._pil()
+            imagem = Image.open(caminho)
+            # BILINEAR: em ícones e logos deste tamanho a diferença para o
+            # LANCZOS não é visível, e a reamostragem é bem mais barata
+            if proporcional:
+                imagem.thumbnail(tamanho, Image.BILINEAR)
+            elif imagem.size != tamanho:
+                imagem = imagem.resize(tamanho, Image.BILINEAR)
+            foto = ImageTk.PhotoImage(imagem)
+            self._imagens[chave] = foto
+        return foto
+
+    def _gerar_logo_menu(self, logo_path):
+        """Grava a versão do logo exibida no menu, redimensionada uma única vez.
+
+        Args:
+            logo_path (str): Logo original, já copiado para a pasta logos
+        """
+        Image, _ = self._pil()
+        with Image.open(logo_path) as imagem:
+            imagem.draft("RGB", TAMANHO_LOGO_MENU)
+            # Paleta, CMYK e tons de cinza são convertidos antes de reduzir:
+            # o PNG não aceita CMYK e a paleta seria reamostrada sem filtro
+            if imagem.mode not in ("RGB", "RGBA"):
+                transparente = "A" in imagem.mode or "transparency" in imagem.info
+                imagem = imagem.convert("RGBA" if transparente else "RGB")
+            # Miniatura: cabe em TAMANHO_LOGO_MENU mantendo a proporção do logo
+            imagem.thumbnail(TAMANHO_LOGO_MENU, Image.BILINEAR)
+            imagem.save(caminho_logo_menu(logo_path), "PNG", optimize=True)
+
+    def criar_banco_principal(self):
+        """Cria o banco de dados principal do sistema.
+        
+        Este método é responsável por:
+        - Criar o arquivo de banco de dados principal (deposito_principal.db) se não existir
+        - Criar a tabela 'empresas' com todos os campos necessários
+        - Garantir que colunas adicionais existam na tabela 'empresas'
+        - Criar tabelas auxiliares para o sistema (movimentações, depósitos, etc.)
+        
+        O banco de dados principal armazena informações sobre as empresas cadastradas
+        e serve como ponto central para o sistema.
+        """
+        with closing(self._connect(CAMINHO_BANCO_PRINCIPAL)) as conn:
+            # Esquema já atualizado: nada a fazer
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= VERSAO_SCHEMA_PRINCIPAL:
+                return
+
+            conn.executescript(self._PRINCIPAL_SCHEMA_DDL)
+
+            # Garante que as colunas 'cnpj', 'endereco', 'telefone' e 'admin_user' existam,
+            # emitindo ALTER TABLE apenas para as que ainda faltam
+            existentes = {c[1] for c in conn.execute("PRAGMA table_info(empresas)")}
+            for coluna in ("cnpj", "endereco", "telefone", "admin_user"):
+                if coluna not in existentes:
+                    conn.execute(
+                        f"ALTER TABLE empresas ADD COLUMN {coluna} TEXT DEFAULT ''"
                     )
-                except sqlite3.OperationalError:
-                    pass
 
-        # Criar tabela de movimentações de estoque
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS movimentacoes_estoque (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                produto_id INTEGER NOT NULL,
-                tipo_movimentacao TEXT NOT NULL,
-                quantidade INTEGER NOT NULL,
-                motivo TEXT,
-                nota_fiscal TEXT,
-                usuario_id INTEGER NOT NULL,
-                data_movimentacao DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (produto_id) REFERENCES produtos (id),
-                FOREIGN KEY (usuario_id) REFERENCES usuarios (id)
-            )
-            """
-        )
+            conn.execute(f"PRAGMA user_version = {VERSAO_SCHEMA_PRINCIPAL}")
+            conn.commit()
 
-        # Criar tabela de depósitos
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS depositos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome TEXT NOT NULL,
-                tipo TEXT NOT NULL,
-                endereco TEXT,
-                cidade TEXT,
-                estado TEXT,
-                cep TEXT,
-                responsavel_id INTEGER,
-                capacidade_total REAL,
-                status TEXT DEFAULT 'ativo',
-                FOREIGN KEY (responsavel_id) REFERENCES usuarios (id)
-            )
-            """
-        )
+    def criar_banco_empresa(self, db_nome):
+        """Cria o banco de dados específico para a empresa com as tabelas de produtos e usuários.
 
-        # Criar tabela de localização de produtos nos depósitos
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS localizacao_produtos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                deposito_id INTEGER NOT NULL,
-                produto_id INTEGER NOT NULL,
-                quantidade INTEGER NOT NULL,
-                corredor TEXT,
-                prateleira TEXT,
-                nivel TEXT,
-                posicao TEXT,
-                data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (deposito_id) REFERENCES depositos (id),
-                FOREIGN KEY (produto_id) REFERENCES produtos (id)
-            )
-            """
-        )
+        O banco é montado em um arquivo temporário e só então movido para o
+        caminho definitivo com ``os.replace``, que substitui atomicamente um
+        banco anterior de mesmo nome. Se o destino estiver em uso, o
+        ``PermissionError`` é propagado para quem chamou.
+        """
+        caminho_db = caminho_banco_empresa(db_nome)
+        caminho_tmp = caminho_db + ".tmp"
+        if os.path.exists(caminho_tmp):
+            os.remove(caminho_tmp)
+
+        with closing(self._connect(caminho_tmp)) as conn:
+            conn.executescript(self._EMPRESA_SCHEMA_DDL)
+            conn.execute(f"PRAGMA user_version = {VERSAO_SCHEMA_EMPRESA}")
+            conn.commit()
 
-        # Criar tabela de fornecedores
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS fornecedores (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                razao_social TEXT NOT NULL,
-                nome_fantasia TEXT,
-                cnpj TEXT UNIQUE,
-                inscricao_estadual TEXT,
-                endereco TEXT,
-                cidade TEXT,
-                estado TEXT,
-                cep TEXT,
-                telefone TEXT,
-                email TEXT,
-                contato_nome TEXT,
-                prazo_entrega INTEGER,
-                condicao_pagamento TEXT,
-                status TEXT DEFAULT 'ativo'
-            )
-            """
-        )
+        # Descarta conexões e arquivos auxiliares do WAL de um banco anterior,
+        # que não podem ser reaproveitados pelo novo arquivo
+        self._fechar_pools(caminho_db)
+        for sufixo in ("-wal", "-shm"):
+            try:
+                os.remove(caminho_db + sufixo)
+            except FileNotFoundError:
+                pass
+        os.replace(caminho_tmp, caminho_db)
 
-        # Criar tabela de pedidos
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS pedidos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                numero_pedido TEXT UNIQUE NOT NULL,
-                cliente_id INTEGER,
-                usuario_id INTEGER NOT NULL,
-                status TEXT DEFAULT 'pendente',
-                tipo_pedido TEXT NOT NULL,
-                data_pedido DATETIME DEFAULT CURRENT_TIMESTAMP,
-                data_entrega_prevista DATE,
-                data_entrega_real DATE,
-                valor_total REAL,
-                observacoes TEXT,
-                FOREIGN KEY (usuario_id) REFERENCES usuarios (id)
-            )
-            """
-        )
+    def _atualizar_banco_empresa(self, conn):
+        """Cria no banco de uma empresa os índices adicionados depois dele.
 
-        # Criar tabela de itens do pedido
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS itens_pedido (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                pedido_id INTEGER NOT NULL,
-                produto_id INTEGER NOT NULL,
-                quantidade INTEGER NOT NULL,
-                preco_unitario REAL NOT NULL,
-                desconto REAL DEFAULT 0,
-                subtotal REAL NOT NULL,
-                FOREIGN KEY (pedido_id) REFERENCES pedidos (id),
-                FOREIGN KEY (produto_id) REFERENCES produtos (id)
-            )
-            """
-        )
+        Inclui os índices de texto usuarios_fts e usuarios_trigrama,
+        preenchidos com os usuários que o banco já tiver, e roda ANALYZE para que o planejador de
+        consultas passe a considerar os índices novos.
 
-        # Criar tabela de rastreamento de entregas
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS rastreamento_entregas (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                pedido_id INTEGER NOT NULL,
-                status TEXT NOT NULL,
-                localizacao TEXT,
-                data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP,
-                observacoes TEXT,
-                usuario_id INTEGER NOT NULL,
-                FOREIGN KEY (pedido_id) REFERENCES pedidos (id),
-                FOREIGN KEY (usuario_id) REFERENCES usuarios (id)
+        Args:
+            conn (sqlite3.Connection): Conexão com o banco da empresa
+        """
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= VERSAO_SCHEMA_EMPRESA:
+            return
+        existentes = {
+            linha[0]
+            for linha in conn.execute(
+                "SELECT name FROM sqlite_master WHERE name IN ('usuarios_fts', 'usuarios_trigrama')"
             )
-            """
-        )
+        }
+        conn.executescript(self._EMPRESA_INDICES_DDL)
+        # Índices de texto criados agora recebem os usuários já cadastrados
+        for tabela in ("usuarios_fts", "usuarios_trigrama"):
+            if tabela not in existentes:
+                conn.execute(f"INSERT INTO {tabela}({tabela}) VALUES ('rebuild')")
+        conn.execute("ANALYZE")
+        conn.execute(f"PRAGMA user_version = {VERSAO_SCHEMA_EMPRESA}")
+
+    @contextmanager
+    def _get_conn(self, caminho=None):
+        """Empresta uma conexão do pool de um banco de dados.
+
+        A conexão opera em modo autocommit; se o bloco abriu uma transação
+        (``BEGIN IMMEDIATE``), ela é confirmada ao final ou desfeita em caso de
+        exceção. A conexão é então devolvida ao pool em vez de ser fechada.
+
+        Args:
+            caminho (str, optional): Arquivo do banco; se omitido, usa o banco
+                da empresa logada e produz ``None`` quando não há empresa logada
+        """
+        if caminho is None:
+            if not self.empresa_logada:
+                yield None
+                return
+            caminho = self.empresa_logada["db_path"]
 
-        conn.commit()
-        conn.close()
+        pool = self._pools.setdefault(caminho, queue.Queue(maxsize=TAMANHO_POOL))
+        try:
+            conn = pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect(caminho)
 
-    def obter_conexao_empresa(self):
-        """Retorna a conexão com o banco de dados da empresa logada."""
-        if self.empresa_logada:
-            return sqlite3.connect(
-                f'deposito_empresas/{self.empresa_logada["db_nome"]}.db'
-            )
-        return None
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            try:
+                pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+            # Pool descartado por _fechar_pools (logout) enquanto a conexão
+            # estava emprestada: ninguém mais o esvazia, então as conexões
+            # devolvidas a ele são fechadas aqui
+            if self._pools.get(caminho) is not pool:
+                self._fechar_conexoes(pool)
+
+    def _cache_obter(self, cache, chave):
+        """Retorna o valor em cache (ou None), marcando-o como usado recentemente."""
+        valor = cache.get(chave)
+        if valor is not None:
+            cache.move_to_end(chave)
+        return valor
+
+    def _cache_guardar(self, cache, chave, valor):
+        """Guarda um valor no cache, descartando o menos usado se exceder o limite."""
+        cache[chave] = valor
+        cache.move_to_end(chave)
+        if len(cache) > TAMANHO_CACHE:
+            cache.popitem(last=False)
+
+    def _fechar_pools(self, caminho=None):
+        """Fecha as conexões ociosas mantidas nos pools.
+
+        Conexões emprestadas no momento (por _executor_io ou
+        _executor_consultas) são fechadas por _get_conn ao serem devolvidas.
+
+        Args:
+            caminho (str, optional): Fecha apenas o pool deste banco; se omitido,
+                fecha todos
+        """
+        caminhos = [caminho] if caminho else list(self._pools)
+        for chave in caminhos:
+            pool = self._pools.pop(chave, None)
+            if pool is not None:
+                self._fechar_conexoes(pool)
+
+    def _fechar_conexoes(self, pool):
+        """Fecha todas as conexões ociosas de um pool, esvaziando-o."""
+        while True:
+            try:
+                pool.get_nowait().close()
+            except queue.Empty:
+                break
 
     # Métodos para gerenciamento de depósitos
     def criar_deposito(self, nome, tipo, endereco, cidade, estado, cep, responsavel_id, capacidade_total):
@@ -556,23 +1243,34 @@ class SistemaGerenciamentoDeposito:
         Returns:
             int: ID do depósito criado ou None em caso de erro
         """
-        try:
-            conn = self.obter_conexao_empresa()
-            if not conn:
-                self.exibir_mensagem_erro("Erro", "Empresa não está logada")
-                return None
-                
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO depositos 
-                (nome, tipo, endereco, cidade, estado, cep, responsavel_id, capacidade_total)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (nome, tipo, endereco, cidade, estado, cep, responsavel_id, capacidade_total))
+        ids = self.cadastrar_depositos_em_lote([
+            (nome, tipo, endereco, cidade, estado, cep, responsavel_id, capacidade_total)
+        ])
+        return ids[0] if ids else None
+
+    def cadastrar_depositos_em_lote(self, registros):
+        """Cadastra vários depósitos em uma única transação.
+        
+        Args:
+            registros (list[tuple]): Tuplas com os mesmos campos de criar_deposito,
+                na mesma ordem
             
-            deposito_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
-            return deposito_id
+        Returns:
+            list: IDs dos depósitos criados ou None em caso de erro
+        """
+        try:
+            with self._get_conn() as conn:
+                if not conn:
+                    self.exibir_mensagem_erro("Erro", "Empresa não está logada")
+                    return None
+                    
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                # RETURNING devolve o id de cada linha, sem supor ids contíguos
+                return [
+                    cursor.execute(SQL_INSERIR_DEPOSITO, registro).fetchone()[0]
+                    for registro in registros
+                ]
             
         except sqlite3.Error as e:
             self.exibir_mensagem_erro("Erro ao criar depósito", str(e))
@@ -587,35 +1285,29 @@ class SistemaGerenciamentoDeposito:
         Returns:
             dict: Dicionário com os dados do depósito ou None se não encontrado
         """
+        if not self.empresa_logada:
+            return None
+
+        chave = (self.empresa_logada["db_nome"], deposito_id)
+        deposito = self._cache_obter(self._cache_depositos, chave)
+        if deposito:
+            return dict(deposito)
+
         try:
-            conn = self.obter_conexao_empresa()
-            if not conn:
-                return None
+            with self._get_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT id, nome, tipo, endereco, cidade, estado, cep, 
+                           responsavel_id, capacidade_total, status
+                    FROM depositos
+                    WHERE id = ?
+                """, (deposito_id,))
                 
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id, nome, tipo, endereco, cidade, estado, cep, 
-                       responsavel_id, capacidade_total, status
-                FROM depositos
-                WHERE id = ?
-            """, (deposito_id,))
-            
-            deposito = cursor.fetchone()
-            conn.close()
+                deposito = cursor.fetchone()
             
             if deposito:
-                return {
-                    'id': deposito[0],
-                    'nome': deposito[1],
-                    'tipo': deposito[2],
-                    'endereco': deposito[3],
-                    'cidade': deposito[4],
-                    'estado': deposito[5],
-                    'cep': deposito[6],
-                    'responsavel_id': deposito[7],
-                    'capacidade_total': deposito[8],
-                    'status': deposito[9]
-                }
+                self._cache_guardar(self._cache_depositos, chave, deposito)
+                return dict(deposito)
             return None
             
         except sqlite3.Error as e:
@@ -632,46 +1324,16 @@ class SistemaGerenciamentoDeposito:
             list: Lista de dicionários com dados dos depósitos
         """
         try:
-            conn = self.obter_conexao_empresa()
-            if not conn:
-                return []
-                
-            cursor = conn.cursor()
-            query = """
-                SELECT id, nome, tipo, endereco, cidade, estado, cep, 
-                       responsavel_id, capacidade_total, status
-                FROM depositos
-                WHERE 1=1
-            """
-            
-            params = []
-            if filtro:
-                if 'status' in filtro:
-                    query += " AND status = ?"
-                    params.append(filtro['status'])
-                if 'tipo' in filtro:
-                    query += " AND tipo = ?"
-                    params.append(filtro['tipo'])
-                if 'cidade' in filtro:
-                    query += " AND cidade = ?"
-                    params.append(filtro['cidade'])
-            
-            cursor.execute(query, params)
-            depositos = cursor.fetchall()
-            conn.close()
+            with self._get_conn() as conn:
+                if not conn:
+                    return []
+                    
+                cursor = conn.cursor()
+                query, params = aplicar_filtros(CONSULTAS_DEPOSITOS, FILTROS_DEPOSITO, filtro)
+                cursor.execute(query, params)
+                depositos = cursor.fetchall()
             
-            return [{
-                'id': d[0],
-                'nome': d[1],
-                'tipo': d[2],
-                'endereco': d[3],
-                'cidade': d[4],
-                'estado': d[5],
-                'cep': d[6],
-                'responsavel_id': d[7],
-                'capacidade_total': d[8],
-                'status': d[9]
-            } for d in depositos]
+            return list(map(dict, depositos))
             
         except sqlite3.Error as e:
             self.exibir_mensagem_erro("Erro ao listar depósitos", str(e))
@@ -688,35 +1350,26 @@ class SistemaGerenciamentoDeposito:
             bool: True se atualizado com sucesso, False caso contrário
         """
         try:
-            conn = self.obter_conexao_empresa()
-            if not conn:
-                return False
+            with self._get_conn() as conn:
+                if not conn:
+                    return False
+                    
+                cursor = conn.cursor()
+                campos, valores = [], []
+                for campo, valor in dados.items():
+                    if campo in CAMPOS_DEPOSITO:
+                        campos.append(campo)
+                        valores.append(valor)
                 
-            cursor = conn.cursor()
-            campos_permitidos = [
-                'nome', 'tipo', 'endereco', 'cidade', 'estado', 'cep',
-                'responsavel_id', 'capacidade_total', 'status'
-            ]
-            
-            updates = [f"{campo} = ?" for campo in dados.keys() 
-                      if campo in campos_permitidos]
-            valores = [dados[campo] for campo in dados.keys() 
-                      if campo in campos_permitidos]
-            
-            if not updates:
-                return False
+                if not campos:
+                    return False
+                    
+                query = montar_sql_atualizacao("depositos", tuple(campos))
+                valores.append(deposito_id)
                 
-            query = f"""
-                UPDATE depositos
-                SET {', '.join(updates)}
-                WHERE id = ?
-            """
-            valores.append(deposito_id)
-            
-            cursor.execute(query, valores)
-            conn.commit()
-            conn.close()
-            return True
+                cursor.execute(query, valores)
+                self._cache_depositos.pop((self.empresa_logada["db_nome"], deposito_id), None)
+                return True
             
         except sqlite3.Error as e:
             self.exibir_mensagem_erro("Erro ao atualizar depósito", str(e))
@@ -732,35 +1385,36 @@ class SistemaGerenciamentoDeposito:
             bool: True se excluído com sucesso, False caso contrário
         """
         try:
-            conn = self.obter_conexao_empresa()
-            if not conn:
-                return False
+            with self._get_conn() as conn:
+                if not conn:
+                    return False
+                    
+                cursor = conn.cursor()
+                # Verificação e exclusão lógica na mesma transação de escrita
+                cursor.execute("BEGIN IMMEDIATE")
+                # Verifica se existem produtos no depósito
+                cursor.execute("""
+                    SELECT 1 FROM localizacao_produtos
+                    WHERE deposito_id = ?
+                    LIMIT 1
+                """, (deposito_id,))
                 
-            cursor = conn.cursor()
-            # Verifica se existem produtos no depósito
-            cursor.execute("""
-                SELECT COUNT(*) FROM localizacao_produtos
-                WHERE deposito_id = ?
-            """, (deposito_id,))
-            
-            if cursor.fetchone()[0] > 0:
-                self.exibir_mensagem_erro(
-                    "Erro",
-                    "Não é possível excluir o depósito pois existem produtos vinculados"
-                )
-                conn.close()
-                return False
-            
-            # Realiza exclusão lógica
-            cursor.execute("""
-                UPDATE depositos
-                SET status = 'inativo'
-                WHERE id = ?
-            """, (deposito_id,))
-            
-            conn.commit()
-            conn.close()
-            return True
+                if cursor.fetchone() is not None:
+                    self.exibir_mensagem_erro(
+                        "Erro",
+                        "Não é possível excluir o depósito pois existem produtos vinculados"
+                    )
+                    return False
+                
+                # Realiza exclusão lógica
+                cursor.execute("""
+                    UPDATE depositos
+                    SET status = 'inativo'
+                    WHERE id = ?
+                """, (deposito_id,))
+                
+                self._cache_depositos.pop((self.empresa_logada["db_nome"], deposito_id), None)
+                return True
             
         except sqlite3.Error as e:
             self.exibir_mensagem_erro("Erro ao excluir depósito", str(e))
@@ -790,27 +1444,36 @@ class SistemaGerenciamentoDeposito:
         Returns:
             int: ID do fornecedor criado ou None em caso de erro
         """
-        try:
-            conn = self.obter_conexao_empresa()
-            if not conn:
-                self.exibir_mensagem_erro("Erro", "Empresa não está logada")
-                return None
-                
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO fornecedores (
-                    razao_social, nome_fantasia, cnpj, inscricao_estadual,
-                    endereco, cidade, estado, cep, telefone, email,
-                    contato_nome, prazo_entrega, condicao_pagamento
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (razao_social, nome_fantasia, cnpj, inscricao_estadual,
-                  endereco, cidade, estado, cep, telefone, email,
-                  contato_nome, prazo_entrega, condicao_pagamento))
+        ids = self.cadastrar_fornecedores_em_lote([
+            (razao_social, nome_fantasia, cnpj, inscricao_estadual,
+             endereco, cidade, estado, cep, telefone, email,
+             contato_nome, prazo_entrega, condicao_pagamento)
+        ])
+        return ids[0] if ids else None
+
+    def cadastrar_fornecedores_em_lote(self, registros):
+        """Cadastra vários fornecedores em uma única transação.
+        
+        Args:
+            registros (list[tuple]): Tuplas com os mesmos campos de criar_fornecedor,
+                na mesma ordem
             
-            fornecedor_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
-            return fornecedor_id
+        Returns:
+            list: IDs dos fornecedores criados ou None em caso de erro
+        """
+        try:
+            with self._get_conn() as conn:
+                if not conn:
+                    self.exibir_mensagem_erro("Erro", "Empresa não está logada")
+                    return None
+                    
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                # RETURNING devolve o id de cada linha, sem supor ids contíguos
+                return [
+                    cursor.execute(SQL_INSERIR_FORNECEDOR, registro).fetchone()[0]
+                    for registro in registros
+                ]
             
         except sqlite3.Error as e:
             self.exibir_mensagem_erro("Erro ao criar fornecedor", str(e))
@@ -825,107 +1488,76 @@ class SistemaGerenciamentoDeposito:
         Returns:
             dict: Dicionário com os dados do fornecedor ou None se não encontrado
         """
+        if not self.empresa_logada:
+            return None
+
+        chave = (self.empresa_logada["db_nome"], fornecedor_id)
+        fornecedor = self._cache_obter(self._cache_fornecedores, chave)
+        if fornecedor:
+            return dict(fornecedor)
+
         try:
-            conn = self.obter_conexao_empresa()
-            if not conn:
-                return None
+            with self._get_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(SQL_OBTER_FORNECEDOR, (fornecedor_id,))
+                
+                fornecedor = cursor.fetchone()
                 
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id, razao_social, nome_fantasia, cnpj, inscricao_estadual,
-                       endereco, cidade, estado, cep, telefone, email,
-                       contato_nome, prazo_entrega, condicao_pagamento, status
-                FROM fornecedores
-                WHERE id = ?
-            """, (fornecedor_id,))
-            
-            fornecedor = cursor.fetchone()
-            conn.close()
-            
             if fornecedor:
-                return {
-                    'id': fornecedor[0],
-                    'razao_social': fornecedor[1],
-                    'nome_fantasia': fornecedor[2],
-                    'cnpj': fornecedor[3],
-                    'inscricao_estadual': fornecedor[4],
-                    'endereco': fornecedor[5],
-                    'cidade': fornecedor[6],
-                    'estado': fornecedor[7],
-                    'cep': fornecedor[8],
-                    'telefone': fornecedor[9],
-                    'email': fornecedor[10],
-                    'contato_nome': fornecedor[11],
-                    'prazo_entrega': fornecedor[12],
-                    'condicao_pagamento': fornecedor[13],
-                    'status': fornecedor[14]
-                }
+                self._cache_guardar(self._cache_fornecedores, chave, fornecedor)
+                return dict(fornecedor)
             return None
-            
+                
         except sqlite3.Error as e:
             self.exibir_mensagem_erro("Erro ao consultar fornecedor", str(e))
             return None
 
     def listar_fornecedores(self, filtro=None):
-        """Lista todos os fornecedores cadastrados com opção de filtro.
+        """Lista os fornecedores cadastrados com opção de filtro.
         
         Args:
-            filtro (dict, optional): Dicionário com filtros a serem aplicados
+            filtro (dict, optional): Dicionário com filtros a serem aplicados.
+                Sem a chave 'status', apenas fornecedores ativos são listados
             
         Returns:
             list: Lista de dicionários com dados dos fornecedores
         """
+        return list(map(dict, self.iter_fornecedores(filtro)))
+
+    def iter_fornecedores(self, filtro=None, tamanho_lote=TAMANHO_LOTE_LEITURA):
+        """Percorre os fornecedores cadastrados sob demanda, com opção de filtro.
+        
+        As linhas são lidas do cursor em lotes com ``fetchmany``, de modo que
+        apenas um lote fica em memória por vez. A conexão permanece emprestada
+        do pool até o gerador ser esgotado ou fechado.
+        
+        Args:
+            filtro (dict, optional): Dicionário com filtros a serem aplicados.
+                Sem a chave 'status', apenas fornecedores ativos são listados
+            tamanho_lote (int, optional): Quantidade de linhas lidas por vez
+            
+        Yields:
+            sqlite3.Row: Dados de cada fornecedor
+        """
         try:
-            conn = self.obter_conexao_empresa()
-            if not conn:
-                return []
+            with self._get_conn() as conn:
+                if not conn:
+                    return
+                    
+                cursor = conn.cursor()
+                # Fornecedores inativos (excluídos logicamente) ficam fora por padrão
+                if not filtro or 'status' not in filtro:
+                    filtro = dict(filtro or {}, ativos=True)
+                query, params = aplicar_filtros(CONSULTAS_FORNECEDORES, FILTROS_FORNECEDOR, filtro)
+                cursor.execute(query, params)
+                while True:
+                    lote = cursor.fetchmany(tamanho_lote)
+                    if not lote:
+                        break
+                    yield from lote
                 
-            cursor = conn.cursor()
-            query = """
-                SELECT id, razao_social, nome_fantasia, cnpj, inscricao_estadual,
-                       endereco, cidade, estado, cep, telefone, email,
-                       contato_nome, prazo_entrega, condicao_pagamento, status
-                FROM fornecedores
-                WHERE 1=1
-            """
-            
-            params = []
-            if filtro:
-                if 'status' in filtro:
-                    query += " AND status = ?"
-                    params.append(filtro['status'])
-                if 'cidade' in filtro:
-                    query += " AND cidade = ?"
-                    params.append(filtro['cidade'])
-                if 'estado' in filtro:
-                    query += " AND estado = ?"
-                    params.append(filtro['estado'])
-            
-            cursor.execute(query, params)
-            fornecedores = cursor.fetchall()
-            conn.close()
-            
-            return [{
-                'id': f[0],
-                'razao_social': f[1],
-                'nome_fantasia': f[2],
-                'cnpj': f[3],
-                'inscricao_estadual': f[4],
-                'endereco': f[5],
-                'cidade': f[6],
-                'estado': f[7],
-                'cep': f[8],
-                'telefone': f[9],
-                'email': f[10],
-                'contato_nome': f[11],
-                'prazo_entrega': f[12],
-                'condicao_pagamento': f[13],
-                'status': f[14]
-            } for f in fornecedores]
-            
         except sqlite3.Error as e:
             self.exibir_mensagem_erro("Erro ao listar fornecedores", str(e))
-            return []
 
     def atualizar_fornecedor(self, fornecedor_id, dados):
         """Atualiza os dados de um fornecedor existente.
@@ -935,40 +1567,39 @@ class SistemaGerenciamentoDeposito:
             dados (dict): Dicionário com os campos a serem atualizados
             
         Returns:
-            bool: True se atualizado com sucesso, False caso contrário
+            dict: Dados do fornecedor já atualizados, ou False se nada foi atualizado
         """
         try:
-            conn = self.obter_conexao_empresa()
-            if not conn:
-                return False
+            with self._get_conn() as conn:
+                if not conn:
+                    return False
+                    
+                cursor = conn.cursor()
+                campos, valores = [], []
+                for campo, valor in dados.items():
+                    if campo in CAMPOS_FORNECEDOR:
+                        campos.append(campo)
+                        valores.append(valor)
                 
-            cursor = conn.cursor()
-            campos_permitidos = [
-                'razao_social', 'nome_fantasia', 'cnpj', 'inscricao_estadual',
-                'endereco', 'cidade', 'estado', 'cep', 'telefone', 'email',
-                'contato_nome', 'prazo_entrega', 'condicao_pagamento', 'status'
-            ]
-            
-            updates = [f"{campo} = ?" for campo in dados.keys() 
-                      if campo in campos_permitidos]
-            valores = [dados[campo] for campo in dados.keys() 
-                      if campo in campos_permitidos]
-            
-            if not updates:
+                if not campos:
+                    return False
+                    
+                query = montar_sql_atualizacao(
+                    "fornecedores", tuple(campos), retorno=COLUNAS_FORNECEDOR
+                )
+                valores.append(fornecedor_id)
+                
+                # RETURNING devolve o registro atualizado sem um SELECT adicional
+                cursor.execute(query, valores)
+                fornecedor = cursor.fetchone()
+                
+            chave = (self.empresa_logada["db_nome"], fornecedor_id)
+            if not fornecedor:
+                self._cache_fornecedores.pop(chave, None)
                 return False
+            self._cache_guardar(self._cache_fornecedores, chave, fornecedor)
+            return dict(fornecedor)
                 
-            query = f"""
-                UPDATE fornecedores
-                SET {', '.join(updates)}
-                WHERE id = ?
-            """
-            valores.append(fornecedor_id)
-            
-            cursor.execute(query, valores)
-            conn.commit()
-            conn.close()
-            return True
-            
         except sqlite3.Error as e:
             self.exibir_mensagem_erro("Erro ao atualizar fornecedor", str(e))
             return False
@@ -983,36 +1614,38 @@ class SistemaGerenciamentoDeposito:
             bool: True se excluído com sucesso, False caso contrário
         """
         try:
-            conn = self.obter_conexao_empresa()
-            if not conn:
-                return False
+            with self._get_conn() as conn:
+                if not conn:
+                    return False
+                    
+                cursor = conn.cursor()
+                # Exclusão lógica condicionada à ausência de produtos vinculados,
+                # verificada e aplicada atomicamente em uma única instrução
+                cursor.execute("""
+                    UPDATE fornecedores
+                    SET status = 'inativo'
+                    WHERE id = ?
+                      AND NOT EXISTS (SELECT 1 FROM produtos WHERE fornecedor = ?)
+                    RETURNING id
+                """, (fornecedor_id, fornecedor_id))
+                
+                if cursor.fetchone() is None:
+                    # Só no caminho de falha: distingue vínculo de fornecedor inexistente
+                    cursor.execute("""
+                        SELECT 1 FROM produtos
+                        WHERE fornecedor = ?
+                        LIMIT 1
+                    """, (fornecedor_id,))
+                    if cursor.fetchone() is not None:
+                        self.exibir_mensagem_erro(
+                            "Erro",
+                            "Não é possível excluir o fornecedor pois existem produtos vinculados"
+                        )
+                    return False
+                
+                self._cache_fornecedores.pop((self.empresa_logada["db_nome"], fornecedor_id), None)
+                return True
                 
-            cursor = conn.cursor()
-            # Verifica se existem produtos vinculados ao fornecedor
-            cursor.execute("""
-                SELECT COUNT(*) FROM produtos
-                WHERE fornecedor = ?
-            """, (fornecedor_id,))
-            
-            if cursor.fetchone()[0] > 0:
-                self.exibir_mensagem_erro(
-                    "Erro",
-                    "Não é possível excluir o fornecedor pois existem produtos vinculados"
-                )
-                conn.close()
-                return False
-            
-            # Realiza exclusão lógica
-            cursor.execute("""
-                UPDATE fornecedores
-                SET status = 'inativo'
-                WHERE id = ?
-            """, (fornecedor_id,))
-            
-            conn.commit()
-            conn.close()
-            return True
-            
         except sqlite3.Error as e:
             self.exibir_mensagem_erro("Erro ao excluir fornecedor", str(e))
             return False
@@ -1040,28 +1673,37 @@ class SistemaGerenciamentoDeposito:
         Returns:
             int: ID do produto criado ou None em caso de erro
         """
+        ids = self.cadastrar_produtos_em_lote([
+            (codigo_barras, sku, nome, descricao, categoria, marca,
+             quantidade, quantidade_minima, preco_custo, preco_venda,
+             localizacao, fornecedor)
+        ])
+        return ids[0] if ids else None
+
+    def cadastrar_produtos_em_lote(self, registros):
+        """Cadastra vários produtos em uma única transação.
+        
+        Args:
+            registros (list[tuple]): Tuplas com os mesmos campos de criar_produto,
+                na mesma ordem
+            
+        Returns:
+            list: IDs dos produtos criados ou None em caso de erro
+        """
         try:
-            conn = self.obter_conexao_empresa()
-            if not conn:
-                self.exibir_mensagem_erro("Erro", "Empresa não está logada")
-                return None
+            with self._get_conn() as conn:
+                if not conn:
+                    self.exibir_mensagem_erro("Erro", "Empresa não está logada")
+                    return None
+                    
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                # RETURNING devolve o id de cada linha, sem supor ids contíguos
+                return [
+                    cursor.execute(SQL_INSERIR_PRODUTO, registro).fetchone()[0]
+                    for registro in registros
+                ]
                 
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO produtos (
-                    codigo_barras, sku, nome, descricao, categoria, marca,
-                    quantidade, quantidade_minima, preco_custo, preco_venda,
-                    localizacao, fornecedor
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (codigo_barras, sku, nome, descricao, categoria, marca,
-                  quantidade, quantidade_minima, preco_custo, preco_venda,
-                  localizacao, fornecedor))
-            
-            produto_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
-            return produto_id
-            
         except sqlite3.Error as e:
             self.exibir_mensagem_erro("Erro ao criar produto", str(e))
             return None
@@ -1075,624 +1717,480 @@ class SistemaGerenciamentoDeposito:
         Returns:
             dict: Dicionário com os dados do produto ou None se não encontrado
         """
-        try:
-            conn = self.obter_conexao_empresa()
-            if not conn:
-                return None
-                
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id, codigo_barras, sku, nome, descricao, categoria, marca,
-                       quantidade, quantidade_minima, preco_custo, preco_venda,
-                       localizacao, fornecedor, data_cadastro, ultima_atualizacao
-                FROM produtos
-                WHERE id = ?
-            """, (produto_id,))
-            
-            produto = cursor.fetchone()
-            conn.close()
-            
-            if produto:
-                return {
-                    'id': produto[0],
-                    'codigo_barras': produto[1],
-                    'sku': produto[2],
-                    'nome': produto[3],
-                    'descricao': produto[4],
-                    'categoria': produto[5],
-                    'marca': produto[6],
-                    'quantidade': produto[7],
-                    'quantidade_minima': produto[8],
-                    'preco_custo': produto[9],
-                    'preco_venda': produto[10],
-                    'localizacao': produto[11],
-                    'fornecedor': produto[12],
-                    'data_cadastro': produto[13],
-                    'ultima_atualizacao': produto[14]
-                }
-            return None
-            
-        except sqlite3.Error as e:
-            self.exibir_mensagem_erro("Erro ao consultar produto", str(e))
+        if not self.empresa_logada:
             return None
 
-    def listar_produtos(self, filtro=None):
-        """Lista todos os produtos cadastrados com opção de filtro.
-        
-        Args:
-            filtro (dict, optional): Dicionário com filtros a serem aplicados
-            
-        Returns:
-            list: Lista de dicionários com dados dos produtos
-        """
-        try:
-            conn = self.obter_conexao_empresa()
-            if not conn:
-                return []
-                
-            cursor = conn.cursor()
-            query = """
-                SELECT id, codigo_barras, sku, nome, descricao, categoria, marca,
-                       quantidade, quantidade_minima, preco_custo, preco_venda,
-                       localizacao, fornecedor, data_cadastro, ultima_atualizacao
-                FROM produtos
-                WHERE 1=1
-            """
-            
-            params = []
-            if filtro:
-                if 'categoria' in filtro:
-                    query += " AND categoria = ?"
-                    params.append(filtro['categoria'])
-                if 'marca' in filtro:
-                    query += " AND marca = ?"
-                    params.append(filtro['marca'])
-                if 'fornecedor' in filtro:
-                    query += " AND fornecedor = ?"
-                    params.append(filtro['fornecedor'])
-                if 'estoque_baixo' in filtro and filtro['estoque_baixo']:
-                    query += " AND quantidade <= quantidade_minima"
-            
-            cursor.execute(query, params)
-            produtos = cursor.fetchall()
-            conn.close()
-            
-            return [{
-                'id': p[0],
-                'codigo_barras': p[1],
-                'sku': p[2],
-                'nome': p[3],
-                'descricao': p[4],
-                'categoria': p[5],
-                'marca': p[6],
-                'quantidade': p[7],
-                'quantidade_minima': p[8],
-                'preco_custo': p[9],
-                'preco_venda': p[10],
-                'localizacao': p[11],
-                'fornecedor': p[12],
-                'data_cadastro': p[13],
-                'ultima_atualizacao': p[14]
-            } for p in produtos]
-            
-        except sqlite3.Error as e:
-            self.exibir_mensagem_erro("Erro ao listar produtos", str(e))
-            return []
+        chave = (self.empresa_logada["db_nome"], produto_id)
+        produto = self._cache_obter(self._cache_produtos, chave)
+        if produto:
+            return dict(produto)
 
-    def atualizar_produto(self, produto_id, dados):
-        """Atualiza os dados de um produto existente.
-        
-        Args:
-            produto_id (int): ID do produto a ser atualizado
-            dados (dict): Dicionário com os campos a serem atualizados
-            
-        Returns:
-            bool: True se atualizado com sucesso, False caso contrário
-        """
         try:
-            conn = self.obter_conexao_empresa()
-            if not conn:
-                return False
+            with self._get_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(SQL_OBTER_PRODUTO, (produto_id,))
                 
-            cursor = conn.cursor()
-            campos_permitidos = [
-                'codigo_barras', 'sku', 'nome', 'descricao', 'categoria', 'marca',
-                'quantidade', 'quantidade_minima', 'preco_custo', 'preco_venda',
-                'localizacao', 'fornecedor'
-            ]
-            
-            updates = [f"{campo} = ?" for campo in dados.keys() 
-                      if campo in campos_permitidos]
-            valores = [dados[campo] for campo in dados.keys() 
-                      if campo in campos_permitidos]
-            
-            if not updates:
-                return False
+                produto = cursor.fetchone()
                 
-            # Adiciona atualização do campo ultima_atualizacao
-            updates.append("ultima_atualizacao = CURRENT_TIMESTAMP")
-            
-            query = f"""
-                UPDATE produtos
-                SET {', '.join(updates)}
-                WHERE id = ?
-            """
-            valores.append(produto_id)
-            
-            cursor.execute(query, valores)
-            conn.commit()
-            conn.close()
-            return True
-            
-        except sqlite3.Error as e:
-            self.exibir_mensagem_erro("Erro ao atualizar produto", str(e))
-            return False
-
-    def excluir_produto(self, produto_id):
-        """Exclui um produto do sistema.
-        
-        Args:
-            produto_id (int): ID do produto a ser excluído
-            
-        Returns:
-            bool: True se excluído com sucesso, False caso contrário
-        """
-        try:
-            conn = self.obter_conexao_empresa()
-            if not conn:
-                return False
+            if produto:
+                self._cache_guardar(self._cache_produtos, chave, produto)
+                return dict(produto)
+            return None
                 
-            cursor = conn.cursor()
-            # Verifica se existem movimentações para o produto
-            cursor.execute("""
-                SELECT COUNT(*) FROM movimentacoes_estoque
-                WHERE produto_id = ?
-            """, (produto_id,))
-            
-            if cursor.fetchone()[0] > 0:
-                self.exibir_mensagem_erro(
-                    "Erro",
-                    "Não é possível excluir o produto pois existem movimentações registradas"
-                )
-                conn.close()
-                return False
-            
-            # Verifica se o produto está em algum pedido
-            cursor.execute("""
-                SELECT COUNT(*) FROM itens_pedido
-                WHERE produto_id = ?
-            """, (produto_id,))
-            
-            if cursor.fetchone()[0] > 0:
-                self.exibir_mensagem_erro(
-                    "Erro",
-                    "Não é possível excluir o produto pois ele está vinculado a pedidos"
-                )
-                conn.close()
-                return False
-            
-            # Remove o produto
-            cursor.execute("""
-                DELETE FROM produtos
-                WHERE id = ?
-            """, (produto_id,))
-            
-            conn.commit()
-            conn.close()
-            return True
-            
         except sqlite3.Error as e:
-            self.exibir_mensagem_erro("Erro ao excluir produto", str(e))
-            return False
-
-    def configurar_estilos(self):
-        """Configura os estilos do Tkinter usando ttk.Style."""
-        self.style = ttk.Style()
-        self.style.theme_use("clam")
-        
-        # Paleta de cores moderna e vibrante já definida no __init__
-        
-        # Configuração do tema geral
-        self.root.configure(background=self.cores["fundo"])
-        
-        # Estilo para mensagens
-        self.style.configure("Sucesso.TLabel", foreground=self.cores["sucesso"], font=("Segoe UI", 10, "bold"))
-        self.style.configure("Alerta.TLabel", foreground=self.cores["alerta"], font=("Segoe UI", 10, "bold"))
-        
-        # Estilo para efeito de foco nos campos
-        self.style.configure("FocusIn.TEntry", fieldbackground="#E3F2FD", bordercolor=self.cores["primaria"], borderwidth=2)
-        
-        # Cabeçalho
-        self.style.configure(
-            "Cabecalho.TFrame", 
-            background=self.cores["primaria"],
-            relief="raised",
-            borderwidth=1
-        )
-        self.style.configure(
-            "Cabecalho.TLabel",
-            font=("Segoe UI", 18, "bold"),
-            foreground=self.cores["texto_claro"],
-            background=self.cores["primaria"],
-            padding=(15, 10),
-        )
-        
-        # Labels
-        self.style.configure(
-            "TLabel",
-            background=self.cores["fundo"],
-            foreground=self.cores["texto"],
-            font=("Segoe UI", 10),
-            padding=3
-        )
-        self.style.configure(
-            "Titulo.TLabel", 
-            font=("Segoe UI", 18, "bold"), 
-            foreground=self.cores["primaria"],
-            background=self.cores["fundo"],
-            padding=(0, 10)
-        )
-        self.style.configure(
-            "Subtitulo.TLabel", 
-            font=("Segoe UI", 14, "bold"), 
-            foreground=self.cores["primaria_escura"],
-            background=self.cores["fundo"],
-            padding=(0, 5)
-        )
-        
-        # Botões
-        self.style.configure(
-            "TButton", 
-            font=("Segoe UI", 10),
-            padding=8,
-            relief="raised",
-            borderwidth=1
-        )
-        self.style.map(
-            "TButton",
-            foreground=[("active", self.cores["texto_claro"]), ("!disabled", self.cores["texto_claro"])],
-            background=[
-                ("active", self.cores["primaria_escura"]),
-                ("!disabled", self.cores["primaria"]),
-            ],
-            relief=[("pressed", "sunken"), ("!pressed", "raised")]
-        )
-        
-        # Adicionar efeito de hover nos botões
-        self.root.bind_class("TButton", "<Enter>", lambda e: e.widget.configure(cursor="hand2"))
-        self.root.bind_class("TButton", "<Leave>", lambda e: e.widget.configure(cursor=""))
-        
-        # Botão de destaque
-        self.style.configure(
-            "Destaque.TButton", 
-            font=("Segoe UI", 10, "bold"),
-            padding=8
-        )
-        self.style.map(
-            "Destaque.TButton",
-            foreground=[("active", self.cores["texto_claro"]), ("!disabled", self.cores["texto_claro"])],
-            background=[
-                ("active", "#E64A19"),  # Laranja mais escuro
-                ("!disabled", self.cores["destaque"]),
-            ]
-        )
-        
-        # Campos de entrada
-        self.style.configure(
-            "TEntry", 
-            fieldbackground="white", 
-            font=("Segoe UI", 10),
-            borderwidth=1,
-            relief="solid",
-            padding=5
-        )
-        
-        # Combobox personalizado
-        self.style.configure(
-            "TCombobox",
-            fieldbackground="white",
-            background=self.cores["primaria"],
-            foreground=self.cores["texto"],
-            arrowcolor=self.cores["primaria"],
-            font=("Segoe UI", 10),
-            padding=5
-        )
-        self.style.map(
-            "TCombobox",
-            fieldbackground=[("readonly", "white")],
-            selectbackground=[("readonly", self.cores["primaria"])],
-            selectforeground=[("readonly", self.cores["texto_claro"])]
-        )
-        
-        # Cabeçalho de navegação
-        self.style.configure(
-            "Header.TFrame", 
-            background=self.cores["fundo_alt"], 
-            padding=8,
-            relief="flat",
-            borderwidth=0
-        )
-        self.style.configure(
-            "Header.TButton", 
-            font=("Segoe UI", 9), 
-            width=12, 
-            padding=6, 
-            anchor="center"
-        )
-        self.style.map(
-            "Header.TButton",
-            foreground=[("active", self.cores["texto_claro"]), ("!disabled", self.cores["texto_claro"])],
-            background=[
-                ("active", self.cores["primaria_escura"]),
-                ("!disabled", self.cores["primaria"]),
-            ],
-        )
-        
-        # Menu lateral
-        self.style.configure(
-            "Submenu.TFrame", 
-            background=self.cores["fundo_alt"], 
-            borderwidth=1, 
-            relief="groove"
-        )
-        self.style.configure(
-            "Submenu.TButton",
-            font=("Segoe UI", 11),
-            width=18,
-            padding=10,
-            anchor="w",
-            background=self.cores["fundo_alt"],
-            foreground=self.cores["texto"],
-        )
-        self.style.map(
-            "Submenu.TButton",
-            background=[
-                ("active", self.cores["secundaria"]),
-                ("!disabled", self.cores["fundo_alt"]),
-            ],
-            foreground=[
-                ("active", self.cores["texto_claro"]),
-                ("!disabled", self.cores["texto"]),
-            ],
-        )
-        
-        # Treeview (tabelas)
-        self.style.configure(
-            "Treeview", 
-            background=self.cores["fundo"],
-            fieldbackground=self.cores["fundo"],
-            foreground=self.cores["texto"],
-            font=("Segoe UI", 10),
-            borderwidth=1,
-            relief="solid",
-            rowheight=25
-        )
-        self.style.configure(
-            "Treeview.Heading",
-            background=self.cores["primaria"],
-            foreground=self.cores["texto_claro"],
-            font=("Segoe UI", 10, "bold"),
-            relief="raised",
-            padding=5
-        )
-        self.style.map(
-            "Treeview",
-            background=[("selected", self.cores["secundaria"]), ("hover", self.cores["hover"])],
-            foreground=[("selected", self.cores["texto_claro"])]
-        )
-        
-        # Adicionar efeito de hover nas linhas da Treeview
-        self.root.bind_class("Treeview", "<Motion>", self._treeview_motion)
-        
-    def _treeview_motion(self, event):
-        """Implementa o efeito de hover nas linhas da Treeview."""
-        tree = event.widget
-        item = tree.identify_row(event.y)
-        
-        # Verifica se o cursor está sobre um item válido
-        if item:
-            # Obtém o item que tinha a tag 'hover' anteriormente
-            hover_items = [i for i in tree.get_children() if 'hover' in tree.item(i, 'tags')]
-            
-            # Remove a tag 'hover' apenas do item anterior
-            for i in hover_items:
-                if i != item:  # Não remove do item atual se for o mesmo
-                    tree.item(i, tags=())
-            
-            # Aplica a tag 'hover' apenas ao item atual se ainda não tiver
-            current_tags = tree.item(item, 'tags')
-            if 'hover' not in current_tags:
-                tree.item(item, tags=('hover',))
-        
-        # Scrollbars personalizados
-        self.style.configure(
-            "TScrollbar",
-            background=self.cores["fundo"],
-            arrowcolor=self.cores["primaria"],
-            bordercolor=self.cores["borda"],
-            troughcolor=self.cores["fundo_alt"],
-            relief="flat"
-        )
-        self.style.map(
-            "TScrollbar",
-            background=[("active", self.cores["primaria_escura"]), ("!disabled", self.cores["primaria"])]
-        )
-
-    def criar_header_acoes(self, container):
-        """Cria a barra de navegação e ações (CRUD) no container fornecido.
-        
-        Este método cria dois frames com botões para navegação e operações CRUD.
-        
-        Args:
-            container: O container onde o header será criado
-        """
-        nav_frame = ttk.Frame(container, style="Header.TFrame")
-        nav_frame.pack(fill=tk.X, pady=2)
-
-        botoes_nav = [
-            ("⏮️ Primeiro", self.primeiro_registro),
-            ("◀ Anterior", self.registro_anterior),
-            ("Próximo ▶", self.proximo_registro),
-            ("⏭️ Último", self.ultimo_registro),
-            ("🔍 Pesquisar", self.pesquisar_registro),
-            ("📂 Pesquisar Range", self.pesquisar_range),
-        ]
-
-        for texto, comando in botoes_nav:
-            ttk.Button(
-                nav_frame, text=texto, style="Header.TButton", command=comando
-            ).pack(side=tk.LEFT, padx=2)
-
-        crud_frame = ttk.Frame(container, style="Header.TFrame")
-        crud_frame.pack(fill=tk.X, pady=2)
-
-        botoes_crud = [
-            ("➕ Criar", self.criar_registro),
-            ("✏️ Atualizar", self.atualizar_registro),
-            ("⎘ Copiar", self.copiar_registro),
-            ("❌ Deletar", self.deletar_registro),
-            ("💾 Salvar", self.salvar_usuario),  # Alterado para salvar usuário
-            ("↩️ Reset", self.reset_edicao),
-            ("🚫 Cancelar", self.cancelar_edicao),
-        ]
+            self.exibir_mensagem_erro("Erro ao consultar produto", str(e))
+            return None
 
-        for texto, comando in botoes_crud:
-            ttk.Button(
-                crud_frame, text=texto, style="Header.TButton", command=comando
-            ).pack(side=tk.LEFT, padx=2)
-    
-    def primeiro_registro(self):
-        """Navega para o primeiro registro da lista atual.
-        
-        Esta função atualiza a visualização para mostrar o primeiro item
-        da lista de registros atual, seja produtos, usuários ou outros.
-        """
-        # Implementação dependerá do contexto atual (produtos, usuários, etc.)
-        self.exibir_mensagem_aviso("Navegação", "Primeiro registro selecionado")
-        # Aqui seria implementada a lógica para selecionar o primeiro registro
-        
-    def registro_anterior(self):
-        """Navega para o registro anterior ao atual na lista.
+    def listar_produtos(self, filtro=None):
+        """Lista todos os produtos cadastrados com opção de filtro.
         
-        Esta função atualiza a visualização para mostrar o item anterior
-        ao atual na lista de registros.
+        Args:
+            filtro (dict, optional): Dicionário com filtros a serem aplicados
+            
+        Returns:
+            list: Lista de dicionários com dados dos produtos
         """
-        # Implementação dependerá do contexto atual
-        self.exibir_mensagem_aviso("Navegação", "Registro anterior selecionado")
-        # Aqui seria implementada a lógica para selecionar o registro anterior
+        return list(map(dict, self.iter_produtos(filtro)))
+
+    def iter_produtos(self, filtro=None, tamanho_lote=TAMANHO_LOTE_LEITURA):
+        """Percorre os produtos cadastrados sob demanda, com opção de filtro.
         
-    def proximo_registro(self):
-        """Navega para o próximo registro na lista atual.
+        As linhas são lidas do cursor em lotes com ``fetchmany``, de modo que
+        apenas um lote fica em memória por vez. A conexão permanece emprestada
+        do pool até o gerador ser esgotado ou fechado.
         
-        Esta função atualiza a visualização para mostrar o próximo item
-        na lista de registros após o atual.
+        Args:
+            filtro (dict, optional): Dicionário com filtros a serem aplicados
+            tamanho_lote (int, optional): Quantidade de linhas lidas por vez
+            
+        Yields:
+            sqlite3.Row: Dados de cada produto
         """
-        # Implementação dependerá do contexto atual
-        self.exibir_mensagem_aviso("Navegação", "Próximo registro selecionado")
-        # Aqui seria implementada a lógica para selecionar o próximo registro
-        
-    def ultimo_registro(self):
-        """Navega para o último registro da lista atual.
+        try:
+            with self._get_conn() as conn:
+                if not conn:
+                    return
+                    
+                cursor = conn.cursor()
+                query, params = aplicar_filtros(CONSULTAS_PRODUTOS, FILTROS_PRODUTO, filtro)
+                cursor.execute(query, params)
+                while True:
+                    lote = cursor.fetchmany(tamanho_lote)
+                    if not lote:
+                        break
+                    yield from lote
+                
+        except sqlite3.Error as e:
+            self.exibir_mensagem_erro("Erro ao listar produtos", str(e))
+
+    def atualizar_produto(self, produto_id, dados):
+        """Atualiza os dados de um produto existente.
         
-        Esta função atualiza a visualização para mostrar o último item
-        da lista de registros atual.
+        Args:
+            produto_id (int): ID do produto a ser atualizado
+            dados (dict): Dicionário com os campos a serem atualizados
+            
+        Returns:
+            dict: Dados do produto já atualizados, ou False se nada foi atualizado
         """
-        # Implementação dependerá do contexto atual
-        self.exibir_mensagem_aviso("Navegação", "Último registro selecionado")
-        # Aqui seria implementada a lógica para selecionar o último registro
+        try:
+            with self._get_conn() as conn:
+                if not conn:
+                    return False
+                    
+                cursor = conn.cursor()
+                campos, valores = [], []
+                for campo, valor in dados.items():
+                    if campo in CAMPOS_PRODUTO:
+                        campos.append(campo)
+                        valores.append(valor)
+                
+                if not campos:
+                    return False
+                    
+                # Inclui a atualização do campo ultima_atualizacao
+                query = montar_sql_atualizacao(
+                    "produtos", tuple(campos), "ultima_atualizacao = CURRENT_TIMESTAMP",
+                    retorno=RETORNO_PRODUTO
+                )
+                valores.append(produto_id)
+                
+                # RETURNING devolve o registro atualizado sem um SELECT adicional
+                cursor.execute(query, valores)
+                produto = cursor.fetchone()
+                
+            chave = (self.empresa_logada["db_nome"], produto_id)
+            if not produto:
+                self._cache_produtos.pop(chave, None)
+                return False
+            self._cache_guardar(self._cache_produtos, chave, produto)
+            return dict(produto)
+                
+        except sqlite3.Error as e:
+            self.exibir_mensagem_erro("Erro ao atualizar produto", str(e))
+            return False
+
+    def atualizar_estoque_em_lote(self, variacoes):
+        """Aplica variações de quantidade a vários produtos de uma só vez.
         
-    def pesquisar_registro(self):
-        """Abre uma interface para pesquisar registros específicos.
+        As variações são somadas à quantidade atual com um único UPDATE ... CASE
+        por grupo de até TAMANHO_LOTE_ESTOQUE produtos, tudo em uma transação.
         
-        Esta função exibe um diálogo que permite ao usuário inserir critérios
-        de pesquisa para encontrar registros específicos no sistema.
+        Args:
+            variacoes (dict): Mapeia o ID do produto para a variação de quantidade
+                (positiva para entrada, negativa para saída)
+            
+        Returns:
+            bool: True se atualizado com sucesso, False caso contrário
         """
-        # Implementação de uma janela de pesquisa
-        self.exibir_mensagem_aviso("Pesquisa", "Função de pesquisa acionada")
-        # Aqui seria implementada a lógica para abrir uma janela de pesquisa
+        if not variacoes:
+            return False
         
-    def pesquisar_range(self):
-        """Abre uma interface para pesquisar registros dentro de um intervalo.
+        try:
+            with self._get_conn() as conn:
+                if not conn:
+                    return False
+                    
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                itens = list(variacoes.items())
+                for inicio in range(0, len(itens), TAMANHO_LOTE_ESTOQUE):
+                    lote = itens[inicio:inicio + TAMANHO_LOTE_ESTOQUE]
+                    casos = " ".join("WHEN ? THEN quantidade + ?" for _ in lote)
+                    marcadores = ", ".join("?" for _ in lote)
+                    params = [valor for item in lote for valor in item]
+                    params.extend(produto_id for produto_id, _ in lote)
+                    cursor.execute(f"""
+                        UPDATE produtos
+                        SET quantidade = CASE id {casos} END,
+                            ultima_atualizacao = CURRENT_TIMESTAMP
+                        WHERE id IN ({marcadores})
+                    """, params)
+                
+                db_nome = self.empresa_logada["db_nome"]
+                for produto_id in variacoes:
+                    self._cache_produtos.pop((db_nome, produto_id), None)
+                return True
+                
+        except sqlite3.Error as e:
+            self.exibir_mensagem_erro("Erro ao atualizar estoque", str(e))
+            return False
+
+    def excluir_produto(self, produto_id):
+        """Exclui um produto do sistema.
         
-        Esta função exibe um diálogo que permite ao usuário definir um intervalo
-        de valores para filtrar registros no sistema.
+        Args:
+            produto_id (int): ID do produto a ser excluído
+            
+        Returns:
+            bool: True se excluído com sucesso, False caso contrário
         """
-        # Implementação de uma janela de pesquisa por intervalo
-        self.exibir_mensagem_aviso("Pesquisa por Intervalo", "Função de pesquisa por intervalo acionada")
-        # Aqui seria implementada a lógica para abrir uma janela de pesquisa por intervalo
-        
-    def criar_registro(self):
-        """Prepara a interface para a criação de um novo registro.
-        
-        Esta função limpa os campos de entrada e prepara a interface
-        para que o usuário possa inserir dados para um novo registro.
+        try:
+            with self._get_conn() as conn:
+                if not conn:
+                    return False
+                    
+                cursor = conn.cursor()
+                # Verificação e exclusão na mesma transação de escrita
+                cursor.execute("BEGIN IMMEDIATE")
+                # Verifica em uma única consulta se há movimentações ou pedidos
+                # vinculados ao produto (movimentações têm prioridade na mensagem)
+                cursor.execute("""
+                    SELECT 'movimentacoes' WHERE EXISTS (
+                        SELECT 1 FROM movimentacoes_estoque WHERE produto_id = ?
+                    )
+                    UNION ALL
+                    SELECT 'pedidos' WHERE EXISTS (
+                        SELECT 1 FROM itens_pedido WHERE produto_id = ?
+                    )
+                    LIMIT 1
+                """, (produto_id, produto_id))
+                
+                vinculo = cursor.fetchone()
+                if vinculo is not None:
+                    mensagens = {
+                        'movimentacoes': "Não é possível excluir o produto pois existem movimentações registradas",
+                        'pedidos': "Não é possível excluir o produto pois ele está vinculado a pedidos",
+                    }
+                    self.exibir_mensagem_erro("Erro", mensagens[vinculo[0]])
+                    return False
+                
+                # Remove o produto
+                cursor.execute("""
+                    DELETE FROM produtos
+                    WHERE id = ?
+                """, (produto_id,))
+                
+                self._cache_produtos.pop((self.empresa_logada["db_nome"], produto_id), None)
+                return True
+                
+        except sqlite3.Error as e:
+            self.exibir_mensagem_erro("Erro ao excluir produto", str(e))
+            return False
+
+    def configurar_estilos(self):
+        """Configura os estilos do Tkinter usando ttk.Style.
+
+        As definições ficam em duas tabelas (configure e map) aplicadas em um
+        único laço; chamadas repetidas não refazem o trabalho nem duplicam os
+        bindings de classe.
         """
-        # Implementação para preparar a criação de um novo registro
-        self.exibir_mensagem_aviso("Criar", "Modo de criação de registro ativado")
-        # Aqui seria implementada a lógica para preparar a criação de um novo registro
+        if getattr(self, "_estilos_configurados", False):
+            return
+        self._estilos_configurados = True
+
+        self.style = ttk.Style()
+        self.style.theme_use("clam")
+        # Valores consultados via _estilo, indexados por (estilo, opção)
+        self._cache_estilos = {}
         
-    def atualizar_registro(self):
-        """Prepara a interface para a atualização do registro atual.
+        # Paleta de cores moderna e vibrante já definida no __init__
+        cores = self.cores
         
-        Esta função habilita a edição dos campos para que o usuário
-        possa modificar os dados do registro atualmente selecionado.
-        """
-        # Implementação para habilitar a edição do registro atual
-        self.exibir_mensagem_aviso("Atualizar", "Modo de atualização de registro ativado")
-        # Aqui seria implementada a lógica para habilitar a edição do registro atual
+        # Configuração do tema geral
+        self.root.configure(background=cores["fundo"])
+        
+        estilos = [
+            # Estilo para mensagens
+            ("Sucesso.TLabel", dict(foreground=cores["sucesso"], font=("Segoe UI", 10, "bold"))),
+            ("Alerta.TLabel", dict(foreground=cores["alerta"], font=("Segoe UI", 10, "bold"))),
+            # Estilo para efeito de foco nos campos
+            ("FocusIn.TEntry", dict(fieldbackground="#E3F2FD", bordercolor=cores["primaria"], borderwidth=2)),
+            # Cabeçalho
+            ("Cabecalho.TFrame", dict(
+                background=cores["primaria"],
+                relief="raised",
+                borderwidth=1,
+            )),
+            ("Cabecalho.TLabel", dict(
+                font=("Segoe UI", 18, "bold"),
+                foreground=cores["texto_claro"],
+                background=cores["primaria"],
+                padding=(15, 10),
+            )),
+            # Labels
+            ("TLabel", dict(
+                background=cores["fundo"],
+                foreground=cores["texto"],
+                font=("Segoe UI", 10),
+                padding=3,
+            )),
+            ("Titulo.TLabel", dict(
+                font=("Segoe UI", 18, "bold"),
+                foreground=cores["primaria"],
+                background=cores["fundo"],
+                padding=(0, 10),
+            )),
+            ("Subtitulo.TLabel", dict(
+                font=("Segoe UI", 14, "bold"),
+                foreground=cores["primaria_escura"],
+                background=cores["fundo"],
+                padding=(0, 5),
+            )),
+            # Botões
+            ("TButton", dict(
+                font=("Segoe UI", 10),
+                padding=8,
+                relief="raised",
+                borderwidth=1,
+            )),
+            # Botão de destaque
+            ("Destaque.TButton", dict(
+                font=("Segoe UI", 10, "bold"),
+                padding=8,
+            )),
+            # Campos de entrada
+            ("TEntry", dict(
+                fieldbackground="white",
+                font=("Segoe UI", 10),
+                borderwidth=1,
+                relief="solid",
+                padding=5,
+            )),
+            # Combobox personalizado
+            ("TCombobox", dict(
+                fieldbackground="white",
+                background=cores["primaria"],
+                foreground=cores["texto"],
+                arrowcolor=cores["primaria"],
+                font=("Segoe UI", 10),
+                padding=5,
+            )),
+            # Cabeçalho de navegação
+            ("Header.TFrame", dict(
+                background=cores["fundo_alt"],
+                padding=8,
+                relief="flat",
+                borderwidth=0,
+            )),
+            ("Header.TButton", dict(
+                font=("Segoe UI", 9),
+                width=12,
+                padding=6,
+                anchor="center",
+            )),
+            # Menu lateral
+            ("Submenu.TFrame", dict(
+                background=cores["fundo_alt"],
+                borderwidth=1,
+                relief="groove",
+            )),
+            # Labels sobre Submenu.TFrame (herdam de TLabel, Titulo e Subtitulo)
+            ("Submenu.TLabel", dict(background=cores["fundo_alt"])),
+            ("Submenu.Titulo.TLabel", dict(background=cores["fundo_alt"])),
+            ("Submenu.Subtitulo.TLabel", dict(background=cores["fundo_alt"])),
+            ("Submenu.TButton", dict(
+                font=("Segoe UI", 11),
+                width=18,
+                padding=10,
+                anchor="w",
+                background=cores["fundo_alt"],
+                foreground=cores["texto"],
+            )),
+            # Treeview (tabelas)
+            ("Treeview", dict(
+                background=cores["fundo"],
+                fieldbackground=cores["fundo"],
+                foreground=cores["texto"],
+                font=("Segoe UI", 10),
+                borderwidth=1,
+                relief="solid",
+                rowheight=25,
+            )),
+            ("Treeview.Heading", dict(
+                background=cores["primaria"],
+                foreground=cores["texto_claro"],
+                font=("Segoe UI", 10, "bold"),
+                relief="raised",
+                padding=5,
+            )),
+            # Scrollbars personalizados
+            ("TScrollbar", dict(
+                background=cores["fundo"],
+                arrowcolor=cores["primaria"],
+                bordercolor=cores["borda"],
+                troughcolor=cores["fundo_alt"],
+                relief="flat",
+            )),
+        ]
         
-    def copiar_registro(self):
-        """Cria uma cópia do registro atual para edição.
+        mapas = [
+            ("TButton", dict(
+                foreground=[("active", cores["texto_claro"]), ("!disabled", cores["texto_claro"])],
+                background=[
+                    ("active", cores["primaria_escura"]),
+                    ("!disabled", cores["primaria"]),
+                ],
+                relief=[("pressed", "sunken"), ("!pressed", "raised")],
+            )),
+            ("Destaque.TButton", dict(
+                foreground=[("active", cores["texto_claro"]), ("!disabled", cores["texto_claro"])],
+                background=[
+                    ("active", "#E64A19"),  # Laranja mais escuro
+                    ("!disabled", cores["destaque"]),
+                ],
+            )),
+            ("TCombobox", dict(
+                fieldbackground=[("readonly", "white")],
+                selectbackground=[("readonly", cores["primaria"])],
+                selectforeground=[("readonly", cores["texto_claro"])],
+            )),
+            ("Header.TButton", dict(
+                foreground=[("active", cores["texto_claro"]), ("!disabled", cores["texto_claro"])],
+                background=[
+                    ("active", cores["primaria_escura"]),
+                    ("!disabled", cores["primaria"]),
+                ],
+            )),
+            ("Submenu.TButton", dict(
+                background=[
+                    ("active", cores["secundaria"]),
+                    ("!disabled", cores["fundo_alt"]),
+                ],
+                foreground=[
+                    ("active", cores["texto_claro"]),
+                    ("!disabled", cores["texto"]),
+                ],
+            )),
+            ("Treeview", dict(
+                background=[("selected", cores["secundaria"]), ("hover", cores["hover"])],
+                foreground=[("selected", cores["texto_claro"])],
+            )),
+            ("TScrollbar", dict(
+                background=[("active", cores["primaria_escura"]), ("!disabled", cores["primaria"])],
+            )),
+        ]
         
-        Esta função duplica o registro atual e prepara a interface
-        para que o usuário possa editar a cópia antes de salvá-la.
-        """
-        # Implementação para copiar o registro atual
-        self.exibir_mensagem_aviso("Copiar", "Registro atual copiado para edição")
-        # Aqui seria implementada a lógica para copiar o registro atual
+        for nome, opcoes in estilos:
+            self.style.configure(nome, **opcoes)
+        for nome, opcoes in mapas:
+            self.style.map(nome, **opcoes)
         
-    def deletar_registro(self):
-        """Remove o registro atual do sistema após confirmação.
+        # Opções dos botões tk do cabeçalho (criar_botoes_navegacao), compartilhadas
+        # por todos eles; o fundo acompanha o de Cabecalho.TFrame
+        fundo_cabecalho = self._estilo("Cabecalho.TFrame", "background")
+        self._estilo_botao_cabecalho = {
+            "background": fundo_cabecalho,
+            "foreground": "#FFFFFF",
+            "font": ("Segoe UI", 10, "bold"),
+            "borderwidth": 0,
+            "highlightthickness": 0,
+            "activebackground": fundo_cabecalho,
+            "activeforeground": "#FFFFFF",
+            "padx": 10,
+            "pady": 5
+        }
         
-        Esta função exibe um diálogo de confirmação e, se confirmado,
-        remove o registro atual do banco de dados.
-        """
-        # Implementação para deletar o registro atual com confirmação
-        confirmacao = messagebox.askyesno("Confirmar Exclusão", "Tem certeza que deseja excluir este registro?")
-        if confirmacao:
-            self.exibir_mensagem_aviso("Deletar", "Registro excluído com sucesso")
-            # Aqui seria implementada a lógica para deletar o registro atual
+        # Adicionar efeito de hover nos botões
+        self.root.bind_class("TButton", "<Enter>", lambda e: e.widget.configure(cursor="hand2"))
+        self.root.bind_class("TButton", "<Leave>", lambda e: e.widget.configure(cursor=""))
         
-    def salvar_usuario(self):
-        """Salva os dados do usuário atual no banco de dados.
+        # Adicionar efeito de hover nas linhas da Treeview
+        self.root.bind_class("Treeview", "<Motion>", self._treeview_motion)
         
-        Esta função valida os dados inseridos e, se válidos,
-        salva o usuário atual no banco de dados da empresa.
+    def _estilo(self, estilo, opcao):
+        """Consulta uma opção de estilo ttk, memorizando o resultado.
+
+        Os estilos são definidos uma única vez em configurar_estilos, então cada
+        par (estilo, opção) só precisa ir ao Tcl na primeira consulta.
+
+        Args:
+            estilo (str): Nome do estilo (ex: 'Submenu.TFrame')
+            opcao (str): Opção consultada (ex: 'background')
+
+        Returns:
+            str: Valor da opção no estilo
         """
-        # Implementação para salvar o usuário atual
-        self.exibir_mensagem_aviso("Salvar", "Usuário salvo com sucesso")
-        # Aqui seria implementada a lógica para salvar o usuário atual
-        
-    def reset_edicao(self):
-        """Redefine os campos de edição para seus valores originais.
-        
-        Esta função descarta as alterações não salvas e restaura
-        os campos para os valores originais do registro.
+        chave = (estilo, opcao)
+        valor = self._cache_estilos.get(chave)
+        if valor is None:
+            valor = self._cache_estilos[chave] = self.style.lookup(estilo, opcao)
+        return valor
+
+    def _treeview_motion(self, event):
+        """Implementa o efeito de hover nas linhas da Treeview.
+
+        O último item destacado fica guardado no próprio widget, de modo que
+        cada movimento do mouse altera no máximo dois itens, sem percorrer a
+        árvore inteira.
         """
-        # Implementação para resetar os campos de edição
-        self.exibir_mensagem_aviso("Reset", "Campos redefinidos para valores originais")
-        # Aqui seria implementada a lógica para resetar os campos de edição
+        tree = event.widget
+        item = tree.identify_row(event.y)
+        anterior = getattr(tree, "_hover_item", None)
         
-    def cancelar_edicao(self):
-        """Cancela a edição atual e retorna à visualização anterior.
+        # Cursor continua sobre o mesmo item (ou fora de qualquer item)
+        if item == anterior:
+            return
         
-        Esta função descarta as alterações não salvas e retorna
-        à visualização anterior ou fecha a janela de edição.
-        """
-        # Implementação para cancelar a edição atual
-        self.exibir_mensagem_aviso("Cancelar", "Edição cancelada")
-        # Aqui seria implementada a lógica para cancelar a edição atual
+        # Remove a tag 'hover' do item anterior, se ele ainda existir
+        if anterior and tree.exists(anterior):
+            tree.item(anterior, tags=())
         
+        # Aplica a tag 'hover' ao item atual
+        if item:
+            tree.item(item, tags=('hover',))
+        tree._hover_item = item
+
     def criar_botoes_navegacao(self, container):
         """Cria os botões de navegação principal no cabeçalho do sistema.
         
@@ -1702,18 +2200,8 @@ class SistemaGerenciamentoDeposito:
         Args:
             container: O container onde os botões serão criados
         """
-        # Estilo para botões do cabeçalho
-        estilo_botao = {
-            "background": self.style.lookup("Cabecalho.TFrame", "background"),
-            "foreground": "#FFFFFF",
-            "font": ("Segoe UI", 10, "bold"),
-            "borderwidth": 0,
-            "highlightthickness": 0,
-            "activebackground": self.style.lookup("Cabecalho.TFrame", "background"),
-            "activeforeground": "#FFFFFF",
-            "padx": 10,
-            "pady": 5
-        }
+        # Estilo para botões do cabeçalho, montado uma vez em configurar_estilos
+        estilo_botao = self._estilo_botao_cabecalho
         
         # Botões de navegação principal
         botoes = [
@@ -1747,7 +2235,7 @@ class SistemaGerenciamentoDeposito:
         Args:
             botao: O botão que terá o efeito removido
         """
-        botao.config(background=self.style.lookup("Cabecalho.TFrame", "background"))
+        botao.config(background=self._estilo_botao_cabecalho["background"])
     
     def navegar_para_inicio(self):
         """Navega para a tela inicial do sistema.
@@ -1799,6 +2287,59 @@ class SistemaGerenciamentoDeposito:
         # Implementação para abrir a tela de configurações
         # self.abrir_tela_configuracoes()
     
+    def _frame_submenu(self, parent, **opcoes):
+        """Cria um ttk.Frame com o estilo Submenu.TFrame das telas de login e cadastro."""
+        return ttk.Frame(parent, style="Submenu.TFrame", **opcoes)
+
+    def _esconder_telas(self):
+        """Esconde as telas guardadas em _telas e destrói os demais widgets da janela."""
+        guardadas = set(self._telas.values())
+        for widget in self.root.winfo_children():
+            if widget in guardadas:
+                widget.pack_forget()
+            else:
+                widget.destroy()
+
+    def _exibir_tela(self, nome, montar, **pack):
+        """Exibe uma tela guardada, montando-a na primeira vez.
+
+        Args:
+            nome (str): Chave da tela em _telas
+            montar (callable): Recebe o frame vazio da tela e cria seus widgets
+            **pack: Opções adicionais de pack do frame da tela
+
+        Returns:
+            bool: True se a tela acabou de ser montada
+        """
+        self._esconder_telas()
+        tela = self._telas.get(nome)
+        nova = tela is None
+        if nova:
+            tela = self._telas[nome] = ttk.Frame(self.root)
+            montar(tela)
+        tela.pack(fill=tk.BOTH, expand=True, **pack)
+        return nova
+
+    def _registrar_janela(self, nome, janela):
+        """Guarda uma janela auxiliar em ``self.<nome>`` até ela ser destruída.
+
+        O atributo volta a None no ``<Destroy>`` da própria janela (inclusive
+        quando ela some junto com a janela pai), de modo que verificar se a
+        janela está aberta não exige consultar o Tk.
+
+        Args:
+            nome (str): Atributo que guarda a janela (ex.: "janela_usuario")
+            janela (tk.Toplevel): Janela recém-criada
+        """
+        setattr(self, nome, janela)
+
+        def ao_destruir(event):
+            # O <Destroy> da janela também chega para cada widget filho
+            if event.widget is janela and getattr(self, nome) is janela:
+                setattr(self, nome, None)
+
+        janela.bind("<Destroy>", ao_destruir, add="+")
+
     def realizar_logout(self):
         """Realiza o logout do usuário atual.
         
@@ -1809,55 +2350,79 @@ class SistemaGerenciamentoDeposito:
         if confirmacao:
             # Limpar dados da sessão atual
             self.empresa_logada = None
+            self._fechar_pools()
+            self._cache_depositos.clear()
+            self._cache_fornecedores.clear()
+            self._cache_produtos.clear()
             
-            # Fechar todas as janelas abertas exceto a principal
-            for widget in self.root.winfo_children():
-                widget.destroy()
-            
-            # Voltar para a tela de login
+            # Voltar para a tela de login, que fecha as demais janelas abertas
             self.tela_login()
             
             self.exibir_mensagem_aviso("Logout", "Logout realizado com sucesso")
 
 
     def tela_login(self):
-        """Exibe a tela de login do sistema."""
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        """Exibe a tela de login do sistema.
 
+        Os widgets são montados na primeira exibição e reaproveitados nas
+        seguintes, apenas com os campos limpos e as sugestões reiniciadas.
+        """
         # Configurar o fundo da janela principal
-        self.root.configure(background=self.style.lookup("TFrame", "background"))
+        self.root.configure(background=self._estilo("TFrame", "background"))
+
+        if not self._exibir_tela("login", self._montar_tela_login, padx=20, pady=20):
+            for entry in (self.entry_nome, self.entry_admin, self.entry_senha):
+                entry.delete(0, tk.END)
+            self.listbox.pack_forget()
 
-        # Frame principal com efeito de sombra
-        main_frame = ttk.Frame(self.root)
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        if self._job_sugestoes is not None:
+            self.root.after_cancel(self._job_sugestoes)
+            self._job_sugestoes = None
+        self._ultimo_texto_sugestoes = None
 
+    def _carregar_lista_empresas(self):
+        """Carrega os nomes das empresas usados pelas sugestões do login.
+
+        Chamado na primeira sugestão pedida, e não ao abrir a tela de login. A
+        lista é mantida entre logout e login e só é relida depois que um
+        cadastro ou alteração a invalida (None).
+        """
+        with self._get_conn(CAMINHO_BANCO_PRINCIPAL) as conn:
+            empresas = conn.execute("SELECT nome FROM empresas").fetchall()
+        self.lista_empresas = [empresa[0] for empresa in empresas]
+        # Nomes em minúsculas ordenados (e os originais na mesma ordem): as
+        # empresas com um dado prefixo formam um intervalo contíguo,
+        # localizado por busca binária a cada tecla
+        indice = sorted((nome.lower(), nome) for nome in self.lista_empresas)
+        self._empresas_minusculas = [minusculo for minusculo, _ in indice]
+        self._empresas_ordenadas = [nome for _, nome in indice]
+
+    def _montar_tela_login(self, main_frame):
+        """Cria os widgets da tela de login dentro do frame informado."""
         # Container com borda arredondada (simulada com padding e cor de fundo)
-        container = ttk.Frame(main_frame, style="Submenu.TFrame")
+        container = self._frame_submenu(main_frame)
         container.pack(expand=True, padx=50, pady=50, ipadx=30, ipady=30)
 
         # Título com ícone
-        titulo_frame = ttk.Frame(container, style="Submenu.TFrame")
+        titulo_frame = self._frame_submenu(container)
         titulo_frame.pack(fill=tk.X, pady=(0, 20))
         
         # Tentar carregar um ícone de depósito se existir
         try:
             if os.path.exists("icons/empresa.png"):
-                logo = Image.open("icons/empresa.png")
-                logo = logo.resize((64, 64), Image.LANCZOS)
-                logo_tk = ImageTk.PhotoImage(logo)
-                logo_label = ttk.Label(titulo_frame, image=logo_tk, background=self.style.lookup("Submenu.TFrame", "background"))
+                logo_tk = self._imagem("icons/empresa.png", (64, 64))
+                logo_label = ttk.Label(titulo_frame, image=logo_tk, style="Submenu.TLabel")
                 logo_label.image = logo_tk
                 logo_label.pack(side=tk.TOP, pady=10)
-        except Exception as e:
-            print(f"Erro ao carregar ícone: {e}")
+        except Exception:
+            logger.exception("Erro ao carregar ícone")
 
         ttk.Label(
-            titulo_frame, text="Sistema de Gerenciamento de Depósito", style="Titulo.TLabel", background=self.style.lookup("Submenu.TFrame", "background")
+            titulo_frame, text="Sistema de Gerenciamento de Depósito", style="Submenu.Titulo.TLabel"
         ).pack(pady=5)
         
         ttk.Label(
-            titulo_frame, text="Acesso Empresarial", style="Subtitulo.TLabel", background=self.style.lookup("Submenu.TFrame", "background")
+            titulo_frame, text="Acesso Empresarial", style="Submenu.Subtitulo.TLabel"
         ).pack(pady=5)
 
         # Linha separadora
@@ -1865,15 +2430,15 @@ class SistemaGerenciamentoDeposito:
         separator.pack(fill=tk.X, padx=20, pady=10)
 
         # Formulário com visual melhorado
-        form_frame = ttk.Frame(container, style="Submenu.TFrame")
+        form_frame = self._frame_submenu(container)
         form_frame.pack(pady=20, padx=30, fill=tk.X)
 
         # Label com ícone (simulado com emoji)
-        ttk.Label(form_frame, text="🏢 Nome da Empresa:", background=self.style.lookup("Submenu.TFrame", "background")).grid(
+        ttk.Label(form_frame, text="🏢 Nome da Empresa:", style="Submenu.TLabel").grid(
             row=0, column=0, padx=10, pady=10, sticky="e"
         )
 
-        entry_frame = ttk.Frame(form_frame, style="Submenu.TFrame")
+        entry_frame = self._frame_submenu(form_frame)
         entry_frame.grid(row=0, column=1, padx=10, pady=10, sticky="ew")
 
         self.entry_nome = ttk.Entry(entry_frame, width=30)
@@ -1882,11 +2447,11 @@ class SistemaGerenciamentoDeposito:
         # Listbox com estilo melhorado
         self.listbox = tk.Listbox(
             entry_frame,
-            height=4,
+            height=MAX_SUGESTOES,
             bg="white",
-            fg=self.style.lookup("TLabel", "foreground"),
+            fg=self._estilo("TLabel", "foreground"),
             font=("Segoe UI", 10),
-            selectbackground=self.style.lookup("TButton", "background"),
+            selectbackground=self._estilo("TButton", "background"),
             selectforeground="white",
             borderwidth=1,
             relief="solid"
@@ -1894,38 +2459,23 @@ class SistemaGerenciamentoDeposito:
         self.listbox.pack(fill=tk.X)
         self.listbox.pack_forget()
 
-        # Carrega empresas cadastradas
-        conn = sqlite3.connect("deposito_principal.db")
-        cursor = conn.cursor()
-        cursor.execute("SELECT nome FROM empresas")
-        empresas = cursor.fetchall()
-        self.lista_empresas = [empresa[0] for empresa in empresas]
-        conn.close()
-
         self.entry_nome.bind("<KeyRelease>", self.atualizar_sugestoes)
         self.listbox.bind("<<ListboxSelect>>", self.selecionar_empresa)
         self.entry_nome.bind("<FocusOut>", lambda e: self.verificar_foco())
         self.listbox.bind("<FocusOut>", lambda e: self.verificar_foco())
 
-        ttk.Label(form_frame, text="👤 Usuário:", background=self.style.lookup("Submenu.TFrame", "background")).grid(
+        ttk.Label(form_frame, text="👤 Usuário:", style="Submenu.TLabel").grid(
             row=1, column=0, padx=10, pady=10, sticky="e"
         )
         self.entry_admin = ttk.Entry(form_frame, width=30)
         self.entry_admin.grid(row=1, column=1, padx=10, pady=10)
         
-        ttk.Label(form_frame, text="🔒 Senha:", background=self.style.lookup("Submenu.TFrame", "background")).grid(
+        ttk.Label(form_frame, text="🔒 Senha:", style="Submenu.TLabel").grid(
             row=2, column=0, padx=10, pady=10, sticky="e"
         )
         self.entry_senha = ttk.Entry(form_frame, show="•", width=30)
         self.entry_senha.grid(row=2, column=1, padx=10, pady=10)
         
-        # Adicionar efeito de foco nos campos
-        def on_entry_focus_in(event):
-            event.widget.configure(style="FocusIn.TEntry")
-        
-        def on_entry_focus_out(event):
-            event.widget.configure(style="TEntry")
-        
         # Estilo para entrada com foco
         self.style.configure(
             "FocusIn.TEntry",
@@ -1935,32 +2485,26 @@ class SistemaGerenciamentoDeposito:
         )
         
         # Aplicar efeito de foco aos campos
-        self.entry_nome.bind("<FocusIn>", on_entry_focus_in)
-        self.entry_nome.bind("<FocusOut>", on_entry_focus_out)
-        self.entry_senha.bind("<FocusIn>", on_entry_focus_in)
-        self.entry_senha.bind("<FocusOut>", on_entry_focus_out)
+        self.entry_nome.bind("<FocusIn>", self._on_entry_focus_in)
+        self.entry_nome.bind("<FocusOut>", self._on_entry_focus_out)
+        self.entry_senha.bind("<FocusIn>", self._on_entry_focus_in)
+        self.entry_senha.bind("<FocusOut>", self._on_entry_focus_out)
         
         # Adicionar evento de tecla Enter para acionar o botão de login
-        def verificar_enter_login(event):
-            if self.entry_nome.get() and self.entry_senha.get() and self.entry_admin.get():
-                self.fazer_login()
-        
-        self.entry_nome.bind("<Return>", verificar_enter_login)
-        self.entry_admin.bind("<Return>", verificar_enter_login)
-        self.entry_senha.bind("<Return>", verificar_enter_login)
+        self.entry_nome.bind("<Return>", self._verificar_enter_login)
+        self.entry_admin.bind("<Return>", self._verificar_enter_login)
+        self.entry_senha.bind("<Return>", self._verificar_enter_login)
 
         # Linha separadora antes dos botões
-        separator_frame = ttk.Frame(form_frame)
-        separator_frame.grid(row=3, column=0, columnspan=2, pady=10)
-        separator = ttk.Separator(separator_frame, orient="horizontal")
-        separator.pack(fill=tk.X, padx=20, pady=5)
+        separator = ttk.Separator(form_frame, orient="horizontal")
+        separator.grid(row=3, column=0, columnspan=2, sticky="ew", padx=20, pady=15)
         
         # Aplicar efeito de foco ao campo de usuário
-        self.entry_admin.bind("<FocusIn>", on_entry_focus_in)
-        self.entry_admin.bind("<FocusOut>", on_entry_focus_out)
+        self.entry_admin.bind("<FocusIn>", self._on_entry_focus_in)
+        self.entry_admin.bind("<FocusOut>", self._on_entry_focus_out)
         
         # Frame para botões com espaçamento melhorado
-        btn_frame = ttk.Frame(form_frame, style="Submenu.TFrame")
+        btn_frame = self._frame_submenu(form_frame)
         btn_frame.grid(row=4, column=0, columnspan=2, pady=15)
 
         # Botão de login com estilo de destaque
@@ -1976,34 +2520,70 @@ class SistemaGerenciamentoDeposito:
         sair_btn.pack(side=tk.LEFT, padx=10, ipadx=10)
         
         # Adicionar mensagem de status na parte inferior
-        status_frame = ttk.Frame(container, style="Submenu.TFrame")
-        status_frame.pack(fill=tk.X, pady=(15, 0), side=tk.BOTTOM)
-        
         status_label = ttk.Label(
-            status_frame, 
+            container, 
             text="Sistema de Gerenciamento de Depósito v1.4", 
             anchor="center",
-            background=self.style.lookup("Submenu.TFrame", "background"),
+            style="Submenu.TLabel",
             foreground="#757575",
             font=("Segoe UI", 8)
         )
-        status_label.pack(fill=tk.X)
+        status_label.pack(fill=tk.X, pady=(15, 0), side=tk.BOTTOM)
+
+    def _on_entry_focus_in(self, event):
+        """Destaca o campo que recebeu o foco."""
+        event.widget.configure(style="FocusIn.TEntry")
+
+    def _on_entry_focus_out(self, event):
+        """Remove o destaque do campo que perdeu o foco."""
+        event.widget.configure(style="TEntry")
+
+    def _verificar_enter_login(self, event):
+        """Aciona o login com Enter quando todos os campos estão preenchidos."""
+        if self.entry_nome.get() and self.entry_senha.get() and self.entry_admin.get():
+            self.fazer_login()
+
+    def _verificar_enter_cadastro(self, event):
+        """Aciona o cadastro com Enter quando todos os campos estão preenchidos."""
+        if self.entry_nome_cadastro.get() and self.entry_senha_cadastro.get() and self.entry_admin_cadastro.get():
+            self.cadastrar_empresa()
 
     def atualizar_sugestoes(self, event):
-        """Atualiza as sugestões conforme o usuário digita o nome da empresa."""
+        """Agenda a atualização das sugestões conforme o usuário digita.
+
+        Teclas digitadas em sequência reiniciam o agendamento, de modo que a
+        lista só é refeita depois de ATRASO_SUGESTOES_MS sem digitação.
+        """
+        if self._job_sugestoes is not None:
+            self.root.after_cancel(self._job_sugestoes)
+        self._job_sugestoes = self.root.after(
+            ATRASO_SUGESTOES_MS, self._aplicar_sugestoes
+        )
+
+    def _aplicar_sugestoes(self):
+        """Filtra as empresas pelo texto digitado e preenche a listbox."""
+        self._job_sugestoes = None
+        if not self.entry_nome.winfo_exists():
+            return
         texto = self.entry_nome.get().lower()
         if texto:
-            sugestoes = [
-                empresa
-                for empresa in self.lista_empresas
-                if empresa.lower().startswith(texto)
-            ]
-            self.listbox.delete(0, tk.END)
-            for empresa in sugestoes:
-                self.listbox.insert(tk.END, empresa)
-            self.listbox.pack() if sugestoes else self.listbox.pack_forget()
-        else:
-            self.listbox.pack_forget()
+            # Mesmo texto da última atualização: o conteúdo da listbox já está
+            # correto, basta decidir se ela fica visível
+            if texto != self._ultimo_texto_sugestoes:
+                self._ultimo_texto_sugestoes = texto
+                if self.lista_empresas is None:
+                    self._carregar_lista_empresas()
+                inicio = bisect_left(self._empresas_minusculas, texto)
+                fim = bisect_left(self._empresas_minusculas, texto + "\uffff", inicio)
+                sugestoes = self._empresas_ordenadas[inicio:min(fim, inicio + MAX_SUGESTOES)]
+                self.listbox.delete(0, tk.END)
+                if sugestoes:
+                    self.listbox.insert(tk.END, *sugestoes)
+        visivel = bool(texto) and self.listbox.size() > 0
+        # pack/pack_forget só na mudança de visibilidade, evitando um cálculo de
+        # geometria a cada atualização; winfo_manager é vazio fora do pack
+        if visivel != bool(self.listbox.winfo_manager()):
+            self.listbox.pack() if visivel else self.listbox.pack_forget()
 
     def selecionar_empresa(self, event):
         """Seleciona a empresa da listbox e preenche a entrada de nome."""
@@ -2020,245 +2600,125 @@ class SistemaGerenciamentoDeposito:
             self.listbox.pack_forget()
 
     def tela_cadastro_empresa(self):
-        """Exibe a tela de cadastro de empresa."""
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        """Exibe a tela de cadastro de empresa.
 
+        Como a tela de login, é montada uma vez e reaproveitada com o formulário
+        e a prévia da logo limpos.
+        """
         # Configurar o fundo da janela principal
-        self.root.configure(background=self.style.lookup("TFrame", "background"))
+        self.root.configure(background=self._estilo("TFrame", "background"))
 
-        # Frame principal com efeito de sombra
-        main_frame = ttk.Frame(self.root)
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        if not self._exibir_tela(
+            "cadastro_empresa", self._montar_tela_cadastro_empresa, padx=20, pady=20
+        ):
+            for entry in (
+                self.entry_nome_cadastro, self.entry_admin_cadastro, self.entry_senha_cadastro
+            ):
+                entry.delete(0, tk.END)
+            self.logo_path = None
+            self.preview_logo = None
+            self.lbl_preview.config(image="")
+            self.btn_logo.config(text="📂 Selecionar Arquivo", style="TButton")
 
+    def _montar_tela_cadastro_empresa(self, main_frame):
+        """Cria os widgets da tela de cadastro de empresa dentro do frame informado."""
         # Container com borda arredondada (simulada com padding e cor de fundo)
-        container = ttk.Frame(main_frame, style="Submenu.TFrame")
+        container = self._frame_submenu(main_frame)
         container.pack(expand=True, padx=50, pady=50, ipadx=30, ipady=30)
 
         # Título com ícone
-        titulo_frame = ttk.Frame(container, style="Submenu.TFrame")
+        titulo_frame = self._frame_submenu(container)
         titulo_frame.pack(fill=tk.X, pady=(0, 20))
         
         # Tentar carregar um ícone de empresa se existir
         try:
             if os.path.exists("icons/empresa.png"):
-                logo = Image.open("icons/empresa.png")
-                logo = logo.resize((64, 64), Image.LANCZOS)
-                logo_tk = ImageTk.PhotoImage(logo)
-                logo_label = ttk.Label(titulo_frame, image=logo_tk, background=self.style.lookup("Submenu.TFrame", "background"))
+                logo_tk = self._imagem("icons/empresa.png", (64, 64))
+                logo_label = ttk.Label(titulo_frame, image=logo_tk, style="Submenu.TLabel")
                 logo_label.image = logo_tk
                 logo_label.pack(side=tk.TOP, pady=10)
-        except Exception as e:
-            print(f"Erro ao carregar ícone: {e}")
+        except Exception:
+            logger.exception("Erro ao carregar ícone")
 
         ttk.Label(
-            titulo_frame, text="Cadastro de Empresa", style="Titulo.TLabel", background=self.style.lookup("Submenu.TFrame", "background")
+            titulo_frame, text="Cadastro de Empresa", style="Submenu.Titulo.TLabel"
         ).pack(pady=5)
 
         # Formulário com visual melhorado
-        form_frame = ttk.Frame(container, style="Submenu.TFrame")
+        form_frame = self._frame_submenu(container)
         form_frame.pack(pady=20, padx=30, fill=tk.X)
 
         # Campos de formulário com ícones
-        ttk.Label(form_frame, text="🏢 Nome da Empresa:", background=self.style.lookup("Submenu.TFrame", "background")).grid(
+        ttk.Label(form_frame, text="🏢 Nome da Empresa:", style="Submenu.TLabel").grid(
             row=0, column=0, padx=10, pady=10, sticky="e"
         )
         self.entry_nome_cadastro = ttk.Entry(form_frame, width=30)
         self.entry_nome_cadastro.grid(row=0, column=1, padx=10, pady=10)
 
-        ttk.Label(form_frame, text="👤 Usuário:", background=self.style.lookup("Submenu.TFrame", "background")).grid(
+        ttk.Label(form_frame, text="👤 Usuário:", style="Submenu.TLabel").grid(
             row=1, column=0, padx=10, pady=10, sticky="e"
         )
         self.entry_admin_cadastro = ttk.Entry(form_frame, width=30)
         self.entry_admin_cadastro.grid(row=1, column=1, padx=10, pady=10)
         
-        ttk.Label(form_frame, text="🔒 Senha:", background=self.style.lookup("Submenu.TFrame", "background")).grid(
+        ttk.Label(form_frame, text="🔒 Senha:", style="Submenu.TLabel").grid(
             row=2, column=0, padx=10, pady=10, sticky="e"
         )
         self.entry_senha_cadastro = ttk.Entry(form_frame, show="•", width=30)
         self.entry_senha_cadastro.grid(row=2, column=1, padx=10, pady=10)
 
-        ttk.Label(form_frame, text="🖼️ Logo da Empresa:", background=self.style.lookup("Submenu.TFrame", "background")).grid(
+        ttk.Label(form_frame, text="🖼️ Logo da Empresa:", style="Submenu.TLabel").grid(
             row=3, column=0, padx=10, pady=10, sticky="e"
         )
         
-        # Frame para o botão de logo e preview
-        logo_frame = ttk.Frame(form_frame, style="Submenu.TFrame")
-        logo_frame.grid(row=3, column=1, padx=10, pady=10, sticky="w")
-        
+        # Botão de logo e preview
         self.btn_logo = ttk.Button(
-            logo_frame, text="📂 Selecionar Arquivo", command=self.selecionar_logo
+            form_frame, text="📂 Selecionar Arquivo", command=self.selecionar_logo
         )
-        self.btn_logo.pack(side=tk.LEFT, padx=5)
+        self.btn_logo.grid(row=3, column=1, padx=15, pady=10, sticky="w")
 
         # Label para preview da logo com borda
-        preview_frame = ttk.Frame(form_frame, style="Submenu.TFrame", borderwidth=1, relief="solid")
+        preview_frame = self._frame_submenu(form_frame, borderwidth=1, relief="solid")
         preview_frame.grid(row=4, column=1, padx=10, pady=10, sticky="w")
         
-        self.lbl_preview = ttk.Label(preview_frame, text="Prévia da logo", background=self.style.lookup("Submenu.TFrame", "background"))
+        self.lbl_preview = ttk.Label(preview_frame, text="Prévia da logo", style="Submenu.TLabel")
         self.lbl_preview.pack(padx=10, pady=10)
 
-        # Adicionar efeito de foco nos campos
-        def on_entry_focus_in(event):
-            event.widget.configure(style="FocusIn.TEntry")
-        
-        def on_entry_focus_out(event):
-            event.widget.configure(style="TEntry")
-        
         # Aplicar efeito de foco aos campos
-        self.entry_nome_cadastro.bind("<FocusIn>", on_entry_focus_in)
-        self.entry_nome_cadastro.bind("<FocusOut>", on_entry_focus_out)
-        self.entry_senha_cadastro.bind("<FocusIn>", on_entry_focus_in)
-        self.entry_senha_cadastro.bind("<FocusOut>", on_entry_focus_out)
-        self.entry_admin_cadastro.bind("<FocusIn>", on_entry_focus_in)
-        self.entry_admin_cadastro.bind("<FocusOut>", on_entry_focus_out)
+        self.entry_nome_cadastro.bind("<FocusIn>", self._on_entry_focus_in)
+        self.entry_nome_cadastro.bind("<FocusOut>", self._on_entry_focus_out)
+        self.entry_senha_cadastro.bind("<FocusIn>", self._on_entry_focus_in)
+        self.entry_senha_cadastro.bind("<FocusOut>", self._on_entry_focus_out)
+        self.entry_admin_cadastro.bind("<FocusIn>", self._on_entry_focus_in)
+        self.entry_admin_cadastro.bind("<FocusOut>", self._on_entry_focus_out)
         
         # Adicionar evento de tecla Enter para acionar o botão de cadastro
-        def verificar_enter_cadastro(event):
-            if self.entry_nome_cadastro.get() and self.entry_senha_cadastro.get() and self.entry_admin_cadastro.get():
-                self.cadastrar_empresa()
-        
-        self.entry_nome_cadastro.bind("<Return>", verificar_enter_cadastro)
-        self.entry_admin_cadastro.bind("<Return>", verificar_enter_cadastro)
-        self.entry_senha_cadastro.bind("<Return>", verificar_enter_cadastro)
+        self.entry_nome_cadastro.bind("<Return>", self._verificar_enter_cadastro)
+        self.entry_admin_cadastro.bind("<Return>", self._verificar_enter_cadastro)
+        self.entry_senha_cadastro.bind("<Return>", self._verificar_enter_cadastro)
 
         # Botões diretamente no container principal para maior visibilidade
-        botoes_frame = ttk.Frame(container, style="Submenu.TFrame")
+        botoes_frame = self._frame_submenu(container)
         botoes_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=20)
         
         # Botão de cadastro com estilo de destaque
         cadastrar_btn = ttk.Button(
             botoes_frame, 
-            text="✓ Cadastrar", 
-            command=self.cadastrar_empresa, 
-            style="Destaque.TButton",
-            width=15
-        )
-        cadastrar_btn.pack(side=tk.LEFT, padx=(20, 10), pady=10, expand=True)
-        
-        # Botão de voltar
-        voltar_btn = ttk.Button(
-            botoes_frame, 
-            text="↩️ Voltar", 
-            command=self.tela_login,
-            width=15
-        )
-        voltar_btn.pack(side=tk.RIGHT, padx=(10, 20), pady=10, expand=True)
-
-    def cadastrar_empresa(self):
-        """Processa o cadastro de uma nova empresa e cria o usuário CEO."""
-        try:
-            nome = self.entry_nome_cadastro.get().strip()
-            senha = self.entry_senha_cadastro.get().strip()
-            admin_user = self.entry_admin_cadastro.get().strip()
-
-            # Validações básicas
-            if not nome or not senha:
-                self.exibir_mensagem_erro("Erro", "Nome da empresa e senha são obrigatórios!")
-                return
-                
-            # Validação específica para o usuário administrador
-            if not admin_user:
-                self.exibir_mensagem_erro("Erro", "O nome do usuário administrador (dono) é obrigatório!")
-                return
-
-            # Gerar nome do banco de dados único
-            db_nome = re.sub(r'[^a-zA-Z0-9]', '_', nome.lower())
-            db_nome = f"{db_nome}_{hashlib.sha256(nome.encode()).hexdigest()[:6]}"
-
-            # Conectar ao banco de dados principal
-            conn = sqlite3.connect("deposito_principal.db")
-            cursor = conn.cursor()
-
-            # Hash da senha
-            senha_hash = hashlib.sha256(senha.encode()).hexdigest()
-
-            # Processar logo se existir
-            logo_final = None
-            if hasattr(self, 'logo_path') and self.logo_path:
-                nome_arquivo = f"logo_{db_nome}.{self.logo_path.split('.')[-1]}"
-                caminho_final = os.path.join("logos", nome_arquivo)
-                os.replace(self.logo_path, caminho_final)
-                logo_final = caminho_final
-
-            # Inserir empresa no banco de dados
-            cursor.execute(
-                "INSERT INTO empresas (nome, senha, logo_path, db_nome, admin_user) VALUES (?, ?, ?, ?, ?)",
-                (nome, senha_hash, logo_final, db_nome, admin_user)
-            )
-
-            # Criar banco de dados específico da empresa
-            self.criar_banco_empresa(db_nome)
-            
-            # Adicionar o usuário administrador (dono/CEO) no banco da empresa
-            try:
-                empresa_conn = sqlite3.connect(f"deposito_empresas/{db_nome}.db")
-                empresa_cursor = empresa_conn.cursor()
-                
-                # Hash da senha para o usuário administrador
-                admin_senha_hash = hashlib.sha256(senha.encode()).hexdigest()
-                
-                # Verificar se a tabela de usuários existe
-                empresa_cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='usuarios'")
-                if not empresa_cursor.fetchone():
-                    # Se a tabela não existir, criar a tabela de usuários
-                    empresa_cursor.execute(
-                        """
-                        CREATE TABLE usuarios (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            codigo_empresa TEXT NOT NULL,
-                            empresa_nome TEXT NOT NULL,
-                            usuario TEXT NOT NULL,
-                            nome_completo TEXT NOT NULL,
-                            nome_supervisor TEXT NOT NULL,
-                            turno TEXT NOT NULL,
-                            email TEXT UNIQUE NOT NULL,
-                            senha TEXT NOT NULL,
-                            tipo_acesso TEXT NOT NULL CHECK(tipo_acesso IN ('CEO', 'Administrador', 'Gerente', 'Operador')),
-                            departamento TEXT,
-                            cargo TEXT,
-                            data_admissao DATE,
-                            ultimo_acesso DATETIME,
-                            criado_por TEXT
-                        )
-                        """
-                    )
-                
-                # Inserir o usuário administrador com tipo_acesso 'CEO'
-                empresa_cursor.execute(
-                    """INSERT INTO usuarios (
-                        codigo_empresa, empresa_nome, usuario, nome_completo, 
-                        nome_supervisor, turno, email, senha, tipo_acesso,
-                        departamento, cargo, data_admissao, criado_por,
-                        ultimo_acesso
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, DATE('now'), ?, CURRENT_TIMESTAMP)""",
-                    (db_nome, nome, admin_user, admin_user, "N/A", "Integral", 
-                     f"{admin_user}@{nome.lower().replace(' ', '')}.com", admin_senha_hash, "CEO",
-                     "Diretoria", "CEO", "SISTEMA", "SISTEMA")
-                )
-                empresa_conn.commit()
-                empresa_conn.close()
-            except Exception as e:
-                self.exibir_mensagem_erro("Erro", f"Erro ao criar usuário administrador: {str(e)}")
-                # Se houver erro na criação do usuário, tenta remover o banco de dados para evitar inconsistências
-                try:
-                    if os.path.exists(f"deposito_empresas/{db_nome}.db"):
-                        os.remove(f"deposito_empresas/{db_nome}.db")
-                except:
-                    pass
-                raise e
-
-            conn.commit()
-            self.exibir_mensagem_aviso("Sucesso", "Empresa cadastrada com sucesso!")
-            self.tela_login()
-
-        except sqlite3.IntegrityError:
-            self.exibir_mensagem_erro("Erro", "Já existe uma empresa cadastrada com este nome!")
-        except Exception as e:
-            self.exibir_mensagem_erro("Erro", f"Erro ao cadastrar empresa: {str(e)}")
-        finally:
-            if 'conn' in locals():
-                conn.close()
+            text="✓ Cadastrar", 
+            command=self.cadastrar_empresa, 
+            style="Destaque.TButton",
+            width=15
+        )
+        cadastrar_btn.pack(side=tk.LEFT, padx=(20, 10), pady=10, expand=True)
+        
+        # Botão de voltar
+        voltar_btn = ttk.Button(
+            botoes_frame, 
+            text="↩️ Voltar", 
+            command=self.tela_login,
+            width=15
+        )
+        voltar_btn.pack(side=tk.RIGHT, padx=(10, 20), pady=10, expand=True)
 
     def selecionar_logo(self):
         """Abre o diálogo para selecionar a logo da empresa e exibe o preview."""
@@ -2273,9 +2733,14 @@ class SistemaGerenciamentoDeposito:
             if not filepath:
                 return
 
-            # Carrega e redimensiona mantendo o aspect ratio
+            # Carrega e redimensiona mantendo o aspect ratio. Para JPEG, draft
+            # decodifica já em escala reduzida; imagens que cabem na prévia não
+            # são reamostradas, e as demais usam BILINEAR, suficiente em 150px
+            Image, ImageTk = self._pil()
             img = Image.open(filepath)
-            img.thumbnail((150, 150), Image.LANCZOS)
+            img.draft("RGB", (300, 300))
+            if max(img.size) > 150:
+                img.thumbnail((150, 150), Image.BILINEAR)
             self.preview_logo = ImageTk.PhotoImage(img)
             self.lbl_preview.config(image=self.preview_logo)
             self.btn_logo.config(text="✓ Logo Selecionado", style="Sucesso.TLabel")
@@ -2288,6 +2753,22 @@ class SistemaGerenciamentoDeposito:
             self.btn_logo.config(text="Selecionar Logo")
             messagebox.showerror("Erro", f"Falha ao carregar imagem:\n{str(e)}")
 
+    def _campos_preenchidos(self, campos):
+        """Verifica campos obrigatórios, listando numa só mensagem os vazios.
+
+        Args:
+            campos (dict): Valores informados, indexados pelo rótulo do campo
+
+        Returns:
+            bool: True se todos os campos estiverem preenchidos
+        """
+        faltando = [rotulo for rotulo, valor in campos.items() if not valor]
+        if faltando:
+            self.exibir_mensagem_erro(
+                "Erro", f"Preencha os campos obrigatórios: {', '.join(faltando)}"
+            )
+        return not faltando
+
     def cadastrar_empresa(self):
         """Realiza o cadastro da empresa, salvando logo, credenciais e criando banco de dados."""
         nome = self.entry_nome_cadastro.get().strip()
@@ -2295,12 +2776,13 @@ class SistemaGerenciamentoDeposito:
         admin = self.entry_admin_cadastro.get().strip()
         
         # Validação de campos vazios
-        if not nome or not senha or not admin:
-            messagebox.showerror("Erro", "Preencha todos os campos!")
+        if not self._campos_preenchidos(
+            {"Nome da Empresa": nome, "Usuário": admin, "Senha": senha}
+        ):
             return
             
         # Validação de caracteres especiais no nome da empresa
-        if not re.match(r'^[\w\s\-\.]+$', nome):
+        if not PADRAO_NOME_EMPRESA.match(nome):
             messagebox.showerror("Erro", "O nome da empresa contém caracteres inválidos. Use apenas letras, números, espaços, hífens e pontos.")
             return
             
@@ -2309,118 +2791,147 @@ class SistemaGerenciamentoDeposito:
             messagebox.showerror("Erro", "A senha deve ter pelo menos 6 caracteres.")
             return
 
+        # Arquivos e bancos são gravados em segundo plano para não travar a
+        # interface; o resultado volta ao Tk pela fila de mensagens
+        self._executor_io.submit(
+            self._gravar_cadastro_empresa, nome, senha, admin, self.logo_path
+        )
+
+    def _gravar_cadastro_empresa(self, nome, senha, admin, logo_path):
+        """Grava o logo, o banco e os registros de uma nova empresa.
+
+        Executado na thread de E/S; não acessa widgets. Mensagens e a volta
+        à tela de login são encaminhadas ao Tk por _fila_mensagens.
+
+        Args:
+            nome (str): Nome da empresa, já validado
+            senha (str): Senha da empresa e do usuário administrador
+            admin (str): Nome do usuário administrador (CEO)
+            logo_path (str): Arquivo de logo selecionado, ou None
+        """
         try:
-            db_nome = re.sub(r"\W+", "_", nome.lower())
+            db_nome = PADRAO_NOME_BANCO.sub("_", nome.lower())
             db_nome = f"{db_nome}_{hashlib.sha256(nome.encode()).hexdigest()[:6]}"
-            
-            # Verifica se já existe um banco de dados com esse nome e tenta removê-lo
-            db_path = f"deposito_empresas/{db_nome}.db"
-            if os.path.exists(db_path):
+            # Hash da senha calculado uma vez para a empresa e o usuário administrador
+            senha_hash = self.hash_senha(senha)
+            db_path = caminho_banco_empresa(db_nome)
+
+            # Conexão emprestada do pool do banco principal, o mesmo usado
+            # pela tela de login; só é retida pelas operações no banco
+            with self._get_conn(CAMINHO_BANCO_PRINCIPAL) as conn:
+                # Verificar se a empresa já existe antes de criar o banco dela
+                if conn.execute("SELECT id FROM empresas WHERE nome = ?", (nome,)).fetchone():
+                    self.exibir_mensagem_erro("Erro", "Empresa já cadastrada!")
+                    return
+
+            # Cria o banco da empresa; criar_banco_empresa substitui
+            # atomicamente um banco anterior de mesmo nome. Um arquivo em uso
+            # costuma ser liberado em milissegundos: as esperas começam curtas
+            # e dobram a cada falha (esta thread não é a do Tk)
+            for tentativa in range(TENTATIVAS_CRIAR_BANCO):
                 try:
-                    os.remove(db_path)
+                    self.criar_banco_empresa(db_nome)
+                    break
                 except PermissionError:
-                    messagebox.showerror("Erro", "O banco de dados está em uso. Feche todas as conexões e tente novamente.")
-                    return
+                    if tentativa < TENTATIVAS_CRIAR_BANCO - 1:
+                        time.sleep(ESPERA_CRIAR_BANCO_S * 2 ** tentativa)
+                    else:
+                        self.exibir_mensagem_erro("Erro", "O banco de dados está em uso. Feche todas as conexões e tente novamente.")
+                        return
                 except Exception as e:
-                    messagebox.showerror("Erro", f"Não foi possível remover o banco de dados existente: {str(e)}")
-                    return
-
-            conn = None
-            try:
-                conn = sqlite3.connect("deposito_principal.db")
-                cursor = conn.cursor()
-
-                # Verificar se a empresa já existe antes de tentar inserir
-                cursor.execute("SELECT id FROM empresas WHERE nome = ?", (nome,))
-                if cursor.fetchone():
-                    messagebox.showerror("Erro", "Empresa já cadastrada!")
+                    self.exibir_mensagem_erro("Erro", f"Erro ao criar banco de dados da empresa: {str(e)}")
                     return
 
-                senha_hash = hashlib.sha256(senha.encode()).hexdigest()
-                logo_final = None
+            # O logo é copiado antes da transação, para que a operação de
+            # arquivo não prolongue o bloqueio de escrita do banco. A cópia
+            # preserva o arquivo do usuário e funciona entre sistemas de
+            # arquivos distintos; o nome usa db_nome, já sem caracteres
+            # inválidos para arquivos
+            logo_final = None
+            if logo_path:
+                try:
+                    extensao = os.path.splitext(logo_path)[1].lower()
+                    caminho_final = os.path.join("logos", f"logo_{db_nome}{extensao}")
+                    shutil.copyfile(logo_path, caminho_final)
+                    logo_final = caminho_final
+                except Exception as e:
+                    self.exibir_mensagem_aviso("Aviso", f"Não foi possível salvar o logo: {str(e)}. O cadastro continuará sem o logo.")
+            if logo_final:
+                # Sem a miniatura, tela_menu redimensiona o logo original
+                try:
+                    self._gerar_logo_menu(logo_final)
+                except Exception:
+                    logger.exception("Erro ao gerar o logo do menu de %s", nome)
 
-                if self.logo_path:
+            empresa_id = None
+            try:
+                with self._get_conn(CAMINHO_BANCO_PRINCIPAL) as conn:
+                    cursor = conn.cursor()
+                    # Empresa e usuário administrador são gravados na mesma
+                    # transação, com o banco da empresa anexado à conexão do
+                    # banco principal. Em modo WAL o SQLite confirma cada
+                    # arquivo anexado separadamente: uma falha no commit pode
+                    # deixar só um dos registros gravado, o que o tratamento
+                    # de erro abaixo desfaz. Uma queda do processo nesse
+                    # intervalo ainda pode deixar a empresa sem administrador
+                    cursor.execute("ATTACH DATABASE ? AS emp", (db_path,))
                     try:
-                        nome_arquivo = f"logo_{nome}.{self.logo_path.split('.')[-1]}"
-                        caminho_final = os.path.join("logos", nome_arquivo)
-                        os.replace(self.logo_path, caminho_final)
-                        logo_final = caminho_final
-                    except Exception as e:
-                        messagebox.showwarning("Aviso", f"Não foi possível salvar o logo: {str(e)}. O cadastro continuará sem o logo.")
-
-                cursor.execute(
-                    "INSERT INTO empresas (nome, senha, logo_path, db_nome, admin_user) VALUES (?, ?, ?, ?, ?)",
-                    (nome, senha_hash, logo_final, db_nome, admin),
-                )
-                conn.commit()
-            except sqlite3.IntegrityError:
-                messagebox.showerror("Erro", "Empresa já cadastrada!")
-                return
+                        # A tabela de usuários vem da DDL de criar_banco_empresa
+                        cursor.execute("BEGIN IMMEDIATE")
+                        cursor.execute(
+                            "INSERT INTO empresas (nome, senha, logo_path, db_nome, admin_user) VALUES (?, ?, ?, ?, ?)",
+                            (nome, senha_hash, logo_final, db_nome, admin),
+                        )
+                        empresa_id = cursor.lastrowid
+                        # Criar o usuário administrador
+                        cursor.execute(SQL_INSERIR_USUARIO_EMPRESA, (
+                            db_nome, nome, admin, admin, "N/A", "Integral",
+                            f"{admin}@{nome.lower().replace(' ', '')}.com", senha_hash, "CEO",
+                            "Diretoria", "CEO", "SISTEMA",
+                        ))
+                        conn.commit()
+                    except BaseException:
+                        if conn.in_transaction:
+                            conn.rollback()
+                        raise
+                    finally:
+                        cursor.execute("DETACH DATABASE emp")
             except Exception as e:
-                messagebox.showerror("Erro", f"Erro ao cadastrar empresa: {str(e)}")
-                return
-            finally:
-                if conn:
-                    conn.close()
-
-            # Tenta criar o banco da empresa após fechar a conexão principal
-            for tentativa in range(3):  # Tenta 3 vezes
-                try:
-                    self.criar_banco_empresa(db_nome)
-                    
-                    # Criar o usuário administrador no banco da empresa
+                # Cadastro desfeito: remove a empresa, caso o banco principal
+                # já a tenha confirmado, e descarta o banco recém-criado
+                if empresa_id is not None:
+                    try:
+                        with self._get_conn(CAMINHO_BANCO_PRINCIPAL) as conn:
+                            conn.execute("DELETE FROM empresas WHERE id = ?", (empresa_id,))
+                    except Exception:
+                        logger.exception("Erro ao desfazer o cadastro da empresa %s", nome)
+                self._fechar_pools(db_path)
+                for sufixo in ("", "-wal", "-shm"):
                     try:
-                        empresa_conn = sqlite3.connect(f"deposito_empresas/{db_nome}.db")
-                        empresa_cursor = empresa_conn.cursor()
-                        
-                        # Verificar se a tabela de usuários existe
-                        empresa_cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='usuarios'")
-                        if not empresa_cursor.fetchone():
-                            messagebox.showerror("Erro", "Tabela de usuários não encontrada!")
-                            return
-                            
-                        # Verificar se o usuário já existe
-                        empresa_cursor.execute("SELECT id FROM usuarios WHERE usuario = ?", (admin,))
-                        if empresa_cursor.fetchone():
-                            # Usuário já existe, não precisa criar novamente
+                        os.remove(db_path + sufixo)
+                    except OSError:
+                        pass
+                # As cópias do logo também são descartadas
+                if logo_final:
+                    for caminho in (logo_final, caminho_logo_menu(logo_final)):
+                        try:
+                            os.remove(caminho)
+                        except OSError:
                             pass
-                        else:
-                            # Criar o usuário administrador
-                            admin_senha_hash = hashlib.sha256(senha.encode()).hexdigest()
-                            empresa_cursor.execute(
-                                """INSERT INTO usuarios (
-                                    codigo_empresa, empresa_nome, usuario, nome_completo, 
-                                    nome_supervisor, turno, email, senha, tipo_acesso,
-                                    departamento, cargo, data_admissao, criado_por
-                                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, DATE('now'), ?)""",
-                                (db_nome, nome, admin, admin, "N/A", "Integral", 
-                                 f"{admin}@{nome.lower().replace(' ', '')}.com", admin_senha_hash, "CEO",
-                                 "Diretoria", "CEO", "SISTEMA")
-                            )
-                            empresa_conn.commit()
-                    except Exception as e:
-                        messagebox.showerror("Erro", f"Erro ao criar usuário administrador: {str(e)}")
-                        return
-                    finally:
-                        if 'empresa_conn' in locals():
-                            empresa_conn.close()
-                    
-                    messagebox.showinfo("Sucesso", "Empresa cadastrada com sucesso!")
-                    self.tela_login()
-                    return
-                except PermissionError:
-                    if tentativa < 2:  # Se não for a última tentativa
-                        import time
-                        time.sleep(1)  # Espera 1 segundo antes de tentar novamente
-                    else:
-                        messagebox.showerror("Erro", "Não foi possível criar o banco de dados da empresa. Tente novamente mais tarde.")
-                        return
-                except Exception as e:
-                    messagebox.showerror("Erro", f"Erro ao criar banco de dados da empresa: {str(e)}")
-                    return
+                if isinstance(e, sqlite3.IntegrityError):
+                    self.exibir_mensagem_erro("Erro", "Empresa já cadastrada!")
+                else:
+                    logger.exception("Erro ao cadastrar a empresa %s", nome)
+                    self.exibir_mensagem_erro("Erro", f"Erro ao cadastrar empresa: {str(e)}")
+                return
+
+            self.lista_empresas = None
+            self._fila_mensagens.put((messagebox.showinfo, "Sucesso", "Empresa cadastrada com sucesso!"))
+            self._fila_mensagens.put((self.tela_login,))
 
         except Exception as e:
-            messagebox.showerror("Erro", f"Erro inesperado: {str(e)}")
+            logger.exception("Erro inesperado no cadastro da empresa %s", nome)
+            self.exibir_mensagem_erro("Erro", f"Erro inesperado: {str(e)}")
             return
 
     def fazer_login(self):
@@ -2444,125 +2955,145 @@ class SistemaGerenciamentoDeposito:
         senha = self.entry_senha.get().strip()
         usuario = self.entry_admin.get().strip()
 
-        if not nome or not senha or not usuario:
-            messagebox.showerror("Erro", "Todos os campos são obrigatórios!")
+        if not self._campos_preenchidos(
+            {"Nome da Empresa": nome, "Usuário": usuario, "Senha": senha}
+        ):
             return
 
+        # Consultas e verificação do scrypt rodam na thread de E/S (o login
+        # também grava o último acesso); o menu é aberto pela fila de mensagens
+        self._executor_io.submit(self._autenticar_login, nome, usuario, senha)
+
+    def _autenticar_login(self, nome, usuario, senha):
+        """Autentica empresa e usuário e agenda a abertura do menu.
+
+        Executado na thread de E/S; não acessa widgets. Erros são exibidos por
+        exibir_mensagem_erro e o login concluído volta ao Tk por
+        _fila_mensagens (_concluir_login).
+
+        Args:
+            nome (str): Nome da empresa
+            usuario (str): Usuário, nome completo ou e-mail informado
+            senha (str): Senha informada
+        """
         try:
-            # Primeiro, verificar se a empresa existe
-            conn = sqlite3.connect("deposito_principal.db")
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT * FROM empresas WHERE nome = ?", (nome,))
-            empresa = cursor.fetchone()
-            
+            with self._get_conn(CAMINHO_BANCO_PRINCIPAL) as conn:
+                # Primeiro, verificar se a empresa existe
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"SELECT {COLUNAS_EMPRESA_LOGIN} FROM empresas WHERE nome = ?", (nome,)
+                )
+                empresa = cursor.fetchone()
+
             if not empresa:
-                messagebox.showerror("Erro", "Empresa não encontrada!")
+                self.exibir_mensagem_erro("Erro", "Empresa não encontrada!")
                 return
                 
             # Verificar se o banco de dados da empresa existe
-            db_path = f'deposito_empresas/{empresa["db_nome"]}.db'
+            db_path = caminho_banco_empresa(empresa["db_nome"])
             if not os.path.exists(db_path):
-                messagebox.showerror("Erro", "Banco de dados da empresa não encontrado!")
-                return
-                
-            # Agora verificar o usuário no banco da empresa
-            empresa_conn = sqlite3.connect(db_path)
-            empresa_conn.row_factory = sqlite3.Row
-            empresa_cursor = empresa_conn.cursor()
-            
-            senha_hash = hashlib.sha256(senha.encode()).hexdigest()
-            
-            # Primeiro verificar se o usuário existe - busca mais flexível
-            empresa_cursor.execute(
-                "SELECT * FROM usuarios WHERE usuario = ? OR nome_completo = ? OR email = ?",
-                (usuario, usuario, usuario)
-            )
-            
-            usuario_encontrado = empresa_cursor.fetchone()
-            
-            if not usuario_encontrado:
-                # Verificar a estrutura da tabela para debug
-                try:
-                    empresa_cursor.execute("PRAGMA table_info(usuarios)")
-                    colunas = empresa_cursor.fetchall()
-                    colunas_nomes = [col[1] for col in colunas]
-                    
-                    if 'usuario' not in colunas_nomes:
-                        messagebox.showerror("Erro", "Estrutura da tabela de usuários incorreta!")
-                    else:
-                        # Tentar buscar qualquer usuário para verificar se a tabela tem dados
-                        empresa_cursor.execute("SELECT * FROM usuarios LIMIT 1")
-                        qualquer_usuario = empresa_cursor.fetchone()
-                        if not qualquer_usuario:
-                            messagebox.showerror("Erro", "Nenhum usuário cadastrado para esta empresa!")
-                        else:
-                            messagebox.showerror("Erro", "Usuário não encontrado!")
-                except Exception as e:
-                    messagebox.showerror("Erro", f"Erro ao verificar tabela de usuários: {str(e)}")
-                
-                empresa_conn.close()
-                conn.close()
-                return
-                
-            # Verificar se a senha está correta
-            if usuario_encontrado["senha"] != senha_hash:
-                messagebox.showerror("Erro", "Senha incorreta!")
-                empresa_conn.close()
-                conn.close()
+                self.exibir_mensagem_erro("Erro", "Banco de dados da empresa não encontrado!")
                 return
                 
-            # Verificar o tipo de acesso do usuário
-            tipo_acesso = usuario_encontrado["tipo_acesso"].upper()
-            if tipo_acesso not in ["CEO", "ADMINISTRADOR", "GERENTE", "OPERADOR"]:
-                messagebox.showerror("Erro", "Tipo de acesso inválido!")
-                empresa_conn.close()
-                conn.close()
-                return
-                
-            # Armazenar informações da empresa e do usuário logado
-            self.empresa_logada = {
-                "id": empresa["id"],
-                "nome": empresa["nome"],
-                "logo_path": empresa["logo_path"],
-                "db_nome": empresa["db_nome"],
-                "cnpj": empresa["cnpj"] if "cnpj" in empresa.keys() else "",
-                "endereco": (empresa["endereco"] if "endereco" in empresa.keys() else ""),
-                "telefone": (empresa["telefone"] if "telefone" in empresa.keys() else ""),
-                "usuario": usuario_encontrado["usuario"],
-                "tipo_acesso": usuario_encontrado["tipo_acesso"]
-            }
-            
-            # Atualizar último acesso
-            empresa_cursor.execute(
-                "UPDATE usuarios SET ultimo_acesso = CURRENT_TIMESTAMP WHERE id = ?",
-                (usuario_encontrado["id"],)
-            )
-            empresa_conn.commit()
-            empresa_conn.close()
-            conn.close()
-            
-            self.tela_menu()
-            
+            # Agora verificar o usuário no banco da empresa; a conexão volta ao
+            # pool do banco e é reaproveitada pelas telas após o login
+            with self._get_conn(db_path) as empresa_conn:
+                self._atualizar_banco_empresa(empresa_conn)
+                empresa_cursor = empresa_conn.cursor()
+
+                # Primeiro verificar se o usuário existe - busca mais flexível
+                empresa_cursor.execute(
+                    SQL_BUSCAR_USUARIO_LOGIN, (usuario, usuario, usuario)
+                )
+
+                usuario_encontrado = empresa_cursor.fetchone()
+
+                if not usuario_encontrado:
+                    self.exibir_mensagem_erro("Erro", "Usuário não encontrado!")
+                    return
+
+                # Verificar se a senha está correta (scrypt ou hash SHA-256 legado)
+                if not self.verificar_senha(usuario_encontrado["senha"], senha):
+                    self.exibir_mensagem_erro("Erro", "Senha incorreta!")
+                    return
+
+                # Verificar o tipo de acesso do usuário
+                tipo_acesso = usuario_encontrado["tipo_acesso"].upper()
+                if tipo_acesso not in ["CEO", "ADMINISTRADOR", "GERENTE", "OPERADOR"]:
+                    self.exibir_mensagem_erro("Erro", "Tipo de acesso inválido!")
+                    return
+
+                # Informações da empresa e do usuário logado, publicadas em
+                # self.empresa_logada só na thread do Tk
+                empresa_logada = {
+                    "id": empresa["id"],
+                    "nome": empresa["nome"],
+                    "logo_path": empresa["logo_path"],
+                    "db_nome": empresa["db_nome"],
+                    # Caminho calculado uma vez, usado por _get_conn em toda consulta
+                    "db_path": db_path,
+                    "cnpj": empresa["cnpj"],
+                    "endereco": empresa["endereco"],
+                    "telefone": empresa["telefone"],
+                    "usuario": usuario_encontrado["usuario"],
+                    "tipo_acesso": usuario_encontrado["tipo_acesso"]
+                }
+
+                # Atualizar último acesso; senhas legadas ou com custo desatualizado
+                # são regravadas com o hash atual, já que a senha acabou de ser validada
+                if self.senha_precisa_atualizar(usuario_encontrado["senha"]):
+                    empresa_cursor.execute(
+                        "UPDATE usuarios SET ultimo_acesso = CURRENT_TIMESTAMP, senha = ? WHERE id = ?",
+                        (self.hash_senha(senha), usuario_encontrado["id"])
+                    )
+                else:
+                    empresa_cursor.execute(
+                        "UPDATE usuarios SET ultimo_acesso = CURRENT_TIMESTAMP WHERE id = ?",
+                        (usuario_encontrado["id"],)
+                    )
+
+            self._fila_mensagens.put((self._concluir_login, empresa_logada))
+
+        except sqlite3.Error as e:
+            logger.exception("Erro no login da empresa %s", nome)
+            self.exibir_mensagem_erro("Erro", f"Erro no login: {str(e)}")
         except Exception as e:
-            messagebox.showerror("Erro", f"Erro no login: {str(e)}")
-        finally:
-            if 'conn' in locals() and conn:
-                conn.close()
+            # Fora do Tk, a exceção não chegaria a _erro_nao_tratado
+            logger.exception("Erro inesperado no login da empresa %s", nome)
+            self.exibir_mensagem_erro("Erro", f"Erro inesperado: {str(e)}")
+
+    def _concluir_login(self, empresa_logada):
+        """Registra a sessão autenticada por _autenticar_login e abre o menu."""
+        self.empresa_logada = empresa_logada
+        self.tela_menu()
 
     def tela_menu(self):
-        """Exibe a tela principal após o login da empresa."""
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        """Exibe a tela principal após o login da empresa.
 
+        O menu é montado uma vez por sessão e reaproveitado enquanto a
+        empresa e o usuário logados forem os mesmos; um novo login com outros
+        dados (ou com dados da empresa alterados) descarta a tela anterior.
+        """
         # Configurar o fundo da janela principal
-        self.root.configure(background=self.style.lookup("TFrame", "background"))
-        
-        # Criar frame principal com padding
-        main_frame = ttk.Frame(self.root)
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
+        self.root.configure(background=self._estilo("TFrame", "background"))
 
+        chave = tuple(
+            self.empresa_logada[campo]
+            for campo in ("id", "nome", "logo_path", "usuario", "tipo_acesso")
+        )
+        if chave != self._chave_menu:
+            menu = self._telas.pop("menu", None)
+            if menu is not None:
+                menu.destroy()
+            self._chave_menu = chave
+
+        if not self._exibir_tela("menu", self._montar_tela_menu, padx=15, pady=15):
+            # Tela reaproveitada: volta sem o conteúdo aberto na visita anterior
+            for widget in self.conteudo_frame.winfo_children():
+                widget.destroy()
+
+    def _montar_tela_menu(self, main_frame):
+        """Cria os widgets do menu principal dentro do frame informado."""
         # Cabeçalho com visual moderno e efeito de elevação
         header = ttk.Frame(main_frame, style="Cabecalho.TFrame")
         header.pack(fill=tk.X, padx=5, pady=5)
@@ -2572,14 +3103,17 @@ class SistemaGerenciamentoDeposito:
             self.empresa_logada["logo_path"]
         ):
             try:
-                logo = Image.open(self.empresa_logada["logo_path"])
-                logo = logo.resize((200, 80), Image.LANCZOS)
-                logo_tk = ImageTk.PhotoImage(logo)
+                # Logo redimensionado no cadastro; empresas cadastradas antes
+                # dele usam o original, redimensionado por _imagem
+                logo = self.empresa_logada["logo_path"]
+                if os.path.exists(caminho_logo_menu(logo)):
+                    logo = caminho_logo_menu(logo)
+                logo_tk = self._imagem(logo, TAMANHO_LOGO_MENU, proporcional=True)
                 logo_label = ttk.Label(header, image=logo_tk)
                 logo_label.image = logo_tk
                 logo_label.pack(side=tk.LEFT, padx=10, pady=5)
-            except Exception as e:
-                print(f"Erro ao carregar logo: {e}")
+            except Exception:
+                logger.exception("Erro ao carregar logo")
 
         # Informações da empresa e do usuário logado
         info_frame = ttk.Frame(header, style="Cabecalho.TFrame")
@@ -2596,7 +3130,7 @@ class SistemaGerenciamentoDeposito:
             info_frame,
             text=f"Usuário: {self.empresa_logada['usuario']} | Nível de acesso: {self.empresa_logada['tipo_acesso']}",
             foreground="#FFFFFF",
-            background=self.style.lookup("Cabecalho.TFrame", "background"),
+            background=self._estilo("Cabecalho.TFrame", "background"),
             font=("Segoe UI", 10)
         ).pack(side=tk.TOP, anchor="w", pady=(0, 5))
         
@@ -2618,8 +3152,7 @@ class SistemaGerenciamentoDeposito:
         menu_titulo = ttk.Label(
             menu_lateral, 
             text="Menu Principal", 
-            style="Subtitulo.TLabel",
-            background=self.style.lookup("Submenu.TFrame", "background"),
+            style="Submenu.Subtitulo.TLabel",
             anchor="center"
         )
         menu_titulo.pack(fill=tk.X, pady=10, padx=5)
@@ -2706,17 +3239,15 @@ class SistemaGerenciamentoDeposito:
         frame.pack(pady=10, fill=tk.X)
 
         try:
-            img = Image.open(caminho_imagem)
-            img = img.resize((40, 40), Image.LANCZOS)
-            img_tk = ImageTk.PhotoImage(img)
+            img_tk = self._imagem(caminho_imagem, (40, 40))
             btn = ttk.Button(frame, image=img_tk, command=comando)
-            btn.image = img_tk  # Mantém referência da imagem
+            btn.image = img_tk
             btn.pack(side=tk.LEFT, padx=10)
             ttk.Label(frame, text=texto_descricao, font=("Arial", 10)).pack(
                 side=tk.LEFT, padx=10
             )
-        except Exception as e:
-            print(f"Erro ao carregar imagem {caminho_imagem}: {e}")
+        except Exception:
+            logger.exception("Erro ao carregar imagem %s", caminho_imagem)
             ttk.Button(
                 frame,
                 text="⚠️ Botão" if "user" in caminho_imagem else "🏢 Dados da Empresa",
@@ -2730,11 +3261,15 @@ class SistemaGerenciamentoDeposito:
             messagebox.showerror("Acesso Negado", "Você não tem permissão para cadastrar usuários.")
             return
             
-        if hasattr(self, "janela_usuario") and self.janela_usuario.winfo_exists():
+        if self.janela_usuario is not None:
             self.janela_usuario.lift()
             return
 
-        self.janela_usuario = tk.Toplevel(self.root)
+        # A lista de ids da navegação é relida a cada abertura da janela
+        self._ids_usuarios = None
+        self._usuario_exibido = None
+
+        self._registrar_janela("janela_usuario", tk.Toplevel(self.root))
         self.janela_usuario.title("Cadastro de Usuário")
         self.janela_usuario.geometry("900x600")
         self.janela_usuario.protocol("WM_DELETE_WINDOW", self.fechar_janela_usuario)
@@ -2755,6 +3290,7 @@ class SistemaGerenciamentoDeposito:
         header_frame = ttk.Frame(main_container)
         header_frame.pack(fill=tk.X, pady=5)
         self.criar_header_usuario(header_frame)  # Header específico para usuários
+        self.criar_header_acoes(header_frame)
 
         container = ttk.Frame(main_container)
         container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
@@ -2778,7 +3314,10 @@ class SistemaGerenciamentoDeposito:
             ("Tipo Acesso:", "entry_tipo"),
         ]
 
+        # Cada campo tem uma StringVar: limpar ou preencher é um único set()
+        # em vez de delete + insert no widget
         self.entries = {}
+        self.vars_usuario = {chave: tk.StringVar(self.janela_usuario) for _, chave in campos}
         for idx, (texto, var) in enumerate(campos):
             if texto:
                 ttk.Label(form_frame, text=texto).grid(
@@ -2786,34 +3325,40 @@ class SistemaGerenciamentoDeposito:
                 )
 
             if var == "lbl_nome_empresa":
-                lbl = ttk.Label(form_frame, text="", foreground="#3498DB")
+                lbl = ttk.Label(
+                    form_frame, textvariable=self.vars_usuario[var], foreground="#3498DB"
+                )
                 lbl.grid(row=0, column=2, padx=5, pady=2, sticky="w")
                 self.entries[var] = lbl
-            else:
-                entry = ttk.Entry(form_frame, width=30)
+            elif var not in ("entry_turno", "entry_tipo"):
+                entry = ttk.Entry(form_frame, width=30, textvariable=self.vars_usuario[var])
                 if "Senha" in texto:
                     entry.config(show="*")
                 entry.grid(row=idx, column=1, padx=5, pady=5)
                 self.entries[var] = entry
 
         self.entries["entry_turno"] = ttk.Combobox(
-            form_frame, values=["Manhã", "Tarde", "Noite"], state="readonly"
+            form_frame,
+            values=self._TURNOS,
+            state="readonly",
+            textvariable=self.vars_usuario["entry_turno"],
         )
         self.entries["entry_turno"].grid(row=5, column=1, padx=5, pady=5)
 
         # Definir valores disponíveis com base no tipo de acesso do usuário logado
         tipo_valores = []
         if self.empresa_logada["tipo_acesso"] == "CEO":
-            tipo_valores = ["Administrador", "Gerente", "Operador"]
+            tipo_valores = self._TIPOS_ACESSO
         elif self.empresa_logada["tipo_acesso"] == "Administrador":
-            tipo_valores = ["Gerente", "Operador"]
+            tipo_valores = self._TIPOS_ACESSO[1:]
         else:
-            tipo_valores = ["Operador"]
+            tipo_valores = self._TIPOS_ACESSO[2:]
             
         self.entries["entry_tipo"] = ttk.Combobox(
             form_frame,
             values=tipo_valores,
             state="readonly",
+            textvariable=self.vars_usuario["entry_tipo"],
         )
         self.entries["entry_tipo"].grid(row=8, column=1, padx=5, pady=5)
 
@@ -2829,26 +3374,15 @@ class SistemaGerenciamentoDeposito:
 
         def preencher_campos_com_primeiro_usuario():
             try:
-                conn = self.obter_conexao_empresa()
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM usuarios LIMIT 1")
-                usuario = cursor.fetchone()
-
-                if usuario:
-                    self.entries["entry_cod_empresa"].insert(0, usuario[1])
-                    self.entries["entry_usuario"].insert(0, usuario[3])
-                    self.entries["entry_nome"].insert(0, usuario[4])
-                    self.entries["entry_supervisor"].insert(0, usuario[5])
-                    self.entries["entry_turno"].set(usuario[6])
-                    self.entries["entry_email"].insert(0, usuario[7])
-                    self.entries["entry_senha"].insert(0, "******")  # Oculta a senha
-                    self.entries["entry_tipo"].set(usuario[9])
+                with self._get_conn() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute(SQL_PRIMEIRO_USUARIO)
+                    usuario = cursor.fetchone()
 
+                    if usuario:
+                        self.preencher_campos_usuario(usuario)
             except Exception as e:
                 self.exibir_mensagem_erro("Erro", f"Erro ao carregar usuário: {str(e)}")
-            finally:
-                if conn:
-                    conn.close()
 
         preencher_campos_com_primeiro_usuario()
 
@@ -2873,27 +3407,33 @@ class SistemaGerenciamentoDeposito:
 
     def fechar_janela_usuario(self):
         """Fecha a janela de cadastro de usuário e remove as referências."""
-        if hasattr(self, "janela_usuario") and self.janela_usuario.winfo_exists():
+        if self.janela_usuario is not None:
             self.janela_usuario.destroy()
         if hasattr(self, "entries"):
             del self.entries
+            del self.vars_usuario
 
     def buscar_empresa_por_codigo(self, event):
         """Busca o nome da empresa no banco principal a partir do código informado."""
         codigo = self.entries["entry_cod_empresa"].get()
         if codigo:
             try:
-                conn = sqlite3.connect("deposito_principal.db")
-                cursor = conn.cursor()
-                cursor.execute("SELECT nome FROM empresas WHERE id = ?", (codigo,))
-                resultado = cursor.fetchone()
-                self.entries["lbl_nome_empresa"].config(
-                    text=resultado[0] if resultado else "Empresa não encontrada!"
+                # Só códigos encontrados vão para o cache: uma empresa
+                # cadastrada depois passa a ser encontrada na próxima busca
+                nome = self._cache_obter(self._cache_nomes_empresas, codigo)
+                if nome is None:
+                    with self._get_conn(CAMINHO_BANCO_PRINCIPAL) as conn:
+                        resultado = conn.execute(
+                            "SELECT nome FROM empresas WHERE id = ?", (codigo,)
+                        ).fetchone()
+                    if resultado:
+                        nome = resultado[0]
+                        self._cache_guardar(self._cache_nomes_empresas, codigo, nome)
+                self.vars_usuario["lbl_nome_empresa"].set(
+                    nome or "Empresa não encontrada!"
                 )
             except Exception as e:
                 self.exibir_mensagem_erro("Erro", f"Erro na consulta: {str(e)}")
-            finally:
-                conn.close()
 
     def criar_header_usuario(self, container):
         """Cria a barra de navegação e ações específicas para o cadastro de usuários.
@@ -2935,113 +3475,156 @@ class SistemaGerenciamentoDeposito:
             ttk.Button(
                 crud_frame, text=texto, style="Header.TButton", command=comando
             ).pack(side=tk.LEFT, padx=2)
-    
+
+    def criar_header_acoes(self, container):
+        """Cria a barra de pesquisas e ações (CRUD) no container fornecido.
+
+        Este método cria dois frames com botões para as pesquisas de usuários
+        e as ações de registro; a navegação fica em criar_header_usuario.
+
+        Args:
+            container: O container onde o header será criado
+        """
+        nav_frame = ttk.Frame(container, style="Header.TFrame")
+        nav_frame.pack(fill=tk.X, pady=2)
+
+        botoes_nav = [
+            ("🔍 Pesquisar Login", self.pesquisar_registro),
+            ("📂 Pesquisar Range", self.pesquisar_range),
+        ]
+
+        for texto, comando in botoes_nav:
+            ttk.Button(
+                nav_frame, text=texto, style="Header.TButton", command=comando
+            ).pack(side=tk.LEFT, padx=2)
+
+        crud_frame = ttk.Frame(container, style="Header.TFrame")
+        crud_frame.pack(fill=tk.X, pady=2)
+
+        botoes_crud = [
+            ("➕ Criar", self.criar_registro),
+            ("✏️ Atualizar", self.atualizar_registro),
+            ("⎘ Copiar", self.copiar_registro),
+            ("❌ Deletar", self.deletar_registro),
+            ("💾 Salvar Edição", self.salvar_edicao),
+            ("↩️ Reset", self.reset_edicao),
+            ("🚫 Cancelar", self.cancelar_edicao),
+        ]
+
+        for texto, comando in botoes_crud:
+            ttk.Button(
+                crud_frame, text=texto, style="Header.TButton", command=comando
+            ).pack(side=tk.LEFT, padx=2)
+
+    def _obter_ids_usuarios(self):
+        """Retorna os ids dos usuários em ordem crescente, lidos uma vez.
+
+        A lista é descartada (None) ao abrir a janela de cadastro e ao incluir
+        ou excluir usuários.
+        """
+        if self._ids_usuarios is None:
+            with self._get_conn() as conn:
+                self._ids_usuarios = [
+                    linha[0] for linha in conn.execute(SQL_IDS_USUARIOS)
+                ]
+        return self._ids_usuarios
+
+    def _id_usuario_atual(self):
+        """Retorna o id do usuário do formulário, ou None se não houver.
+
+        Usa o id guardado por preencher_campos_usuario enquanto o login no
+        formulário for o mesmo; caso contrário, consulta pelo login digitado.
+        """
+        usuario_atual = self.entries["entry_usuario"].get()
+        if not usuario_atual:
+            return None
+        if self._usuario_exibido and self._usuario_exibido[1] == usuario_atual:
+            return self._usuario_exibido[0]
+        with self._get_conn() as conn:
+            linha = conn.execute(
+                SQL_ID_USUARIO_POR_LOGIN, (usuario_atual,)
+            ).fetchone()
+        return linha[0] if linha else None
+
+    def _exibir_usuario(self, usuario_id):
+        """Carrega um usuário pelo id e preenche o formulário.
+
+        Returns:
+            bool: True se o usuário foi encontrado
+        """
+        with self._get_conn() as conn:
+            usuario = conn.execute(
+                SQL_OBTER_USUARIO, (usuario_id,)
+            ).fetchone()
+        if not usuario:
+            # Excluído por outra janela: a lista de ids é relida na próxima vez
+            self._ids_usuarios = None
+            return False
+        self.limpar_campos_usuario()
+        self.preencher_campos_usuario(usuario)
+        return True
+
     def primeiro_usuario(self):
         """Navega para o primeiro usuário cadastrado."""
         try:
-            conn = self.obter_conexao_empresa()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM usuarios ORDER BY id ASC LIMIT 1")
-            usuario = cursor.fetchone()
-            
-            if usuario:
-                self.limpar_campos_usuario()
-                self.preencher_campos_usuario(usuario)
+            ids = self._obter_ids_usuarios()
+            if ids and self._exibir_usuario(ids[0]):
                 self.exibir_mensagem_aviso_usuario("Navegação", "Primeiro usuário selecionado")
             else:
                 self.exibir_mensagem_aviso_usuario("Navegação", "Não há usuários cadastrados")
         except Exception as e:
             self.exibir_mensagem_erro_usuario("Erro", f"Erro ao navegar: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
     
     def usuario_anterior(self):
         """Navega para o usuário anterior ao atual."""
         try:
-            usuario_atual = self.entries["entry_usuario"].get()
-            if not usuario_atual:
+            id_atual = self._id_usuario_atual()
+            if id_atual is None:
                 self.primeiro_usuario()
                 return
-                
-            conn = self.obter_conexao_empresa()
-            cursor = conn.cursor()
-            cursor.execute("SELECT id FROM usuarios WHERE usuario = ?", (usuario_atual,))
-            id_atual = cursor.fetchone()
-            
-            if id_atual:
-                cursor.execute("SELECT * FROM usuarios WHERE id < ? ORDER BY id DESC LIMIT 1", (id_atual[0],))
-                usuario = cursor.fetchone()
-                
-                if usuario:
-                    self.limpar_campos_usuario()
-                    self.preencher_campos_usuario(usuario)
-                    self.exibir_mensagem_aviso_usuario("Navegação", "Usuário anterior selecionado")
-                else:
-                    self.exibir_mensagem_aviso_usuario("Navegação", "Este já é o primeiro usuário")
+
+            # Posição do usuário atual na lista ordenada de ids
+            ids = self._obter_ids_usuarios()
+            posicao = bisect_left(ids, id_atual)
+            if posicao > 0 and self._exibir_usuario(ids[posicao - 1]):
+                self.exibir_mensagem_aviso_usuario("Navegação", "Usuário anterior selecionado")
             else:
-                self.primeiro_usuario()
+                self.exibir_mensagem_aviso_usuario("Navegação", "Este já é o primeiro usuário")
         except Exception as e:
             self.exibir_mensagem_erro_usuario("Erro", f"Erro ao navegar: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
     
     def proximo_usuario(self):
         """Navega para o próximo usuário."""
         try:
-            usuario_atual = self.entries["entry_usuario"].get()
-            if not usuario_atual:
+            id_atual = self._id_usuario_atual()
+            if id_atual is None:
                 self.primeiro_usuario()
                 return
-                
-            conn = self.obter_conexao_empresa()
-            cursor = conn.cursor()
-            cursor.execute("SELECT id FROM usuarios WHERE usuario = ?", (usuario_atual,))
-            id_atual = cursor.fetchone()
-            
-            if id_atual:
-                cursor.execute("SELECT * FROM usuarios WHERE id > ? ORDER BY id ASC LIMIT 1", (id_atual[0],))
-                usuario = cursor.fetchone()
-                
-                if usuario:
-                    self.limpar_campos_usuario()
-                    self.preencher_campos_usuario(usuario)
-                    self.exibir_mensagem_aviso("Navegação", "Próximo usuário selecionado")
-                else:
-                    self.exibir_mensagem_aviso("Navegação", "Este já é o último usuário")
+
+            ids = self._obter_ids_usuarios()
+            posicao = bisect_right(ids, id_atual)
+            if posicao < len(ids) and self._exibir_usuario(ids[posicao]):
+                self.exibir_mensagem_aviso("Navegação", "Próximo usuário selecionado")
             else:
-                self.primeiro_usuario()
+                self.exibir_mensagem_aviso("Navegação", "Este já é o último usuário")
         except Exception as e:
             self.exibir_mensagem_erro("Erro", f"Erro ao navegar: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
     
     def ultimo_usuario(self):
         """Navega para o último usuário cadastrado."""
         try:
-            conn = self.obter_conexao_empresa()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM usuarios ORDER BY id DESC LIMIT 1")
-            usuario = cursor.fetchone()
-            
-            if usuario:
-                self.limpar_campos_usuario()
-                self.preencher_campos_usuario(usuario)
+            ids = self._obter_ids_usuarios()
+            if ids and self._exibir_usuario(ids[-1]):
                 self.exibir_mensagem_aviso("Navegação", "Último usuário selecionado")
             else:
                 self.exibir_mensagem_aviso("Navegação", "Não há usuários cadastrados")
         except Exception as e:
             self.exibir_mensagem_erro("Erro", f"Erro ao navegar: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
     
     def pesquisar_usuario(self):
         """Abre uma janela para pesquisar usuários por nome ou código."""
-        if not hasattr(self, "janela_pesquisa") or not self.janela_pesquisa.winfo_exists():
-            self.janela_pesquisa = tk.Toplevel(self.janela_usuario)
+        if self.janela_pesquisa is None:
+            self._registrar_janela("janela_pesquisa", tk.Toplevel(self.janela_usuario))
             self.janela_pesquisa.title("Pesquisar Usuário")
             self.janela_pesquisa.geometry("400x200")
             
@@ -3074,37 +3657,33 @@ class SistemaGerenciamentoDeposito:
             return
             
         try:
-            conn = self.obter_conexao_empresa()
-            cursor = conn.cursor()
+            with self._get_conn() as conn:
+                cursor = conn.cursor()
             
-            if opcao == "nome":
-                cursor.execute("SELECT * FROM usuarios WHERE nome_completo LIKE ? LIMIT 1", (f"%{termo}%",))
-            elif opcao == "usuario":
-                cursor.execute("SELECT * FROM usuarios WHERE usuario LIKE ? LIMIT 1", (f"%{termo}%",))
-            elif opcao == "email":
-                cursor.execute("SELECT * FROM usuarios WHERE email LIKE ? LIMIT 1", (f"%{termo}%",))
+                coluna = COLUNAS_PESQUISA_USUARIO.get(opcao)
+                if coluna:
+                    cursor.execute(
+                        SQL_PESQUISAR_USUARIO, (expressao_fts(termo, coluna),)
+                    )
             
-            usuario = cursor.fetchone()
+                usuario = cursor.fetchone()
             
-            if usuario:
-                self.limpar_campos_usuario()
-                self.preencher_campos_usuario(usuario)
-                if hasattr(self, "janela_pesquisa") and self.janela_pesquisa.winfo_exists():
-                    self.janela_pesquisa.destroy()
-                self.exibir_mensagem_aviso("Pesquisa", "Usuário encontrado")
-            else:
-                self.exibir_mensagem_aviso("Pesquisa", "Nenhum usuário encontrado com este critério")
+                if usuario:
+                    self.limpar_campos_usuario()
+                    self.preencher_campos_usuario(usuario)
+                    if self.janela_pesquisa is not None:
+                        self.janela_pesquisa.destroy()
+                    self.exibir_mensagem_aviso("Pesquisa", "Usuário encontrado")
+                else:
+                    self.exibir_mensagem_aviso("Pesquisa", "Nenhum usuário encontrado com este critério")
         except Exception as e:
             self.exibir_mensagem_erro("Erro", f"Erro ao pesquisar: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
     
     def novo_usuario(self):
         """Limpa os campos para cadastrar um novo usuário."""
         self.limpar_campos_usuario()
-        self.entries["entry_cod_empresa"].insert(0, self.empresa_logada.get("id", ""))
-        self.entries["lbl_nome_empresa"].config(text=self.empresa_logada.get("nome", ""))
+        self.vars_usuario["entry_cod_empresa"].set(self.empresa_logada.get("id", ""))
+        self.vars_usuario["lbl_nome_empresa"].set(self.empresa_logada.get("nome", ""))
         self.exibir_mensagem_aviso("Novo Usuário", "Preencha os dados para o novo usuário")
     
     def editar_usuario(self):
@@ -3132,38 +3711,32 @@ class SistemaGerenciamentoDeposito:
             return
             
         try:
-            conn = self.obter_conexao_empresa()
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM usuarios WHERE usuario = ?", (usuario_atual,))
-            conn.commit()
+            with self._get_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM usuarios WHERE usuario = ?", (usuario_atual,))
+                self._ids_usuarios = None
             
-            self.limpar_campos_usuario()
-            self.exibir_mensagem_aviso("Exclusão", "Usuário excluído com sucesso")
-            self.primeiro_usuario()
+                self.limpar_campos_usuario()
+                self.exibir_mensagem_aviso("Exclusão", "Usuário excluído com sucesso")
+                self.primeiro_usuario()
         except Exception as e:
             self.exibir_mensagem_erro("Erro", f"Erro ao excluir usuário: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
     
     def cancelar_edicao_usuario(self):
         """Cancela a edição atual e restaura os dados originais."""
         usuario_atual = self.entries["entry_usuario"].get()
         if usuario_atual:
-            try:
-                conn = self.obter_conexao_empresa()
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM usuarios WHERE usuario = ?", (usuario_atual,))
-                usuario = cursor.fetchone()
+            try:
+                with self._get_conn() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute(SQL_OBTER_USUARIO_POR_LOGIN, (usuario_atual,))
+                    usuario = cursor.fetchone()
                 
-                if usuario:
-                    self.limpar_campos_usuario()
-                    self.preencher_campos_usuario(usuario)
+                    if usuario:
+                        self.limpar_campos_usuario()
+                        self.preencher_campos_usuario(usuario)
             except Exception as e:
                 self.exibir_mensagem_erro("Erro", f"Erro ao cancelar edição: {str(e)}")
-            finally:
-                if conn:
-                    conn.close()
         else:
             self.limpar_campos_usuario()
             
@@ -3171,11 +3744,11 @@ class SistemaGerenciamentoDeposito:
     
     def listar_todos_usuarios(self):
         """Abre uma janela com a lista de todos os usuários cadastrados."""
-        if hasattr(self, "janela_lista") and self.janela_lista.winfo_exists():
+        if self.janela_lista is not None:
             self.janela_lista.lift()
             return
             
-        self.janela_lista = tk.Toplevel(self.janela_usuario)
+        self._registrar_janela("janela_lista", tk.Toplevel(self.janela_usuario))
         self.janela_lista.title("Lista de Usuários")
         self.janela_lista.geometry("800x400")
         
@@ -3195,30 +3768,36 @@ class SistemaGerenciamentoDeposito:
         self.tabela_usuarios.pack(expand=True, fill="both", padx=10, pady=10)
         
         # Carregar dados na tabela
-        self.carregar_usuarios_na_tabela()
+        try:
+            self._inserir_usuarios_na_tabela(self.tabela_usuarios, SQL_LISTAR_USUARIOS)
+        except Exception as e:
+            self.exibir_mensagem_erro("Erro", f"Erro ao carregar usuários: {str(e)}")
         
         # Adicionar evento de duplo clique para selecionar usuário
         self.tabela_usuarios.bind("<Double-1>", self.selecionar_usuario_da_lista)
     
-    def carregar_usuarios_na_tabela(self, event=None):
-        """Carrega os usuários do banco de dados na tabela."""
-        # Limpar tabela
-        for item in self.tabela_usuarios.get_children():
-            self.tabela_usuarios.delete(item)
-            
-        try:
-            conn = self.obter_conexao_empresa()
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, usuario, nome_completo, email, tipo_acesso, turno FROM usuarios ORDER BY nome_completo")
-            usuarios = cursor.fetchall()
-            
-            for usuario in usuarios:
-                self.tabela_usuarios.insert("", "end", values=usuario)
-        except Exception as e:
-            self.exibir_mensagem_erro("Erro", f"Erro ao carregar usuários: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
+    def _inserir_usuarios_na_tabela(self, tabela, consulta, params=()):
+        """Substitui as linhas de uma Treeview pelo resultado de uma consulta.
+
+        As linhas são lidas em lotes para não materializar a tabela inteira;
+        as colunas da consulta devem vir na ordem das colunas da Treeview.
+
+        Args:
+            tabela (ttk.Treeview): Tabela a ser preenchida
+            consulta (str): SELECT sobre usuarios
+            params (sequence, optional): Parâmetros da consulta
+        """
+        tabela.delete(*tabela.get_children())
+        with self._get_conn() as conn:
+            cursor = conn.execute(consulta, params)
+            inserir = tabela.insert
+            while True:
+                lote = cursor.fetchmany(TAMANHO_LOTE_LEITURA)
+                if not lote:
+                    break
+                for usuario in lote:
+                    # tuple: o ttk não desempacota sqlite3.Row
+                    inserir("", "end", values=tuple(usuario))
     
     def selecionar_usuario_da_lista(self, event):
         """Seleciona um usuário da lista e preenche os campos do formulário."""
@@ -3230,87 +3809,59 @@ class SistemaGerenciamentoDeposito:
         usuario_id = item["values"][0]
         
         try:
-            conn = self.obter_conexao_empresa()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM usuarios WHERE id = ?", (usuario_id,))
-            usuario = cursor.fetchone()
+            with self._get_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(SQL_OBTER_USUARIO, (usuario_id,))
+                usuario = cursor.fetchone()
             
-            if usuario:
-                self.limpar_campos_usuario()
-                self.preencher_campos_usuario(usuario)
-                self.janela_lista.destroy()
+                if usuario:
+                    self.limpar_campos_usuario()
+                    self.preencher_campos_usuario(usuario)
+                    self.janela_lista.destroy()
         except Exception as e:
             self.exibir_mensagem_erro("Erro", f"Erro ao selecionar usuário: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
     
     def limpar_campos_usuario(self):
         """Limpa todos os campos do formulário de usuário."""
-        for key, entry in self.entries.items():
-            if key == "lbl_nome_empresa":
-                entry.config(text="")
-            elif key in ["entry_tipo", "entry_turno"]:
-                entry.set("")
-            else:
-                entry.delete(0, tk.END)
+        for var in self.vars_usuario.values():
+            var.set("")
     
     def preencher_campos_usuario(self, usuario):
         """Preenche os campos do formulário com os dados do usuário.
         
         Args:
-            usuario: Tupla com os dados do usuário do banco de dados
-        """
-        # Mapear índices do banco de dados para os campos do formulário
-        self.entries["entry_cod_empresa"].insert(0, usuario[1])
-        self.entries["lbl_nome_empresa"].config(text=usuario[2])
-        self.entries["entry_usuario"].insert(0, usuario[3])
-        self.entries["entry_nome"].insert(0, usuario[4])
-        self.entries["entry_supervisor"].insert(0, usuario[5])
-        self.entries["entry_turno"].set(usuario[6])
-        self.entries["entry_email"].insert(0, usuario[7])
-        self.entries["entry_senha"].insert(0, "******")  # Oculta a senha real
-        self.entries["entry_tipo"].set(usuario[9])
+            usuario (sqlite3.Row): Linha com as colunas de COLUNAS_USUARIO_FORMULARIO
+        """
+        self._usuario_exibido = (usuario["id"], usuario["usuario"])
+        vars_usuario = self.vars_usuario
+        # Mapear colunas do banco de dados para os campos do formulário
+        for chave, coluna in self._CAMPOS_FORMULARIO_USUARIO:
+            vars_usuario[chave].set(usuario[coluna])
+        vars_usuario["entry_senha"].set("******")  # Oculta a senha real
     
     def salvar_usuario(self):
         """Salva o cadastro de usuário no banco de dados da empresa."""
-        if (
-            not hasattr(self, "janela_usuario")
-            or not self.janela_usuario.winfo_exists()
-        ):
+        if self.janela_usuario is None:
             return
 
+        vars_usuario = self.vars_usuario
         dados = {
-            "cod_empresa": self.entries["entry_cod_empresa"].get(),
-            "empresa_nome": self.entries["lbl_nome_empresa"].cget("text"),
-            "usuario": self.entries["entry_usuario"].get(),
-            "nome": self.entries["entry_nome"].get(),
-            "supervisor": self.entries["entry_supervisor"].get(),
-            "turno": self.entries["entry_turno"].get(),
-            "email": self.entries["entry_email"].get(),
-            "senha": self.entries["entry_senha"].get(),
-            "tipo": self.entries["entry_tipo"].get(),
+            nome: vars_usuario[chave].get()
+            for nome, chave, _ in self._CAMPOS_SALVAR_USUARIO
         }
 
-        campos_obrigatorios = [
-            "cod_empresa",
-            "usuario",
-            "nome",
-            "supervisor",
-            "turno",
-            "email",
-            "senha",
-            "tipo",
-        ]
-        if not all(dados[field] for field in campos_obrigatorios):
-            self.exibir_mensagem_erro("Erro", "Preencha todos os campos obrigatórios!")
+        if not self._campos_preenchidos({
+            rotulo: dados[nome]
+            for nome, _, rotulo in self._CAMPOS_SALVAR_USUARIO
+            if rotulo
+        }):
             return
 
         if dados["empresa_nome"] == "Empresa não encontrada!":
             self.exibir_mensagem_erro("Erro", "Código da empresa inválido!")
             return
 
-        if not re.match(r"^[\w\.-]+@[\w\.-]+\.\w+$", dados["email"]):
+        if not PADRAO_EMAIL.match(dados["email"]):
             self.exibir_mensagem_erro("Erro", "Formato de email inválido!")
             return
 
@@ -3318,72 +3869,94 @@ class SistemaGerenciamentoDeposito:
             self.exibir_mensagem_erro("Erro", "Senha deve ter pelo menos 6 caracteres!")
             return
 
+        # Nível de acesso do usuário logado, gravado em empresa_logada no login
+        tipo_atual = self.empresa_logada.get("tipo_acesso", "CEO")
+
+        # Verificar hierarquia de permissões
+        if tipo_atual != 'CEO' and dados['tipo'] in ['CEO', 'Administrador']:
+            self.exibir_mensagem_na_tela("erro", "Erro", "Apenas o CEO pode cadastrar administradores!")
+            return
+        elif tipo_atual not in ['CEO', 'Administrador'] and dados['tipo'] == 'Gerente':
+            self.exibir_mensagem_na_tela("erro", "Erro", "Apenas o CEO e administradores podem cadastrar gerentes!")
+            return
+
+        # O scrypt e o INSERT rodam na thread de E/S; o resultado volta ao Tk
+        # pela fila de mensagens
+        self._executor_io.submit(
+            self._gravar_usuario,
+            self.empresa_logada["db_path"],
+            dados,
+            self.empresa_logada["nome"],
+        )
+
+    def _gravar_usuario(self, db_path, dados, criado_por):
+        """Calcula o hash da senha e grava um novo usuário no banco da empresa.
+
+        Executado na thread de E/S; não acessa widgets. Erros e a conclusão do
+        cadastro (_concluir_cadastro_usuario) são encaminhados ao Tk por
+        _fila_mensagens.
+
+        Args:
+            db_path (str): Banco da empresa logada ao salvar
+            dados (dict): Campos já validados por salvar_usuario
+            criado_por (str): Nome da empresa que cadastra o usuário
+        """
         try:
-            conn = self.obter_conexao_empresa()
-            cursor = conn.cursor()
-            
-            # Verificar permissões do usuário atual
-            cursor.execute("SELECT tipo_acesso FROM usuarios WHERE usuario = ?", (self.empresa_logada['nome'],))
-            tipo_atual = cursor.fetchone()
-            tipo_atual = tipo_atual[0] if tipo_atual else 'CEO'
-            
-            # Verificar hierarquia de permissões
-            if tipo_atual != 'CEO' and dados['tipo'] in ['CEO', 'Administrador']:
-                self.exibir_mensagem_na_tela("erro", "Erro", "Apenas o CEO pode cadastrar administradores!")
-                return
-            elif tipo_atual not in ['CEO', 'Administrador'] and dados['tipo'] == 'Gerente':
-                self.exibir_mensagem_na_tela("erro", "Erro", "Apenas o CEO e administradores podem cadastrar gerentes!")
-                return
-            
-            senha_hash = hashlib.sha256(dados["senha"].encode()).hexdigest()
-            cursor.execute(
-                """
-                INSERT INTO usuarios (
-                    codigo_empresa,
-                    empresa_nome,
-                    usuario,
-                    nome_completo,
-                    nome_supervisor,
-                    turno,
-                    email,
-                    senha,
-                    tipo_acesso,
-                    criado_por
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    dados["cod_empresa"],
-                    dados["empresa_nome"],
-                    dados["usuario"],
-                    dados["nome"],
-                    dados["supervisor"],
-                    dados["turno"],
-                    dados["email"],
-                    senha_hash,
-                    dados["tipo"],
-                    self.empresa_logada['nome']
-                ),
-            )
-            conn.commit()
-            messagebox.showinfo("Sucesso", "Usuário cadastrado com sucesso!")
-            self.fechar_janela_usuario()
+            senha_hash = self.hash_senha(dados["senha"])
+            with self._get_conn(db_path) as conn:
+                conn.execute(
+                    """
+                    INSERT INTO usuarios (
+                        codigo_empresa,
+                        empresa_nome,
+                        usuario,
+                        nome_completo,
+                        nome_supervisor,
+                        turno,
+                        email,
+                        senha,
+                        tipo_acesso,
+                        criado_por
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        dados["cod_empresa"],
+                        dados["empresa_nome"],
+                        dados["usuario"],
+                        dados["nome"],
+                        dados["supervisor"],
+                        dados["turno"],
+                        dados["email"],
+                        senha_hash,
+                        dados["tipo"],
+                        criado_por,
+                    ),
+                )
+            self._fila_mensagens.put((self._concluir_cadastro_usuario,))
         except sqlite3.IntegrityError:
-            self.exibir_mensagem_na_tela("erro", "Erro", "Email já cadastrado!")
+            self._erro_cadastro_usuario("Erro", "Email já cadastrado!")
         except sqlite3.OperationalError as e:
             erro = str(e).lower()
             if "no such column" in erro:
-                self.exibir_mensagem_na_tela(
-                    "erro",
+                self._erro_cadastro_usuario(
                     "Erro de Banco de Dados",
                     "Banco desatualizado! Exclua o banco da empresa e recadastre-a.",
                 )
             else:
-                self.exibir_mensagem_na_tela("erro", "Erro", f"Erro no banco: {erro}")
+                self._erro_cadastro_usuario("Erro", f"Erro no banco: {erro}")
         except Exception as e:
-            self.exibir_mensagem_na_tela("erro", "Erro", f"Erro inesperado: {str(e)}")
-        finally:
-            if "conn" in locals():
-                conn.close()
+            logger.exception("Erro ao cadastrar o usuário %s", dados["usuario"])
+            self._erro_cadastro_usuario("Erro", f"Erro inesperado: {str(e)}")
+
+    def _erro_cadastro_usuario(self, titulo, mensagem):
+        """Encaminha ao Tk um erro de _gravar_usuario, exibido sobre o cadastro."""
+        self._fila_mensagens.put((self.exibir_mensagem_na_tela, "erro", titulo, mensagem))
+
+    def _concluir_cadastro_usuario(self):
+        """Confirma o cadastro gravado por _gravar_usuario e fecha o formulário."""
+        self._ids_usuarios = None
+        messagebox.showinfo("Sucesso", "Usuário cadastrado com sucesso!")
+        self.fechar_janela_usuario()
 
     def exibir_mensagem_na_tela(self, tipo, titulo, mensagem):
         """Exibe mensagens de erro ou aviso na tela de cadastro de usuários sem fechar a janela."""
@@ -3459,38 +4032,37 @@ class SistemaGerenciamentoDeposito:
             return
 
         try:
-            conn = sqlite3.connect("deposito_principal.db")
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                UPDATE empresas SET
-                    nome = ?,
-                    cnpj = ?,
-                    endereco = ?,
-                    telefone = ?
-                WHERE id = ?
-            """,
-                (
-                    dados["nome"],
-                    dados["cnpj"],
-                    dados["endereco"],
-                    dados["telefone"],
-                    self.empresa_logada["id"],
-                ),
-            )
-            conn.commit()
+            with self._get_conn(CAMINHO_BANCO_PRINCIPAL) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    UPDATE empresas SET
+                        nome = ?,
+                        cnpj = ?,
+                        endereco = ?,
+                        telefone = ?
+                    WHERE id = ?
+                """,
+                    (
+                        dados["nome"],
+                        dados["cnpj"],
+                        dados["endereco"],
+                        dados["telefone"],
+                        self.empresa_logada["id"],
+                    ),
+                )
 
             self.empresa_logada["nome"] = dados["nome"]
             self.empresa_logada["cnpj"] = dados["cnpj"]
             self.empresa_logada["endereco"] = dados["endereco"]
             self.empresa_logada["telefone"] = dados["telefone"]
+            # O nome pode ter mudado: a tela de login relê a lista de empresas
+            self.lista_empresas = None
+            self._cache_nomes_empresas.clear()
 
             messagebox.showinfo("Sucesso", "Dados atualizados com sucesso!")
         except Exception as e:
             self.exibir_mensagem_erro("Erro", f"Erro ao atualizar empresa: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
 
     def tela_consulta_produtos(self):
         pass
@@ -3517,57 +4089,32 @@ class SistemaGerenciamentoDeposito:
             return
 
         try:
-            conn = self.obter_conexao_empresa()
-            cursor = conn.cursor()
-
-            # Busca o usuário pelo nome ou parte do nome
-            cursor.execute(
-                """
-                SELECT * FROM usuarios
-                WHERE usuario LIKE ? COLLATE NOCASE
-                LIMIT 1
-                """,
-                (f"%{termo}%",),
-            )
-            usuario = cursor.fetchone()
-
-            if usuario:
-                # Preenche os campos com os dados do usuário encontrado
-                self.entries["entry_cod_empresa"].delete(0, tk.END)
-                self.entries["entry_cod_empresa"].insert(0, usuario[1])
-
-                self.entries["entry_usuario"].delete(0, tk.END)
-                self.entries["entry_usuario"].insert(0, usuario[3])
-
-                self.entries["entry_nome"].delete(0, tk.END)
-                self.entries["entry_nome"].insert(0, usuario[4])
-
-                self.entries["entry_supervisor"].delete(0, tk.END)
-                self.entries["entry_supervisor"].insert(0, usuario[5])
-
-                self.entries["entry_turno"].set(usuario[6])
-
-                self.entries["entry_email"].delete(0, tk.END)
-                self.entries["entry_email"].insert(0, usuario[7])
-
-                self.entries["entry_senha"].delete(0, tk.END)
-                self.entries["entry_senha"].insert(0, "******")  # Oculta a senha
+            with self._get_conn() as conn:
+                cursor = conn.cursor()
 
-                self.entries["entry_tipo"].set(usuario[9])
-            else:
-                self.exibir_mensagem_na_tela(
-                    "aviso", "Não Encontrado", "Usuário não encontrado."
+                # Busca o usuário pelo nome ou parte do nome
+                cursor.execute(
+                    SQL_PESQUISAR_USUARIO, (expressao_fts(termo, "usuario"),)
                 )
+                usuario = cursor.fetchone()
+
+                if usuario:
+                    self.preencher_campos_usuario(usuario)
+                else:
+                    self.exibir_mensagem_na_tela(
+                        "aviso", "Não Encontrado", "Usuário não encontrado."
+                    )
         except Exception as e:
             self.exibir_mensagem_na_tela(
                 "erro", "Erro", f"Erro ao buscar usuário: {str(e)}"
             )
-        finally:
-            if conn:
-                conn.close()
 
-    def carregar_usuarios_na_tabela(self, event=None):
-        """Carrega os usuários do banco da empresa na Treeview da pesquisa."""
+    def _filtros_pesquisa_usuarios(self):
+        """Lê os filtros da tela de pesquisa de usuários.
+
+        Returns:
+            tuple: (termo, turno, tipo, supervisor), já normalizados
+        """
         termo = (
             self.entry_pesquisa.get().lower() if hasattr(self, "entry_pesquisa") else ""
         )
@@ -3578,305 +4125,227 @@ class SistemaGerenciamentoDeposito:
             if hasattr(self, "entry_supervisor")
             else ""
         )
+        return termo.strip(), turno, tipo, supervisor
 
-        try:
-            self.tree_usuarios.delete(*self.tree_usuarios.get_children())
-            conn = self.obter_conexao_empresa()
-            cursor = conn.cursor()
-
-            base_query = """
-                SELECT id, usuario, nome_completo, email, tipo_acesso, turno, nome_supervisor 
-                FROM usuarios
-            """
-            where_clauses = []
-            params = []
-
-            if termo:
-                where_clauses.append(
-                    """
-                    (usuario LIKE ? COLLATE NOCASE OR 
-                    nome_completo LIKE ? COLLATE NOCASE OR 
-                    email LIKE ? COLLATE NOCASE)
-                """
-                )
-                params.extend([f"%{termo}%", f"%{termo}%", f"%{termo}%"])
-
-            if turno:
-                where_clauses.append("turno = ?")
-                params.append(turno)
-
-            if tipo:
-                where_clauses.append("tipo_acesso = ?")
-                params.append(tipo)
-
-            if supervisor:
-                where_clauses.append("nome_supervisor LIKE ? COLLATE NOCASE")
-                params.append(f"%{supervisor}%")
-
-            if where_clauses:
-                base_query += " WHERE " + " AND ".join(where_clauses)
-
-            cursor.execute(base_query, params)
-
-            for usuario in cursor.fetchall():
-                self.tree_usuarios.insert(
-                    "",
-                    "end",
-                    values=(
-                        usuario[0],
-                        usuario[1],
-                        usuario[2],
-                        usuario[3],
-                        usuario[4],
-                        usuario[5],
-                        usuario[6],
-                    ),
-                )
-        except sqlite3.Error as e:
-            self.exibir_mensagem_erro(
-                "Erro no Banco de Dados", f"Erro ao carregar usuários:\n{str(e)}"
-            )
-        except Exception as e:
-            self.exibir_mensagem_erro("Erro", f"Erro inesperado:\n{str(e)}")
-        finally:
-            if "conn" in locals():
-                conn.close()
+    def carregar_usuarios_na_tabela(self, event=None):
+        """Carrega os usuários do banco da empresa na Treeview da pesquisa.
 
-    def atualizar_tabela_usuarios(self, event=None):
-        """Atualiza a tabela de usuários na tela de pesquisa."""
-        self.carregar_usuarios_na_tabela()
+        Só a primeira página (TAMANHO_PAGINA_USUARIOS linhas) é lida aqui; as
+        seguintes são lidas conforme a tabela é rolada até o fim.
+        """
+        self._filtros_usuarios = self._filtros_pesquisa_usuarios()
+        termo, turno, tipo, supervisor = self._filtros_usuarios
 
-    # Métodos de navegação e ações (simulações para demonstração)
-    def registro_anterior(self):
-        """Volta para o usuário anterior na lista de usuários."""
-        try:
-            conn = self.obter_conexao_empresa()
-            cursor = conn.cursor()
+        base_query = """
+            SELECT id, usuario, nome_completo, email, tipo_acesso, turno, nome_supervisor 
+            FROM usuarios
+        """
+        # Filtros da pesquisa; a paginação acrescenta "id > ?" a cada página
+        where_clauses = []
+        params = []
+
+        # Termos curtos demais para trigramas buscam pelo prefixo das palavras
+        if len(termo) >= TAMANHO_MINIMO_TRIGRAMA:
+            where_clauses.append(FILTRO_USUARIOS_TRIGRAMA)
+            params.append(expressao_trigrama(termo))
+        elif termo:
+            where_clauses.append(FILTRO_USUARIOS_FTS)
+            params.append(expressao_fts(termo))
+
+        if turno:
+            where_clauses.append("turno = ?")
+            params.append(turno)
+
+        if tipo:
+            where_clauses.append("tipo_acesso = ?")
+            params.append(tipo)
+
+        # O intervalo do prefixo no índice vem dos limites explícitos (e da
+        # chave da página); o "+" impede que o LIKE dispute a escolha do índice
+        if supervisor:
+            where_clauses.append("+nome_supervisor LIKE ? ESCAPE '\\'")
+            params.append(padrao_prefixo_like(supervisor))
+            fim = fim_prefixo_nocase(supervisor)
+            if fim is not None:
+                where_clauses.append("nome_supervisor < ? COLLATE NOCASE")
+                params.append(fim)
+
+        if self._job_pagina_usuarios is not None:
+            self.root.after_cancel(self._job_pagina_usuarios)
+            self._job_pagina_usuarios = None
+        self._consulta_usuarios = (base_query, where_clauses, params, bool(supervisor))
+        self._ultimo_id_usuarios = 0
+        # Menor que qualquer supervisor com o prefixo procurado
+        self._ultimo_supervisor_usuarios = supervisor
+        self._geracao_usuarios += 1
+        self._pagina_em_leitura = False
+        self._carregar_pagina_usuarios()
+
+    def _carregar_pagina_usuarios(self):
+        """Pede à thread de consultas a próxima página da tabela da pesquisa.
+
+        Usa paginação por chave (``id > último id carregado``, ou o par
+        supervisor/id com o filtro de supervisor), de modo que cada página
+        custa o mesmo independentemente de quantas já foram lidas.
+        O resultado volta ao Tk por _fila_mensagens (_aplicar_pagina_usuarios).
+        """
+        self._job_pagina_usuarios = None
+        if (
+            self._ultimo_id_usuarios is None
+            or self._pagina_em_leitura
+            or self.janela_pesquisa_usuarios is None
+        ):
+            return
 
-            # Obtém o ID do usuário atual
-            usuario_atual = self.entries["entry_usuario"].get()
-            cursor.execute(
-                "SELECT id FROM usuarios WHERE usuario = ?", (usuario_atual,)
+        base_query, where_clauses, params, por_supervisor = self._consulta_usuarios
+        if por_supervisor:
+            filtro_pagina, ordem = FILTRO_PAGINA_SUPERVISOR, ORDEM_USUARIOS_SUPERVISOR
+            chave = (
+                self._ultimo_supervisor_usuarios,
+                self._ultimo_supervisor_usuarios,
+                self._ultimo_id_usuarios,
             )
-            resultado = cursor.fetchone()
-
-            if resultado:
-                id_atual = resultado[0]
-
-                # Busca o usuário anterior com ID menor
-                cursor.execute(
-                    "SELECT * FROM usuarios WHERE id < ? ORDER BY id DESC LIMIT 1",
-                    (id_atual,),
-                )
-                usuario_anterior = cursor.fetchone()
-
-                if usuario_anterior:
-                    # Preenche os campos com os dados do usuário anterior
-                    self.entries["entry_cod_empresa"].delete(0, tk.END)
-                    self.entries["entry_cod_empresa"].insert(0, usuario_anterior[1])
-
-                    self.entries["entry_usuario"].delete(0, tk.END)
-                    self.entries["entry_usuario"].insert(0, usuario_anterior[3])
-
-                    self.entries["entry_nome"].delete(0, tk.END)
-                    self.entries["entry_nome"].insert(0, usuario_anterior[4])
-
-                    self.entries["entry_supervisor"].delete(0, tk.END)
-                    self.entries["entry_supervisor"].insert(0, usuario_anterior[5])
-
-                    self.entries["entry_turno"].set(usuario_anterior[6])
-
-                    self.entries["entry_email"].delete(0, tk.END)
-                    self.entries["entry_email"].insert(0, usuario_anterior[7])
+        else:
+            filtro_pagina, ordem = "id > ?", "id"
+            chave = (self._ultimo_id_usuarios,)
+        consulta = (
+            base_query
+            + " WHERE "
+            + " AND ".join(where_clauses + [filtro_pagina])
+            + f" ORDER BY {ordem} LIMIT ?"
+        )
+        self._pagina_em_leitura = True
+        self._executor_consultas.submit(
+            self._ler_pagina_usuarios,
+            self._geracao_usuarios,
+            self.empresa_logada["db_path"],
+            consulta,
+            (*params, *chave, TAMANHO_PAGINA_USUARIOS),
+        )
 
-                    self.entries["entry_senha"].delete(0, tk.END)
-                    self.entries["entry_senha"].insert(0, "******")  # Oculta a senha
+    def _ler_pagina_usuarios(self, geracao, db_path, consulta, params):
+        """Lê uma página de usuários na thread de consultas.
 
-                    self.entries["entry_tipo"].set(usuario_anterior[9])
-                else:
-                    # Desabilita o botão "Anterior" se não houver usuários anteriores
-                    for widget in self.janela_usuario.winfo_children():
-                        if (
-                            isinstance(widget, ttk.Button)
-                            and widget.cget("text") == "◀ Anterior"
-                        ):
-                            widget.state(["disabled"])
-                    return
-            else:
-                self.exibir_mensagem_na_tela(
-                    "erro", "Erro", "Usuário atual não encontrado."
-                )
-        except Exception as e:
-            self.exibir_mensagem_na_tela(
-                "erro", "Erro", f"Erro ao executar ação: {str(e)}"
-            )
-        finally:
-            if conn:
-                conn.close()
+        Não acessa widgets; o resultado (ou o erro) é encaminhado ao Tk.
 
-    def primeiro_registro(self):
-        """Seleciona o primeiro usuário na lista de usuários."""
+        Args:
+            geracao (int): Geração da pesquisa que pediu a página
+            db_path (str): Banco da empresa logada
+            consulta (str): SELECT da página, com os filtros da pesquisa
+            params (tuple): Parâmetros da consulta
+        """
         try:
-            conn = self.obter_conexao_empresa()
-            cursor = conn.cursor()
-
-            # Busca o primeiro usuário
-            cursor.execute("SELECT * FROM usuarios ORDER BY id ASC LIMIT 1")
-            primeiro_usuario = cursor.fetchone()
-
-            if primeiro_usuario:
-                # Preenche os campos com os dados do primeiro usuário
-                self.entries["entry_cod_empresa"].delete(0, tk.END)
-                self.entries["entry_cod_empresa"].insert(0, primeiro_usuario[1])
-
-                self.entries["entry_usuario"].delete(0, tk.END)
-                self.entries["entry_usuario"].insert(0, primeiro_usuario[3])
-
-                self.entries["entry_nome"].delete(0, tk.END)
-                self.entries["entry_nome"].insert(0, primeiro_usuario[4])
-
-                self.entries["entry_supervisor"].delete(0, tk.END)
-                self.entries["entry_supervisor"].insert(0, primeiro_usuario[5])
-
-                self.entries["entry_turno"].set(primeiro_usuario[6])
-
-                self.entries["entry_email"].delete(0, tk.END)
-                self.entries["entry_email"].insert(0, primeiro_usuario[7])
-
-                self.entries["entry_senha"].delete(0, tk.END)
-                self.entries["entry_senha"].insert(0, "******")  # Oculta a senha
-
-                self.entries["entry_tipo"].set(primeiro_usuario[9])
-            else:
-                self.exibir_mensagem_na_tela(
-                    "aviso", "Lista Vazia", "Não há usuários cadastrados."
-                )
-        except Exception as e:
-            self.exibir_mensagem_na_tela(
-                "erro", "Erro", f"Erro ao executar ação: {str(e)}"
-            )
-        finally:
-            if conn:
-                conn.close()
+            with self._get_conn(db_path) as conn:
+                lote = conn.execute(consulta, params).fetchall()
+        except sqlite3.Error as e:
+            logger.exception("Erro ao carregar usuários")
+            self._fila_mensagens.put((self._aplicar_pagina_usuarios, geracao, None, e))
+            return
+        self._fila_mensagens.put((self._aplicar_pagina_usuarios, geracao, lote, None))
 
-    def proximo_registro(self):
-        """Avança para o próximo usuário na lista de usuários."""
-        try:
-            conn = self.obter_conexao_empresa()
-            cursor = conn.cursor()
+    def _aplicar_pagina_usuarios(self, geracao, lote, erro):
+        """Acrescenta à tabela da pesquisa uma página lida em segundo plano.
 
-            # Obtém o ID do usuário atual
-            usuario_atual = self.entries["entry_usuario"].get()
-            cursor.execute(
-                "SELECT id FROM usuarios WHERE usuario = ?", (usuario_atual,)
+        Args:
+            geracao (int): Geração da pesquisa que pediu a página
+            lote (list): Linhas da página, ou None em caso de erro
+            erro (sqlite3.Error): Erro da leitura, ou None
+        """
+        # Página de uma pesquisa já substituída por outra
+        if geracao != self._geracao_usuarios:
+            return
+        self._pagina_em_leitura = False
+        if self.janela_pesquisa_usuarios is None:
+            return
+        if erro is not None:
+            self._ultimo_id_usuarios = None
+            self.exibir_mensagem_erro(
+                "Erro no Banco de Dados", f"Erro ao carregar usuários:\n{str(erro)}"
             )
-            resultado = cursor.fetchone()
-
-            if resultado:
-                id_atual = resultado[0]
-
-                # Busca o próximo usuário com ID maior
-                cursor.execute(
-                    "SELECT * FROM usuarios WHERE id > ? ORDER BY id ASC LIMIT 1",
-                    (id_atual,),
-                )
-                proximo_usuario = cursor.fetchone()
-
-                if proximo_usuario:
-                    # Preenche os campos com os dados do próximo usuário
-                    self.entries["entry_cod_empresa"].delete(0, tk.END)
-                    self.entries["entry_cod_empresa"].insert(0, proximo_usuario[1])
-
-                    self.entries["entry_usuario"].delete(0, tk.END)
-                    self.entries["entry_usuario"].insert(0, proximo_usuario[3])
-
-                    self.entries["entry_nome"].delete(0, tk.END)
-                    self.entries["entry_nome"].insert(0, proximo_usuario[4])
-
-                    self.entries["entry_supervisor"].delete(0, tk.END)
-                    self.entries["entry_supervisor"].insert(0, proximo_usuario[5])
-
-                    self.entries["entry_turno"].set(proximo_usuario[6])
+            return
 
-                    self.entries["entry_email"].delete(0, tk.END)
-                    self.entries["entry_email"].insert(0, proximo_usuario[7])
+        # Primeira página: a tabela anterior só é limpa quando a nova chega
+        if self._ultimo_id_usuarios == 0:
+            self.tree_usuarios.delete(*self.tree_usuarios.get_children())
+        inserir = self.tree_usuarios.insert
+        for usuario in lote:
+            # tuple: o ttk não desempacota sqlite3.Row
+            inserir("", "end", values=tuple(usuario))
+        # Página incompleta: não há mais usuários a carregar
+        if len(lote) == TAMANHO_PAGINA_USUARIOS:
+            self._ultimo_id_usuarios = lote[-1]["id"]
+            self._ultimo_supervisor_usuarios = lote[-1]["nome_supervisor"]
+        else:
+            self._ultimo_id_usuarios = None
 
-                    self.entries["entry_senha"].delete(0, tk.END)
-                    self.entries["entry_senha"].insert(0, "******")  # Oculta a senha
+    def _verificar_fim_tabela_usuarios(self, ultimo):
+        """Agenda a próxima página quando a tabela é rolada perto do fim.
 
-                    self.entries["entry_tipo"].set(proximo_usuario[9])
-                else:
-                    self.exibir_mensagem_na_tela(
-                        "aviso", "Fim da Lista", "Não há mais usuários na lista."
-                    )
-            else:
-                self.exibir_mensagem_na_tela(
-                    "erro", "Erro", "Usuário atual não encontrado."
-                )
-        except Exception as e:
-            self.exibir_mensagem_na_tela(
-                "erro", "Erro", f"Erro ao executar ação: {str(e)}"
+        Args:
+            ultimo (str): Fração final visível da tabela, informada pelo
+                yscrollcommand da Treeview
+        """
+        if (
+            float(ultimo) >= LIMIAR_PROXIMA_PAGINA
+            and self._ultimo_id_usuarios is not None
+            and self._job_pagina_usuarios is None
+            and not self._pagina_em_leitura
+        ):
+            # Fora do callback de rolagem, que o Tk chama durante o redesenho
+            self._job_pagina_usuarios = self.root.after_idle(
+                self._carregar_pagina_usuarios
             )
-        finally:
-            if conn:
-                conn.close()
-
-    def ultimo_registro(self):
-        """Seleciona o último usuário na lista de usuários."""
-        try:
-            conn = self.obter_conexao_empresa()
-            cursor = conn.cursor()
-
-            # Busca o último usuário
-            cursor.execute("SELECT * FROM usuarios ORDER BY id DESC LIMIT 1")
-            ultimo_usuario = cursor.fetchone()
-
-            if ultimo_usuario:
-                # Preenche os campos com os dados do último usuário
-                self.entries["entry_cod_empresa"].delete(0, tk.END)
-                self.entries["entry_cod_empresa"].insert(0, ultimo_usuario[1])
 
-                self.entries["entry_usuario"].delete(0, tk.END)
-                self.entries["entry_usuario"].insert(0, ultimo_usuario[3])
-
-                self.entries["entry_nome"].delete(0, tk.END)
-                self.entries["entry_nome"].insert(0, ultimo_usuario[4])
-
-                self.entries["entry_supervisor"].delete(0, tk.END)
-                self.entries["entry_supervisor"].insert(0, ultimo_usuario[5])
+    def atualizar_tabela_usuarios(self, event=None):
+        """Atualiza a tabela de usuários na tela de pesquisa."""
+        self.carregar_usuarios_na_tabela()
 
-                self.entries["entry_turno"].set(ultimo_usuario[6])
+    def agendar_atualizacao_tabela_usuarios(self, event=None):
+        """Agenda a recarga da tabela de usuários conforme o usuário digita.
 
-                self.entries["entry_email"].delete(0, tk.END)
-                self.entries["entry_email"].insert(0, ultimo_usuario[7])
+        Teclas digitadas em sequência reiniciam o agendamento, de modo que a
+        consulta só roda depois de ATRASO_PESQUISA_USUARIOS_MS sem digitação.
+        """
+        if self._job_pesquisa_usuarios is not None:
+            self.root.after_cancel(self._job_pesquisa_usuarios)
+        self._job_pesquisa_usuarios = self.root.after(
+            ATRASO_PESQUISA_USUARIOS_MS, self._aplicar_pesquisa_usuarios
+        )
 
-                self.entries["entry_senha"].delete(0, tk.END)
-                self.entries["entry_senha"].insert(0, "******")  # Oculta a senha
+    def _aplicar_pesquisa_usuarios(self):
+        """Recarrega a tabela da pesquisa, se a janela ainda estiver aberta.
 
-                self.entries["entry_tipo"].set(ultimo_usuario[9])
-            else:
-                self.exibir_mensagem_na_tela(
-                    "aviso", "Lista Vazia", "Não há usuários cadastrados."
-                )
-        except Exception as e:
-            self.exibir_mensagem_na_tela(
-                "erro", "Erro", f"Erro ao executar ação: {str(e)}"
-            )
-        finally:
-            if conn:
-                conn.close()
+        Teclas que não mudam os filtros (setas, Shift...) não refazem a consulta.
+        """
+        self._job_pesquisa_usuarios = None
+        if (
+            self.janela_pesquisa_usuarios is not None
+            and self._filtros_pesquisa_usuarios() != self._filtros_usuarios
+        ):
+            self.carregar_usuarios_na_tabela()
 
+    # Pesquisa e ações da tela de usuários (ações simuladas para demonstração)
     def pesquisar_range(self):
-        """Exibe a tabela de pesquisa de usuários cadastrados."""
-        if hasattr(self, "janela_pesquisa") and self.janela_pesquisa.winfo_exists():
-            self.janela_pesquisa.lift()
+        """Exibe a tabela de pesquisa de usuários cadastrados.
+
+        A janela é montada na primeira abertura; fechá-la apenas a esconde, e
+        as aberturas seguintes a reexibem com os filtros mantidos e a tabela
+        relida.
+        """
+        if self.janela_pesquisa_usuarios is not None:
+            self.janela_pesquisa_usuarios.deiconify()
+            self.janela_pesquisa_usuarios.lift()
+            self.carregar_usuarios_na_tabela()
             return
 
-        self.janela_pesquisa = tk.Toplevel(self.root)
-        self.janela_pesquisa.title("Pesquisa de Usuários Cadastrados")
-        self.janela_pesquisa.geometry("1200x600")
+        self._registrar_janela("janela_pesquisa_usuarios", tk.Toplevel(self.root))
+        self.janela_pesquisa_usuarios.protocol(
+            "WM_DELETE_WINDOW", self.janela_pesquisa_usuarios.withdraw
+        )
+        self.janela_pesquisa_usuarios.title("Pesquisa de Usuários Cadastrados")
+        self.janela_pesquisa_usuarios.geometry("1200x600")
 
-        main_container = ttk.Frame(self.janela_pesquisa)
+        main_container = ttk.Frame(self.janela_pesquisa_usuarios)
         main_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
         # Filtros básicos
@@ -3885,7 +4354,7 @@ class SistemaGerenciamentoDeposito:
         ttk.Label(filtro_frame, text="Pesquisar:").pack(side=tk.LEFT, padx=5)
         self.entry_pesquisa = ttk.Entry(filtro_frame, width=40)
         self.entry_pesquisa.pack(side=tk.LEFT, padx=5)
-        self.entry_pesquisa.bind("<KeyRelease>", self.atualizar_tabela_usuarios)
+        self.entry_pesquisa.bind("<KeyRelease>", self.agendar_atualizacao_tabela_usuarios)
 
         # Filtros avançados
         filtro_avancado_frame = ttk.Frame(main_container)
@@ -3894,7 +4363,7 @@ class SistemaGerenciamentoDeposito:
         ttk.Label(filtro_avancado_frame, text="Turno:").grid(row=0, column=0, padx=5)
         self.combo_turno = ttk.Combobox(
             filtro_avancado_frame,
-            values=["", "Manhã", "Tarde", "Noite"],
+            values=self._FILTRO_TURNOS,
             state="readonly",
             width=10,
         )
@@ -3906,7 +4375,7 @@ class SistemaGerenciamentoDeposito:
         )
         self.combo_tipo = ttk.Combobox(
             filtro_avancado_frame,
-            values=["", "Administrador", "Gerente", "Operador"],
+            values=self._FILTRO_TIPOS_ACESSO,
             state="readonly",
             width=15,
         )
@@ -3918,7 +4387,7 @@ class SistemaGerenciamentoDeposito:
         )
         self.entry_supervisor = ttk.Entry(filtro_avancado_frame, width=20)
         self.entry_supervisor.grid(row=0, column=5, padx=5)
-        self.entry_supervisor.bind("<KeyRelease>", self.atualizar_tabela_usuarios)
+        self.entry_supervisor.bind("<KeyRelease>", self.agendar_atualizacao_tabela_usuarios)
 
         # Tabela de resultados
         tree_frame = ttk.Frame(main_container)
@@ -3945,7 +4414,12 @@ class SistemaGerenciamentoDeposito:
         scroll = ttk.Scrollbar(
             tree_frame, orient=tk.VERTICAL, command=self.tree_usuarios.yview
         )
-        self.tree_usuarios.configure(yscrollcommand=scroll.set)
+
+        def rolar(primeiro, ultimo):
+            scroll.set(primeiro, ultimo)
+            self._verificar_fim_tabela_usuarios(ultimo)
+
+        self.tree_usuarios.configure(yscrollcommand=rolar)
 
         self.tree_usuarios.grid(row=0, column=0, sticky="nsew")
         scroll.grid(row=0, column=1, sticky="ns")
@@ -3955,53 +4429,36 @@ class SistemaGerenciamentoDeposito:
 
         self.carregar_usuarios_na_tabela()
 
-    def criar_registro(self):
+    def _acao_simulada(self, rotulo):
+        """Exibe o aviso das ações do cadastro de usuários ainda não implementadas.
+
+        Args:
+            rotulo (str): Descrição da ação exibida ao usuário
+        """
         try:
-            messagebox.showinfo("Ação", "Criar registro")
+            messagebox.showinfo("Ação", rotulo)
         except Exception as e:
             self.exibir_mensagem_na_tela(
                 "erro", "Erro", f"Erro ao executar ação: {str(e)}"
             )
 
+    def criar_registro(self):
+        self._acao_simulada("Criar registro")
+
     def atualizar_registro(self):
-        try:
-            messagebox.showinfo("Ação", "Atualizar registro")
-        except Exception as e:
-            self.exibir_mensagem_na_tela(
-                "erro", "Erro", f"Erro ao executar ação: {str(e)}"
-            )
+        self._acao_simulada("Atualizar registro")
 
     def copiar_registro(self):
-        try:
-            messagebox.showinfo("Ação", "Copiar registro")
-        except Exception as e:
-            self.exibir_mensagem_na_tela(
-                "erro", "Erro", f"Erro ao executar ação: {str(e)}"
-            )
+        self._acao_simulada("Copiar registro")
 
     def deletar_registro(self):
-        try:
-            messagebox.showinfo("Ação", "Deletar registro")
-        except Exception as e:
-            self.exibir_mensagem_na_tela(
-                "erro", "Erro", f"Erro ao executar ação: {str(e)}"
-            )
+        self._acao_simulada("Deletar registro")
 
     def salvar_edicao(self):
-        try:
-            messagebox.showinfo("Ação", "Salvar edição")
-        except Exception as e:
-            self.exibir_mensagem_na_tela(
-                "erro", "Erro", f"Erro ao executar ação: {str(e)}"
-            )
+        self._acao_simulada("Salvar edição")
 
     def reset_edicao(self):
-        try:
-            messagebox.showinfo("Ação", "Resetar edição")
-        except Exception as e:
-            self.exibir_mensagem_na_tela(
-                "erro", "Erro", f"Erro ao executar ação: {str(e)}"
-            )
+        self._acao_simulada("Resetar edição")
 
     def cancelar_edicao(self):
         """Cancela a edição sem sair da tela atual."""
@@ -4014,9 +4471,16 @@ class SistemaGerenciamentoDeposito:
 
     def iniciar(self):
         """Inicia o loop principal da aplicação."""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            # Conexões mantidas nos pools só são fechadas ao encerrar o sistema
+            self._fechar_pools()
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
     app = SistemaGerenciamentoDeposito()
     app.iniciar()